@@ -0,0 +1,72 @@
+"""
+Benchmarks the conversion of PetIBM fluxes into velocity-components.
+
+This script writes random fluxes on a stretched Cartesian grid into a
+temporary PetIBM time-step folder, reads them back with `get_velocity`,
+and prints the throughput in cells per second.
+
+Example:
+
+  > python benchmarkVelocity.py --n-cells 256 256 256 --repeat 3
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy
+
+from snake.petibm.simulation import PetIBMSimulation
+from snake.petibm.petscVec import write_vec
+
+
+def parse_command_line():
+  """
+  Parses the command-line.
+  """
+  parser = argparse.ArgumentParser(description='Benchmarks get_velocity.')
+  parser.add_argument('--n-cells', dest='n_cells', type=int, nargs='+',
+                      default=[2048, 2048],
+                      help='number of cells in each direction (2 or 3 values)')
+  parser.add_argument('--repeat', dest='repeat', type=int, default=3,
+                      help='number of times the conversion is timed')
+  return parser.parse_args()
+
+
+def main(args):
+  """
+  Writes random fluxes and times their conversion into velocity.
+  """
+  directory = tempfile.mkdtemp()
+  simulation = PetIBMSimulation(directory=directory)
+  # stretched grid (the cell-widths are different in every direction)
+  simulation.grid = [numpy.cumsum(numpy.random.uniform(0.5, 1.5, n + 1))
+                     for n in args.n_cells]
+  n = numpy.array(args.n_cells)[::-1]  # (z, y, x)-ordered number of cells
+  time_step_directory = os.path.join(directory, '{:0>7}'.format(0))
+  os.makedirs(time_step_directory)
+  for direction, name in enumerate(['qx', 'qy', 'qz'][:n.size]):
+    shape = n.copy()
+    shape[n.size - 1 - direction] -= 1
+    write_vec(os.path.join(time_step_directory, name + '.dat'),
+              numpy.random.rand(*shape))
+  n_cells = numpy.prod(n)
+  timings = []
+  for _ in range(args.repeat):
+    start = time.time()
+    velocities = simulation.get_velocity(0)
+    timings.append(time.time() - start)
+    del velocities
+  shutil.rmtree(directory)
+  best = min(timings)
+  print('\n[info] grid: {} ({} cells)'.format('x'.join(map(str,
+                                                           args.n_cells)),
+                                              n_cells))
+  print('[info] best time: {:.3f} s'.format(best))
+  print('[info] throughput: {:.3e} cells/s'.format(n_cells / best))
+
+
+if __name__ == '__main__':
+  main(parse_command_line())
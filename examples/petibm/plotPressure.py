@@ -1,21 +1,28 @@
 """
 Plots and saves the 2D pressure field from a PetIBM simulation at saved
 time-steps.
+
+The time-steps are distributed over a pool of processes (one per CPU).
 """
 
 from snake.petibm.simulation import PetIBMSimulation
 
 
-simulation = PetIBMSimulation()
-simulation.read_grid()
+def main():
+  simulation = PetIBMSimulation()
+  simulation.read_grid()
+
+  simulation.plot_contours('pressure',
+                           time_steps=simulation.get_time_steps(),
+                           field_range=(-1.0, 0.5, 101),
+                           filled_contour=True,
+                           view=[-15.0, -15.0, 15.0, 15.0],
+                           style='mesnardo',
+                           cmap='viridis',
+                           save_name='pressure',
+                           width=8.0)
+
 
-for time_step in simulation.get_time_steps():
-  simulation.read_fields('pressure', time_step)
-  simulation.plot_contour('pressure',
-                          field_range=(-1.0, 0.5, 101),
-                          filled_contour=True,
-                          view=[-15.0, -15.0, 15.0, 15.0],
-                          style='mesnardo',
-                          cmap='viridis',
-                          save_name='pressure',
-                          width=8.0)
+# the guard is required by the worker processes (spawn start method)
+if __name__ == '__main__':
+  main()
@@ -1,19 +1,26 @@
 """
 Computes, plots, and saves the 2D vorticity field from a PetIBM simulation at
 saved time-steps.
+
+The time-steps are distributed over a pool of processes (one per CPU).
 """
 
 from snake.petibm.simulation import PetIBMSimulation
 
 
-simulation = PetIBMSimulation()
-simulation.read_grid()
+def main():
+  simulation = PetIBMSimulation()
+  simulation.read_grid()
+
+  simulation.plot_contours('vorticity',
+                           time_steps=simulation.get_time_steps(),
+                           field_range=(-5.0, 5.0, 101),
+                           filled_contour=True,
+                           view=[-2.0, -5.0, 15.0, 5.0],
+                           style='mesnardo',
+                           width=8.0)
+
 
-for time_step in simulation.get_time_steps():
-  simulation.read_fields('vorticity', time_step)
-  simulation.plot_contour('vorticity',
-                          field_range=(-5.0, 5.0, 101),
-                          filled_contour=True,
-                          view=[-2.0, -5.0, 15.0, 5.0],
-                          style='mesnardo',
-                          width=8.0)
+# the guard is required by the worker processes (spawn start method)
+if __name__ == '__main__':
+  main()
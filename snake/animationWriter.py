@@ -0,0 +1,274 @@
+"""
+Implementation of animation sinks that receive rendered frames as raw RGB
+buffers: `VideoWriter` pipes them to a local ffmpeg binary (no intermediate
+image on disk); `ImageSequenceWriter` is the fallback when ffmpeg is not
+available and saves one image per frame.
+"""
+
+import os
+import subprocess
+
+import numpy
+from matplotlib import image
+
+try:
+  from shutil import which
+except ImportError:
+  from distutils.spawn import find_executable as which
+
+
+class VideoWriter(object):
+  """
+  Encodes RGB frames into a video with ffmpeg.
+  The frames are streamed to the standard input of the encoder.
+  """
+
+  def __init__(self, file_path,
+               frame_rate=10,
+               ffmpeg='ffmpeg',
+               codec='libx264',
+               pixel_format='yuv420p',
+               options=[]):
+    """
+    Stores the settings of the encoder (the process is started with the first
+    frame, once the frame size is known).
+
+    Parameters
+    ----------
+    file_path: string
+      Path of the video.
+    frame_rate: integer, optional
+      Number of frames per second;
+      default: 10.
+    ffmpeg: string, optional
+      Name or path of the ffmpeg executable;
+      default: 'ffmpeg'.
+    codec: string, optional
+      Video codec;
+      default: 'libx264'.
+    pixel_format: string, optional
+      Pixel format of the video;
+      default: 'yuv420p'.
+    options: list of strings, optional
+      Other output options passed to ffmpeg (e.g. ['-crf', '18']);
+      default: [].
+    """
+    self.file_path = file_path
+    self.frame_rate = frame_rate
+    self.ffmpeg = ffmpeg
+    self.codec = codec
+    self.pixel_format = pixel_format
+    self.options = list(options)
+    self.shape = None
+    self.process = None
+    self.n_frames = 0
+
+  def get_command(self, width, height):
+    """
+    Returns the ffmpeg command-line for frames of a given size.
+
+    Parameters
+    ----------
+    width, height: integers
+      Size of the frames (in pixels).
+
+    Returns
+    -------
+    command: list of strings
+      The command-line.
+    """
+    return [self.ffmpeg, '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', '{}x{}'.format(width, height), '-pix_fmt', 'rgb24',
+            '-r', str(self.frame_rate), '-i', '-',
+            '-an', '-vcodec', self.codec, '-pix_fmt', self.pixel_format,
+            # most codecs need even dimensions
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2'] + self.options + [
+            self.file_path]
+
+  def write_frame(self, frame, time_step=None):
+    """
+    Sends a frame to the encoder.
+
+    Parameters
+    ----------
+    frame: numpy 3D array of uint8
+      RGB values of the frame (rows, columns, 3); all frames have the same
+      size.
+    time_step: integer, optional
+      Time-step of the frame (unused);
+      default: None.
+    """
+    frame = numpy.ascontiguousarray(frame, dtype=numpy.uint8)
+    if self.process is None:
+      self.shape = frame.shape
+      directory = os.path.dirname(os.path.abspath(self.file_path))
+      if not os.path.isdir(directory):
+        os.makedirs(directory)
+      command = self.get_command(frame.shape[1], frame.shape[0])
+      self.process = subprocess.Popen(command,
+                                      stdin=subprocess.PIPE,
+                                      stderr=subprocess.PIPE)
+    if frame.shape != self.shape:
+      raise ValueError('frame of size {} in a video of size {}'
+                       ''.format(frame.shape, self.shape))
+    try:
+      self.process.stdin.write(frame.tobytes())
+    except (IOError, OSError):
+      # the encoder stopped: report its error message
+      self.close()
+      raise RuntimeError('ffmpeg stopped while encoding '
+                         '{}'.format(self.file_path))
+    self.n_frames += 1
+
+  def close(self):
+    """
+    Closes the stream and waits for the encoder to finish.
+    """
+    if self.process is None:
+      return
+    process, self.process = self.process, None
+    try:
+      process.stdin.close()
+    except (IOError, OSError):
+      pass
+    error = process.stderr.read()
+    process.stderr.close()
+    if process.wait() != 0:
+      raise RuntimeError('ffmpeg failed to encode {}:\n{}'
+                         ''.format(self.file_path,
+                                   error.decode('utf-8', 'replace')))
+    print('[info] video saved in {} ({} frames)'.format(self.file_path,
+                                                        self.n_frames))
+
+  def terminate(self):
+    """
+    Stops the encoder without waiting for the video to be finalized;
+    never raises (used when the frames could not be produced).
+    """
+    if self.process is None:
+      return
+    process, self.process = self.process, None
+    for stream in [process.stdin, process.stderr]:
+      try:
+        stream.close()
+      except (IOError, OSError):
+        pass
+    try:
+      process.terminate()
+    except OSError:
+      pass
+    process.wait()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    # do not hide the exception raised while producing the frames
+    if exc_type is not None:
+      self.terminate()
+    else:
+      self.close()
+
+
+class ImageSequenceWriter(object):
+  """
+  Saves RGB frames as a sequence of images (fallback when no video encoder
+  is available).
+  The images are named '<prefix><time-step>.<fmt>', as the contour plots.
+  """
+
+  def __init__(self, directory, prefix='frame', fmt='png'):
+    """
+    Stores the location of the images.
+
+    Parameters
+    ----------
+    directory: string
+      Directory of the images (created if necessary).
+    prefix: string, optional
+      Prefix of the images;
+      default: 'frame'.
+    fmt: string, optional
+      Format of the images;
+      default: 'png'.
+    """
+    self.directory = directory
+    self.prefix = prefix
+    self.fmt = fmt
+    self.n_frames = 0
+
+  def write_frame(self, frame, time_step=None):
+    """
+    Saves a frame.
+
+    Parameters
+    ----------
+    frame: numpy 3D array of uint8
+      RGB values of the frame (rows, columns, 3).
+    time_step: integer, optional
+      Time-step of the frame (used in the file name);
+      default: None (index of the frame).
+    """
+    if not os.path.isdir(self.directory):
+      os.makedirs(self.directory)
+    if time_step is None:
+      time_step = self.n_frames
+    file_path = os.path.join(self.directory,
+                             '{}{:0>7}.{}'.format(self.prefix, time_step,
+                                                  self.fmt))
+    image.imsave(file_path, numpy.asarray(frame, dtype=numpy.uint8),
+                 format=self.fmt)
+    self.n_frames += 1
+
+  def close(self):
+    """
+    Nothing to flush: the images are saved as they come.
+    """
+    print('[info] {} images saved in {}'.format(self.n_frames,
+                                                self.directory))
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+
+def get_animation_writer(file_path, frame_rate=10, ffmpeg='ffmpeg',
+                         fmt='png', **kwargs):
+  """
+  Returns a video writer if ffmpeg is available, an image-sequence writer
+  otherwise.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the video; without ffmpeg, the images are saved in the directory
+    '<file path without extension>' with the prefix '<file name without
+    extension>'.
+  frame_rate: integer, optional
+    Number of frames per second;
+    default: 10.
+  ffmpeg: string, optional
+    Name or path of the ffmpeg executable (None to force the fallback);
+    default: 'ffmpeg'.
+  fmt: string, optional
+    Format of the images of the fallback;
+    default: 'png'.
+  **kwargs: dictionary
+    Other keyword-arguments passed to the constructor of `VideoWriter`.
+
+  Returns
+  -------
+  writer: VideoWriter or ImageSequenceWriter object
+    The animation sink.
+  """
+  executable = which(ffmpeg) if ffmpeg else None
+  if executable:
+    return VideoWriter(file_path, frame_rate=frame_rate, ffmpeg=executable,
+                       **kwargs)
+  root = os.path.splitext(file_path)[0]
+  print('[warning] ffmpeg not found; frames saved as images in {}'
+        ''.format(root))
+  return ImageSequenceWriter(root, prefix=os.path.basename(root), fmt=fmt)
@@ -4,11 +4,22 @@ numerical solution from BarbaGroup's software (cuIBM and PetIBM).
 """
 
 import os
+import uuid
+import functools
 
 import numpy
 
 from .simulation import Simulation
 from .field import Field
+from .fieldStore import FieldStore
+from .force import Force
+from .probe import Probe
+from .pipeline import map_time_steps
+from . import vtkWriter
+from . import outOfCore
+from . import derivedFields
+from . import contourRenderer
+from . import animationWriter
 
 
 class BarbaGroupSimulation(Simulation):
@@ -101,19 +112,206 @@ class BarbaGroupSimulation(Simulation):
     """
     return (self.grid[0][-1] - self.grid[0][0]) / (self.grid[0].size - 1)
 
+  def set_field_store(self, memory_budget=None, max_time_steps=1):
+    """
+    Creates the store that keeps the fields read or computed at each
+    time-step and registers how each field is obtained.
+
+    The fluxes and the pressure are read from files;
+    the velocity is computed from the fluxes;
+    the vorticity, the cell-centered velocity, and the derived quantities
+    (see `compute_derived_fields`) are computed from the velocity.
+
+    Parameters
+    ----------
+    memory_budget: integer, optional
+      Maximum number of bytes used by the stored fields;
+      the least-recently-used fields are evicted beyond that limit;
+      default: None (no limit).
+    max_time_steps: integer, optional
+      Maximum number of time-steps stored;
+      default: 1 (only the fields of the current time-step are kept);
+      None means no limit.
+
+    Returns
+    -------
+    field_store: FieldStore object
+      The store.
+    """
+    dim = len(self.grid)
+    directions = ['x', 'y', 'z'][:dim]
+    fluxes = [direction + '-flux' for direction in directions]
+    velocities = [direction + '-velocity' for direction in directions]
+    self.field_store = FieldStore(memory_budget=memory_budget,
+                                  max_time_steps=max_time_steps)
+    self.field_store.register(['pressure'], self._produce_pressure)
+    self.field_store.register(fluxes, self._produce_fluxes)
+    self.field_store.register(velocities, self._produce_velocity,
+                              dependencies=fluxes)
+    self.field_store.register(['vorticity'], self._produce_vorticity,
+                              dependencies=velocities[:2])
+    self.field_store.register([name + '-centered' for name in velocities],
+                              self._produce_velocity_cell_centers,
+                              dependencies=velocities)
+    # derived quantities (the vorticity components are computed together)
+    quantities = (derivedFields.QUANTITIES_2D if dim == 2
+                  else derivedFields.QUANTITIES_3D)
+    groups = [[name] for name in quantities if 'vorticity' not in name]
+    groups.append([name for name in quantities if 'vorticity' in name])
+    for names in groups:
+      self.field_store.register(names,
+                                functools.partial(self._produce_derived_fields,
+                                                  names),
+                                dependencies=velocities)
+    return self.field_store
+
+  def get_field_store(self):
+    """
+    Returns the field store (created with the default settings if necessary:
+    only the fields of the current time-step are kept).
+
+    Returns
+    -------
+    field_store: FieldStore object
+      The store.
+    """
+    if getattr(self, 'field_store', None) is None:
+      self.set_field_store()
+    return self.field_store
+
+  def set_out_of_core(self, memory_limit=None, directory=None):
+    """
+    Sets the chunked (out-of-core) execution of the derived-field
+    computations for 3D simulations.
+
+    The velocity, the vorticity, and the cell-centered velocity are then
+    computed slab by slab along the z-direction, from memory-mapped inputs
+    into memory-mapped .npy files; the slabs of all arrays involved fit in
+    the memory limit.
+
+    Parameters
+    ----------
+    memory_limit: integer, optional
+      Maximum number of bytes used by the slabs;
+      default: None (fields are computed in memory).
+    directory: string, optional
+      Directory where the results are stored (a new file for each field
+      computed; see `clear_scratch`);
+      default: None (<simulation-directory>/scratch).
+    """
+    self.memory_limit = memory_limit
+    if not directory:
+      directory = os.path.join(self.directory, 'scratch')
+    self.scratch_directory = directory
+
+  def clear_scratch(self):
+    """
+    Removes the files of the fields computed out of core (and the scratch
+    directory if it is then empty).
+
+    Returns
+    -------
+    n_files: integer
+      Number of files removed.
+    """
+    directory = getattr(self, 'scratch_directory', None)
+    if directory is None:
+      return 0
+    return outOfCore.remove_outputs(directory)
+
+  def _get_slab_size(self, shape, n_arrays, halo=0):
+    """
+    Returns the number of z-planes per slab to process arrays of a given
+    shape, or None if the computation is done in memory.
+    """
+    memory_limit = getattr(self, 'memory_limit', None)
+    if memory_limit is None or len(shape) < 3:
+      return None
+    return outOfCore.get_slab_size(numpy.prod(shape[1:]), n_arrays,
+                                   memory_limit, halo=halo)
+
+  def _open_output(self, name, time_step, shape):
+    """
+    Creates a new memory-mapped file storing a field computed slab by slab.
+    """
+    return outOfCore.open_output(self.scratch_directory,
+                                 '{}{:0>7}'.format(name, time_step), shape)
+
+  def _produce_pressure(self, time_step, **kwargs):
+    return self.read_pressure(time_step, directory=kwargs.get('directory'))
+
+  def _produce_fluxes(self, time_step, **kwargs):
+    return self.read_fluxes(time_step, **kwargs)
+
+  def _produce_velocity(self, time_step, *fluxes, **kwargs):
+    print('[time-step {}] get velocity fields ...'.format(time_step))
+    # do not convert in place: the fluxes are kept in the store
+    return self.compute_velocity(fluxes, in_place=False)
+
+  def _produce_vorticity(self, time_step, u, v, **kwargs):
+    return self.compute_vorticity(u=u, v=v)
+
+  def _produce_velocity_cell_centers(self, time_step, *velocities, **kwargs):
+    return self.get_velocity_cell_centers(*velocities)
+
+  def _produce_derived_fields(self, names, time_step, *velocities, **kwargs):
+    return self.compute_derived_fields(names, *velocities)
+
+  def get_field(self, field_name, time_step,
+                periodic_directions=[],
+                directory=None):
+    """
+    Returns a field at a given time-step from the field store;
+    the field is read or computed only if not already stored.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field;
+      choices: 'pressure', 'vorticity',
+               'x-velocity', 'y-velocity', 'z-velocity',
+               'x-flux', 'y-flux', 'z-flux',
+               'x-velocity-centered', 'y-velocity-centered',
+               'z-velocity-centered'.
+    time_step: integer
+      Time-step at which the solution is read.
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+    directory: string, optional
+      Directory containing the numerical solution at given time-step;
+      default: None (will use <simulation-directory>/<time-step>).
+
+    Returns
+    -------
+    field: Field object
+      The field.
+    """
+    if not directory:
+      directory = os.path.join(self.directory, '{:0>7}'.format(time_step))
+    return self.get_field_store().get(time_step, field_name,
+                                      periodic_directions=periodic_directions,
+                                      directory=directory)
+
   def read_fields(self, field_names, time_step,
                   periodic_directions=[],
                   directory=None):
     """
     Gets the fields at a given time-step.
 
+    The fields are taken from the field store (see `set_field_store`);
+    fields already stored are neither read nor computed again.
+
     Parameters
     ----------
     field_names: list of strings or single string
       Name of the fields to get;
       choices: 'pressure', 'vorticity',
-               'x-velocity', 'y-velocity',
-               'x-flux', 'y-flux'.
+               'x-velocity', 'y-velocity', 'z-velocity',
+               'x-flux', 'y-flux', 'z-flux',
+               'x-velocity-centered', 'y-velocity-centered',
+               'z-velocity-centered'.
     time_step: integer
       Time-step at which the solution is read.
     periodic_directions: list of strings, optional
@@ -127,54 +325,136 @@ class BarbaGroupSimulation(Simulation):
     # convert field_names in list if single string provided
     if not isinstance(field_names, (list, tuple)):
       field_names = [field_names]
-    if not directory:
-      directory = os.path.join(self.directory, '{:0>7}'.format(time_step))
-    if 'pressure' in field_names:
-      self.fields['pressure'] = self.read_pressure(time_step,
-                                                   directory=directory)
-    if any(name in ['x-flux', 'y-flux'] for name in field_names):
-      fluxes = self.read_fluxes(time_step,
-                                periodic_directions=periodic_directions,
-                                directory=directory)
-      self.fields['x-flux'], self.fields['y-flux'] = fluxes
-    if any(name in ['x-velocity', 'y-velocity'] for name in field_names):
-      velocities = self.get_velocity(time_step,
-                                     periodic_directions=periodic_directions,
-                                     directory=directory)
-      self.fields['x-velocity'], self.fields['y-velocity'] = velocities
-    if 'vorticity' in field_names:
-      velocities = self.get_velocity(time_step,
-                                     periodic_directions=periodic_directions,
-                                     directory=directory)
-      self.fields['x-velocity'], self.fields['y-velocity'] = velocities
-      self.fields['vorticity'] = self.compute_vorticity()
-
-  def compute_vorticity(self):
-    """
-    Computes the vorticity field for a two-dimensional simulation.
+    directions = ['x', 'y', 'z'][:len(self.grid)]
+    groups = {'flux': [direction + '-flux' for direction in directions],
+              'velocity': [direction + '-velocity'
+                           for direction in directions],
+              'velocity-centered': [direction + '-velocity-centered'
+                                    for direction in directions]}
+    names = []
+    for name in field_names:
+      if name == 'vorticity':
+        names += groups['velocity']
+      elif name.split('-', 1)[-1] in groups.keys():
+        names += groups[name.split('-', 1)[-1]]
+      names.append(name)
+    for name in names:
+      field = self.get_field(name, time_step,
+                             periodic_directions=periodic_directions,
+                             directory=directory)
+      self.fields[name] = field
+
+  def compute_vorticity(self, u=None, v=None):
+    """
+    Computes the vorticity field (z-component) from the staggered velocity.
+
+    For a 3D simulation, the z-component is computed in each z-plane;
+    in out-of-core mode (see `set_out_of_core`), it is computed slab by slab
+    into a memory-mapped file.
+
+    Parameters
+    ----------
+    u, v: Field objects, optional
+      Velocity in the x- and y-directions;
+      default: None (use the fields 'x-velocity' and 'y-velocity').
 
     Returns
     -------
     vorticity: Field object
       The vorticity field.
     """
-    time_step = self.fields['x-velocity'].time_step
+    if u is None:
+      u = self.fields['x-velocity']
+    if v is None:
+      v = self.fields['y-velocity']
+    time_step = u.time_step
     print('[time-step {}] computing the vorticity field ...'.format(time_step))
-    u, v = self.fields['x-velocity'], self.fields['y-velocity']
     mask_x = numpy.where(numpy.logical_and(u.x > v.x[0], u.x < v.x[-1]))[0]
     mask_y = numpy.where(numpy.logical_and(v.y > u.y[0], v.y < u.y[-1]))[0]
     # vorticity nodes at cell vertices intersection
     xw, yw = 0.5 * (v.x[:-1] + v.x[1:]), 0.5 * (u.y[:-1] + u.y[1:])
-    # compute vorticity
-    w = ((v.values[mask_y, 1:] - v.values[mask_y, :-1])
-         / numpy.outer(numpy.ones(yw.size), v.x[1:] - v.x[:-1])
-         - (u.values[1:, mask_x] - u.values[:-1, mask_x])
-         / numpy.outer(u.y[1:] - u.y[:-1], numpy.ones(xw.size)))
+    # grid-spacings broadcast along the rows and columns
+    dx = v.x[1:] - v.x[:-1]
+    dy = (u.y[1:] - u.y[:-1])[:, numpy.newaxis]
+
+    def compute(u_values, v_values):
+      return ((v_values[..., mask_y, 1:] - v_values[..., mask_y, :-1]) / dx
+              - (u_values[..., 1:, mask_x] - u_values[..., :-1, mask_x]) / dy)
+
+    if u.z is None:
+      return Field(label='vorticity',
+                   time_step=time_step,
+                   x=xw, y=yw,
+                   values=compute(u.values, v.values))
+    shape = (u.z.size, yw.size, xw.size)
+    slab_size = self._get_slab_size(shape, 3)
+    if slab_size:
+      w = self._open_output('vorticity', time_step, shape)
+      for start, end, _, _ in outOfCore.iterate_slabs(shape[0], slab_size):
+        w[start:end] = compute(u.values[start:end], v.values[start:end])
+      w = outOfCore.close_output(w)
+    else:
+      w = compute(u.values, v.values)
     return Field(label='vorticity',
                  time_step=time_step,
-                 x=xw, y=yw,
+                 x=xw, y=yw, z=u.z,
                  values=w)
 
+  def compute_derived_fields(self, names, u=None, v=None, w=None):
+    """
+    Computes quantities derived from the staggered velocity at the interior
+    cell-centers: vorticity components, Q-criterion, lambda2 (3D only),
+    divergence, and velocity magnitude.
+
+    3D fields are processed by slabs of z-planes (into memory-mapped files
+    in out-of-core mode, see `set_out_of_core`).
+
+    Parameters
+    ----------
+    names: list of strings or single string
+      Names of the quantities;
+      choices: 'x-vorticity', 'y-vorticity', 'z-vorticity', 'q-criterion',
+      'lambda2', 'divergence', 'velocity-magnitude'.
+    u, v, w: Field objects, optional
+      Staggered velocity in the x-, y-, and z-directions;
+      default: None (use the fields 'x-velocity', 'y-velocity', and
+      'z-velocity').
+
+    Returns
+    -------
+    fields: tuple of Field objects
+      The quantities (in the order of the names).
+    """
+    if not isinstance(names, (list, tuple)):
+      names = [names]
+    if u is None:
+      u = self.fields['x-velocity']
+    if v is None:
+      v = self.fields['y-velocity']
+    if w is None and 'z-velocity' in self.fields.keys():
+      w = self.fields['z-velocity']
+    time_step = u.time_step
+    print('[time-step {}] computing {} ...'.format(time_step,
+                                                   ', '.join(names)))
+    stations = derivedFields.get_cell_centers(u, v, w)
+    # slabs of the velocity gradient, velocity, inputs, and outputs
+    slab_size = self._get_slab_size([s.size for s in reversed(stations)],
+                                    15 + len(names), halo=1)
+    allocate = None
+    if slab_size:
+      allocate = (lambda name, shape:
+                  self._open_output(name, time_step, shape))
+    stations, outputs = derivedFields.compute_derived_fields(
+        names, u, v, w=w, slab_size=(slab_size or 16), allocate=allocate)
+    if allocate:
+      outputs = [outOfCore.close_output(values) for values in outputs]
+    return tuple(Field(label=name,
+                       time_step=time_step,
+                       x=stations[0], y=stations[1],
+                       z=(stations[2] if len(stations) == 3 else None),
+                       values=values)
+                 for name, values in zip(names, outputs))
+
   def get_velocity(self, time_step,
                    periodic_directions=[],
                    directory=None):
@@ -201,62 +481,69 @@ class BarbaGroupSimulation(Simulation):
       Velocity in the x-, y-, and z-directions.
     """
     print('[time-step {}] get velocity fields ...'.format(time_step))
+    # fluxes are memory-mapped in copy-on-write mode (when supported)
+    # so that they can be converted in place
     fluxes = self.read_fluxes(time_step,
                               periodic_directions=periodic_directions,
-                              directory=directory)
-    dim3 = (len(self.grid) == 3)
-    # get stations, cell-widths, and number of cells in x- and y-directions
-    x, y = self.grid[:2]
-    dx, dy = x[1:] - x[:-1], y[1:] - y[:-1]
-    if dim3:
-      # get stations, cell-widths, and number of cells in z-direction
-      z = self.grid[2]
-      dz = z[1:] - z[:-1]
-    if dim3:
-      ux = numpy.empty_like(fluxes[0].values, dtype=numpy.float64)
-      for k in range(fluxes[0].shape[0]):
-        for j in range(fluxes[0].shape[1]):
-          for i in range(fluxes[0].shape[2]):
-            ux[k, j, i] = fluxes[0].values[k, j, i] / dy[j] / dz[k]
-      ux = Field(label='x-velocity',
-                 time_step=time_step,
-                 x=fluxes[0].x, y=fluxes[0].y, z=fluxes[0].z,
-                 values=ux)
-      uy = numpy.empty_like(fluxes[1].values, dtype=numpy.float64)
-      for k in range(fluxes[1].shape[0]):
-        for j in range(fluxes[1].shape[1]):
-          for i in range(fluxes[1].shape[2]):
-            uy[k, j, i] = fluxes[1].values[k, j, i] / dx[i] / dz[k]
-      uy = Field(label='y-velocity',
-                 time_step=time_step,
-                 x=fluxes[1].x, y=fluxes[1].y, z=fluxes[1].z,
-                 values=uy)
-      uz = numpy.empty_like(fluxes[2].values, dtype=numpy.float64)
-      for k in range(fluxes[2].shape[0]):
-        for j in range(fluxes[2].shape[1]):
-          for i in range(fluxes[2].shape[2]):
-            uz[k, j, i] = fluxes[2].values[k, j, i] / dx[i] / dy[j]
-      uz = Field(label='z-velocity',
-                 time_step=time_step,
-                 x=fluxes[2].x, y=fluxes[2].y, z=fluxes[2].z,
-                 values=uz)
-      return ux, uy, uz
-    else:
-      ux = numpy.empty_like(fluxes[0].values, dtype=numpy.float64)
-      for i in range(fluxes[0].values.shape[1]):
-        ux[:, i] = fluxes[0].values[:, i] / dy[:]
-      ux = Field(label='x-velocity',
-                 time_step=time_step,
-                 x=fluxes[0].x, y=fluxes[0].y,
-                 values=ux)
-      uy = numpy.empty_like(fluxes[1].values, dtype=numpy.float64)
-      for j in range(fluxes[1].values.shape[0]):
-        uy[j, :] = fluxes[1].values[j, :] / dx[:]
-      uy = Field(label='y-velocity',
-                 time_step=time_step,
-                 x=fluxes[1].x, y=fluxes[1].y,
-                 values=uy)
-      return ux, uy
+                              directory=directory,
+                              mode='c')
+    return self.compute_velocity(fluxes, in_place=True)
+
+  def compute_velocity(self, fluxes, in_place=False):
+    """
+    Converts the fluxes into velocity-components.
+
+    Each flux is divided by the area of the cell-face it goes through;
+    the face areas are broadcast along the flux arrays so that the division
+    is done in a single pass over the data.
+    In out-of-core mode (see `set_out_of_core`), 3D velocities are written
+    slab by slab into memory-mapped files.
+
+    Parameters
+    ----------
+    fluxes: list of Field objects
+      Fluxes in the x-, y-, and (optionally) z-directions.
+    in_place: boolean, optional
+      Set 'True' to divide the flux values in place when the arrays are
+      writable (the fluxes are then overwritten by the velocity);
+      default: False.
+
+    Returns
+    -------
+    ux, uy, uz: Field objects
+      Velocity in the x-, y-, and z-directions.
+    """
+    labels = ['x-velocity', 'y-velocity', 'z-velocity']
+    widths = [stations[1:] - stations[:-1] for stations in self.grid]
+    velocities = []
+    for direction, flux in enumerate(fluxes):
+      area = get_face_areas(widths, direction)
+      slab_size = self._get_slab_size(flux.values.shape, 2)
+      if slab_size:
+        values = self._open_output(labels[direction], flux.time_step,
+                                   flux.values.shape)
+        for start, end, _, _ in outOfCore.iterate_slabs(values.shape[0],
+                                                        slab_size):
+          numpy.divide(flux.values[start:end],
+                       area[start:end] if area.shape[0] > 1 else area,
+                       out=values[start:end])
+        values = outOfCore.close_output(values)
+      elif in_place and flux.values.flags.writeable:
+        values = flux.values
+        numpy.divide(values, area, out=values)
+      else:
+        values = numpy.divide(flux.values, area, dtype=numpy.float64)
+      if len(widths) == 3:
+        velocities.append(Field(label=labels[direction],
+                                time_step=flux.time_step,
+                                x=flux.x, y=flux.y, z=flux.z,
+                                values=values))
+      else:
+        velocities.append(Field(label=labels[direction],
+                                time_step=flux.time_step,
+                                x=flux.x, y=flux.y,
+                                values=values))
+    return tuple(velocities)
 
   def subtract(self, other, field_name, label=None):
     """
@@ -279,7 +566,8 @@ class BarbaGroupSimulation(Simulation):
                                                   label=label)
     self.fields[difference.label] = difference
 
-  def get_difference(self, other, field_name, mask=None, norm=None):
+  def get_difference(self, other, field_name, mask=None, norm=None,
+                     registry=None):
     """
     Returns the difference in a given norm between a field and another.
 
@@ -295,22 +583,25 @@ class BarbaGroupSimulation(Simulation):
     norm: string, optional
       Norm to use to compute the difference;
       default: None.
+    registry: GridRegistry object, optional
+      Registry caching the index maps between gridlines;
+      default: None (a module-level registry).
 
     Returns
     -------
     difference: float
       The difference between the two fields in a given norm.
     """
-    if mask:
-      x, y = mask.fields[field_name].x, mask.fields[field_name].y
-    else:
-      x, y = self.fields[field_name].x, self.fields[field_name].y
+    field = (mask if mask else self).fields[field_name]
     return self.fields[field_name].get_difference(other.fields[field_name],
-                                                  x=x,
-                                                  y=y,
-                                                  norm=norm)
+                                                  x=field.x,
+                                                  y=field.y,
+                                                  z=field.z,
+                                                  norm=norm,
+                                                  registry=registry)
 
-  def get_differences(self, other, field_names, mask=None, norm=None):
+  def get_differences(self, other, field_names, mask=None, norm=None,
+                      registry=None):
     """
     Returns the difference in a given norm between a field and another.
 
@@ -326,6 +617,9 @@ class BarbaGroupSimulation(Simulation):
     norm: string, optional
       Norm to use to compute the difference;
       default: None.
+    registry: GridRegistry object, optional
+      Registry caching the index maps between gridlines;
+      default: None (a module-level registry).
 
     Returns
     -------
@@ -336,7 +630,8 @@ class BarbaGroupSimulation(Simulation):
     errors = {}
     for field_name in field_names:
       errors[field_name] = self.get_difference(other, field_name,
-                                               mask=None, norm=None)
+                                               mask=mask, norm=norm,
+                                               registry=registry)
     return errors
 
   def plot_contour(self, field_name,
@@ -351,9 +646,10 @@ class BarbaGroupSimulation(Simulation):
                    colors=None,
                    style=None,
                    width=8.0,
-                   dpi=100):
+                   dpi=100,
+                   plane=None):
     """
-    Plots and saves the field.
+    Plots and saves the field (or a plane of a 3D field).
 
     Parameters
     ----------
@@ -404,10 +700,61 @@ class BarbaGroupSimulation(Simulation):
     dpi: integer, optional
       Dots per inch (resolution);
       default: 100
+    plane: dictionary of (string, float) items, optional
+      Position of the plane to plot for a 3D field (e.g. {'z': 0.5});
+      default: None.
+    """
+    view, save_directory = self._get_contour_layout(
+        field_name, view=view, save_directory=save_directory, style=style)
+    # plot contour
+    field = self.fields[field_name]
+    if plane:
+      field = field.get_plane(**plane)
+    field.plot_contour(field_range=field_range,
+                       filled_contour=filled_contour,
+                       view=view,
+                       bodies=bodies,
+                       time_increment=time_increment,
+                       save_directory=save_directory,
+                       save_name=save_name,
+                       fmt=fmt,
+                       colorbar=colorbar,
+                       cmap=cmap,
+                       colors=colors,
+                       width=width,
+                       dpi=dpi)
+
+  def _get_contour_layout(self, field_name,
+                          view=(None, None, None, None),
+                          save_directory=None,
+                          style=None):
+    """
+    Completes the view of a contour plot with the limits of the domain,
+    creates the directory of the images, and loads the Matplotlib style.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to plot.
+    view: tuple or list of 4 floats, optional
+      Bottom-left and top-right coordinates of the rectangular view to plot;
+      default: (None, None, None, None), the whole domain.
+    save_directory: string, optional
+      Directory where to save the figures;
+      default: None (will be the folder '<simu dir>/images').
+    style: string, optional
+      Path of the Matplotlib style-sheet to use;
+      default: None.
+
+    Returns
+    -------
+    view: list of 4 floats
+      Bottom-left and top-right coordinates of the view.
+    save_directory: string
+      Directory of the images.
     """
     # set view
-    if isinstance(view, tuple):
-      view = list(view)
+    view = list(view)
     view[0] = (self.grid[0].min() if view[0] is None else view[0])
     view[1] = (self.grid[1].min() if view[1] is None else view[1])
     view[2] = (self.grid[0].max() if view[2] is None else view[2])
@@ -435,20 +782,321 @@ class BarbaGroupSimulation(Simulation):
                 '{}'.format(style))
           pass
       self.style_loaded = True
-    # plot contour
-    self.fields[field_name].plot_contour(field_range=field_range,
-                                         filled_contour=filled_contour,
-                                         view=view,
-                                         bodies=bodies,
-                                         time_increment=time_increment,
-                                         save_directory=save_directory,
-                                         save_name=save_name,
-                                         fmt=fmt,
-                                         colorbar=colorbar,
-                                         cmap=cmap,
-                                         colors=colors,
-                                         width=width,
-                                         dpi=dpi)
+    return view, save_directory
+
+  def get_contour_renderer(self, field_name, field=None,
+                           view=(None, None, None, None),
+                           save_directory=None,
+                           style=None,
+                           plane=None,
+                           **kwargs):
+    """
+    Creates a figure template to render the contours of a field at several
+    time-steps (the figure, colorbar, and bodies are drawn once).
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to plot.
+    field: Field object, optional
+      Field used to define the grid (and the contour levels if no field range
+      is provided);
+      default: None (the field currently loaded, or its plane).
+    view: tuple or list of 4 floats, optional
+      Bottom-left and top-right coordinates of the rectangular view to plot;
+      default: (None, None, None, None), the whole domain.
+    save_directory: string, optional
+      Directory where to save the figures;
+      default: None (will be the folder '<simu dir>/images').
+    style: string, optional
+      Path of the Matplotlib style-sheet to use;
+      default: None.
+    plane: dictionary of (string, float) items, optional
+      Position of the plane to plot for a 3D field (e.g. {'z': 0.5});
+      default: None.
+    **kwargs: dictionary
+      Other keyword-arguments passed to the method
+      `Field.get_contour_renderer`.
+
+    Returns
+    -------
+    renderer: ContourRenderer object
+      The figure template.
+    """
+    if field is None:
+      field = self.fields[field_name]
+      if plane:
+        field = field.get_plane(**plane)
+    view, save_directory = self._get_contour_layout(
+        field_name, view=view, save_directory=save_directory, style=style)
+    return field.get_contour_renderer(view=view,
+                                      save_directory=save_directory,
+                                      **kwargs)
+
+  def plot_contours(self, field_name,
+                    time_steps=None,
+                    periodic_directions=[],
+                    n_processes=None,
+                    max_in_flight=None,
+                    **kwargs):
+    """
+    Reads (or computes), plots, and saves a field at several time-steps.
+
+    The time-steps are distributed over a pool of processes;
+    each process reads, derives, and renders one time-step at a time.
+    When a field range is provided (fixed contour levels), each process
+    builds its figure template once and only updates the contour of the
+    following time-steps.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to plot.
+    time_steps: list of integers, optional
+      Time-steps to plot;
+      default: None (all saved time-steps).
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+    n_processes: integer, optional
+      Number of processes;
+      default: None (number of CPUs).
+    max_in_flight: integer, optional
+      Maximum number of time-steps submitted to the pool at any time;
+      default: None (twice the number of processes).
+    **kwargs: dictionary
+      Keyword-arguments passed to the method `plot_contour`.
+    """
+    if time_steps is None:
+      time_steps = self.get_time_steps()
+    # key identifying the figure templates of the present call
+    template_key = uuid.uuid4().hex
+    results = map_time_steps(self, _render_contour, time_steps,
+                             n_processes=n_processes,
+                             max_in_flight=max_in_flight,
+                             field_name=field_name,
+                             periodic_directions=periodic_directions,
+                             plot_settings=kwargs,
+                             template_key=template_key)
+    try:
+      for time_step, _ in results:
+        print('[time-step {}] {} contour done'.format(time_step, field_name))
+    finally:
+      contourRenderer.set_template(None, None)
+
+  def animate_contours(self, field_name,
+                       field_range,
+                       time_steps=None,
+                       file_path=None,
+                       frame_rate=10,
+                       ffmpeg='ffmpeg',
+                       periodic_directions=[],
+                       n_processes=None,
+                       max_in_flight=None,
+                       **kwargs):
+    """
+    Renders the contours of a field at several time-steps and streams the
+    frames (raw RGB buffers) into a video encoded by ffmpeg; the frames are
+    saved as images if ffmpeg is not available.
+
+    The frames are rendered in parallel (one figure template per process)
+    and written in the order of the time-steps.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to animate.
+    field_range: list of floats
+      Min value, max value and number of contours to plot
+      (the same for every frame).
+    time_steps: list of integers, optional
+      Time-steps to animate;
+      default: None (all saved time-steps).
+    file_path: string, optional
+      Path of the video;
+      default: None ('<save name>.mp4' in the directory of the contour
+      plots).
+    frame_rate: integer, optional
+      Number of frames per second;
+      default: 10.
+    ffmpeg: string, optional
+      Name or path of the ffmpeg executable (None to save images);
+      default: 'ffmpeg'.
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+    n_processes: integer, optional
+      Number of processes;
+      default: None (number of CPUs).
+    max_in_flight: integer, optional
+      Maximum number of frames rendered but not yet written;
+      default: None (twice the number of processes).
+    **kwargs: dictionary
+      Other keyword-arguments of the method `plot_contour` (e.g. `view`,
+      `bodies`, `time_increment`, `plane`).
+
+    Returns
+    -------
+    file_path: string
+      Path of the video (or of the directory of the images).
+    """
+    if time_steps is None:
+      time_steps = self.get_time_steps()
+    kwargs['field_range'] = field_range
+    if not file_path:
+      _, save_directory = self._get_contour_layout(
+          field_name, view=kwargs.get('view', (None, None, None, None)),
+          save_directory=kwargs.get('save_directory'))
+      file_path = os.path.join(save_directory,
+                               '{}.mp4'.format(kwargs.get('save_name')
+                                               or field_name))
+    writer = animationWriter.get_animation_writer(file_path,
+                                                  frame_rate=frame_rate,
+                                                  ffmpeg=ffmpeg,
+                                                  fmt=kwargs.get('fmt',
+                                                                 'png'))
+    template_key = uuid.uuid4().hex
+    results = map_time_steps(self, _render_contour_frame, time_steps,
+                             n_processes=n_processes,
+                             max_in_flight=max_in_flight,
+                             field_name=field_name,
+                             periodic_directions=periodic_directions,
+                             plot_settings=kwargs,
+                             template_key=template_key)
+    try:
+      with writer:
+        for time_step, frame in results:
+          writer.write_frame(frame, time_step=time_step)
+    finally:
+      contourRenderer.set_template(None, None)
+    if isinstance(writer, animationWriter.ImageSequenceWriter):
+      return writer.directory
+    return file_path
+
+  def get_probe(self, field_name, points, time_step=None,
+                periodic_directions=[]):
+    """
+    Locates points in the grid of a field and returns the associated probe.
+
+    Velocity probes sample the fluxes directly: the interpolation weights are
+    divided by the area of the cell-faces, so that the velocity is never
+    computed on the whole grid.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to probe;
+      choices: 'pressure', 'x-velocity', 'y-velocity', 'z-velocity',
+               'x-flux', 'y-flux', 'z-flux'.
+    points: numpy 2D array of floats
+      Coordinates of the points (one row per point).
+    time_step: integer, optional
+      Time-step used to get the stations of the field;
+      default: None (first saved time-step).
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+
+    Returns
+    -------
+    probe: Probe object
+      The probe (samples the values of the pressure or of the fluxes).
+    """
+    if time_step is None:
+      time_step = self.get_time_steps()[0]
+    field = _read_probed_field(self, time_step, field_name,
+                               periodic_directions=periodic_directions)
+    stations = [field.x, field.y]
+    if len(self.grid) == 3:
+      stations.append(field.z)
+    probe = Probe(stations, points)
+    if field_name.endswith('-velocity'):
+      widths = [s[1:] - s[:-1] for s in self.grid]
+      area = get_face_areas(widths, 'xyz'.index(field_name[0]))
+      area = numpy.broadcast_to(area, field.values.shape)
+      probe.weights /= area[numpy.unravel_index(probe.indices,
+                                                field.values.shape)]
+    return probe
+
+  def get_probe_history(self, field_name, points,
+                        time_steps=None,
+                        time_increment=None,
+                        periodic_directions=[],
+                        labels=None,
+                        n_processes=None,
+                        max_in_flight=None):
+    """
+    Samples a field at given points over several time-steps.
+
+    The cells containing the points are located once; at each time-step,
+    only the entries of the solution files surrounding the points are read
+    (the files are memory-mapped).
+    The time-steps are distributed over a pool of processes.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to probe;
+      choices: 'pressure', 'x-velocity', 'y-velocity', 'z-velocity',
+               'x-flux', 'y-flux', 'z-flux'.
+    points: numpy 2D array of floats
+      Coordinates of the points (one row per point).
+    time_steps: list of integers, optional
+      Time-steps to sample;
+      default: None (all saved time-steps).
+    time_increment: float, optional
+      Time-increment used to convert the time-steps into times;
+      default: None (the times are the time-steps).
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+    labels: list of strings, optional
+      Label of each time-series;
+      default: None (<field_name>-probe<index>).
+    n_processes: integer, optional
+      Number of processes;
+      default: None (number of CPUs).
+    max_in_flight: integer, optional
+      Maximum number of time-steps submitted to the pool at any time;
+      default: None (twice the number of processes).
+
+    Returns
+    -------
+    histories: list of Force objects
+      Time-series of the field at each point
+      (NaN if the point is outside the grid).
+    """
+    if time_steps is None:
+      time_steps = self.get_time_steps()
+    print('[info] probing {} at {} time-steps ...'.format(field_name,
+                                                          len(time_steps)))
+    probe = self.get_probe(field_name, points, time_step=time_steps[0],
+                           periodic_directions=periodic_directions)
+    results = map_time_steps(self, _sample_probe, time_steps,
+                             n_processes=n_processes,
+                             max_in_flight=max_in_flight,
+                             shared={'probe': probe},
+                             field_name=field_name,
+                             periodic_directions=periodic_directions)
+    samples = numpy.empty((len(time_steps), probe.n_points))
+    for index, (time_step, values) in enumerate(results):
+      samples[index] = values
+    times = numpy.array(time_steps, dtype=numpy.float64)
+    if time_increment:
+      times *= time_increment
+    if not labels:
+      labels = ['{}-probe{}'.format(field_name, index)
+                for index in range(probe.n_points)]
+    histories = []
+    for index, label in enumerate(labels):
+      history = Force()
+      history.set(times, samples[:, index], label=label)
+      histories.append(history)
+    return histories
 
   def plot_gridline_values(self, field_name,
                            x=[], y=[],
@@ -467,10 +1115,10 @@ class BarbaGroupSimulation(Simulation):
     ----------
     field_name: string
       Name of the field to plot.
-    x: list of floats, optional
+    x: list or numpy 1D array of floats, optional
       List of vertical gridlines defined by their x-position;
       default: [].
-    y: list of floats, optional
+    y: list or numpy 1D array of floats, optional
       List of horizontal gridlines defined by their y-position;
       default: [].
     boundaries: 2-tuple of floats, optional
@@ -498,15 +1146,12 @@ class BarbaGroupSimulation(Simulation):
       data;
       default: empty dictionary.
     """
-    if not isinstance(x, (list, tuple)):
-      x = [x]
-    if not isinstance(y, (list, tuple)):
-      y = [y]
-    if not (x or y):
+    x, y = numpy.atleast_1d(x), numpy.atleast_1d(y)
+    if not (x.size or y.size):
       print('[error] provide either x or y keyword arguments')
       return
     f = self.fields[field_name]
-    if x:
+    if x.size:
       f.plot_vertical_gridline_values(x=x,
                                       boundaries=boundaries,
                                       plot_settings=plot_settings,
@@ -514,7 +1159,7 @@ class BarbaGroupSimulation(Simulation):
                                       show=show,
                                       other_data=other_data,
                                       other_plot_settings=other_settings)
-    if y:
+    if y.size:
       f.plot_horizontal_gridline_values(y=y,
                                         boundaries=boundaries,
                                         plot_settings=plot_settings,
@@ -523,69 +1168,122 @@ class BarbaGroupSimulation(Simulation):
                                         other_data=other_data,
                                         other_plot_settings=other_settings)
 
-  def get_velocity_cell_centers(self):
+  def get_velocity_cell_centers(self, u=None, v=None, w=None):
     """
     Interpolates the staggered velocity field to the cell-centers of the mesh.
 
+    In out-of-core mode (see `set_out_of_core`), 3D velocities are
+    interpolated slab by slab into memory-mapped files.
+
+    Parameters
+    ----------
+    u, v, w: Field objects, optional
+      Staggered velocity in the x-, y-, and z-directions;
+      default: None (use the fields 'x-velocity', 'y-velocity', and
+      'z-velocity').
+
     Returns
     -------
     u, v, w: Field objects
       Velocity at cell-centers in the x-, y-, and z-directions.
     """
-    dim3 = 'z-velocity' in self.fields.keys()
-    x_centers = self.fields['y-velocity'].x[1:-1]
-    y_centers = self.fields['x-velocity'].y[1:-1]
-    u, v = self.fields['x-velocity'].values, self.fields['y-velocity'].values
+    if u is None:
+      u = self.fields['x-velocity']
+    if v is None:
+      v = self.fields['y-velocity']
+    if w is None and 'z-velocity' in self.fields.keys():
+      w = self.fields['z-velocity']
+    dim3 = w is not None
+    time_step = u.time_step
+    x_centers = v.x[1:-1]
+    y_centers = u.y[1:-1]
     if dim3:
-      z_centers = self.fields['x-velocity'].z[1:-1]
-      w = self.fields['z-velocity'].values
-      u = 0.5 * (u[1:-1, 1:-1, :-1] + u[1:-1, 1:-1, 1:])
-      v = 0.5 * (v[1:-1, :-1, 1:-1] + v[1:-1:, 1:, 1:-1])
-      w = 0.5 * (w[:-1, 1:-1, 1:-1] + w[1:, 1:-1, 1:-1])
+      z_centers = u.z[1:-1]
+      shape = (z_centers.size, y_centers.size, x_centers.size)
+      slab_size = self._get_slab_size(shape, 9, halo=1)
+      if slab_size:
+        return self._get_velocity_cell_centers_by_slabs(u, v, w, slab_size)
+      u = 0.5 * (u.values[1:-1, 1:-1, :-1] + u.values[1:-1, 1:-1, 1:])
+      v = 0.5 * (v.values[1:-1, :-1, 1:-1] + v.values[1:-1:, 1:, 1:-1])
+      w = 0.5 * (w.values[:-1, 1:-1, 1:-1] + w.values[1:, 1:-1, 1:-1])
       # tests
       assert (z_centers.size, y_centers.size, x_centers.size) == u.shape
       assert (z_centers.size, y_centers.size, x_centers.size) == v.shape
       assert (z_centers.size, y_centers.size, x_centers.size) == w.shape
       u = Field(label='x-velocity',
-                time_step=self.fields['x-velocity'].time_step,
+                time_step=time_step,
                 x=x_centers, y=y_centers, z=z_centers,
                 values=u)
       v = Field(label='y-velocity',
-                time_step=self.fields['y-velocity'].time_step,
+                time_step=time_step,
                 x=x_centers, y=y_centers, z=z_centers,
                 values=v)
       w = Field(label='z-velocity',
-                time_step=self.fields['z-velocity'].time_step,
+                time_step=time_step,
                 x=x_centers, y=y_centers, z=z_centers,
                 values=w)
       return u, v, w
     else:
-      u = 0.5 * (u[1:-1, :-1] + u[1:-1, 1:])
-      v = 0.5 * (v[:-1, 1:-1] + v[1:, 1:-1])
+      u = 0.5 * (u.values[1:-1, :-1] + u.values[1:-1, 1:])
+      v = 0.5 * (v.values[:-1, 1:-1] + v.values[1:, 1:-1])
       # tests
       assert (y_centers.size, x_centers.size) == u.shape
       assert (y_centers.size, x_centers.size) == v.shape
       u = Field(label='x-velocity',
-                time_step=self.fields['x-velocity'].time_step,
+                time_step=time_step,
                 x=x_centers, y=y_centers,
                 values=u)
-      u = Field(label='y-velocity',
-                time_step=self.fields['y-velocity'].time_step,
+      v = Field(label='y-velocity',
+                time_step=time_step,
                 x=x_centers, y=y_centers,
                 values=v)
       return u, v
 
+  def _get_velocity_cell_centers_by_slabs(self, u, v, w, slab_size):
+    """
+    Interpolates the staggered 3D velocity to the cell-centers slab by slab,
+    into memory-mapped files (out-of-core mode).
+    """
+    time_step = u.time_step
+    x, y, z = v.x[1:-1], u.y[1:-1], u.z[1:-1]
+    shape = (z.size, y.size, x.size)
+    labels = ['x-velocity', 'y-velocity', 'z-velocity']
+    outputs = [self._open_output(label + '-centered', time_step, shape)
+               for label in labels]
+    for start, end, _, _ in outOfCore.iterate_slabs(shape[0], slab_size):
+      # the z-velocity needs the next plane (halo)
+      planes = slice(start + 1, end + 1)
+      outputs[0][start:end] = 0.5 * (u.values[planes, 1:-1, :-1]
+                                     + u.values[planes, 1:-1, 1:])
+      outputs[1][start:end] = 0.5 * (v.values[planes, :-1, 1:-1]
+                                     + v.values[planes, 1:, 1:-1])
+      outputs[2][start:end] = 0.5 * (w.values[start:end, 1:-1, 1:-1]
+                                     + w.values[start + 1:end + 1, 1:-1, 1:-1])
+    return tuple(Field(label=label,
+                       time_step=time_step,
+                       x=x, y=y, z=z,
+                       values=outOfCore.close_output(values))
+                 for label, values in zip(labels, outputs))
+
   def write_vtk(self, field_name, time_step,
                 view=[[float('-inf'), float('-inf'), float('-inf')],
                       [float('inf'), float('inf'), float('inf')]],
-                stride=1):
+                stride=1,
+                fmt='ascii',
+                dtype=numpy.float64,
+                compress=True):
     """
-    Writes the field in a .vtk file.
+    Writes the field in a VTK file.
+
+    The values are written directly from the field arrays (one z-plane at a
+    time), without text formatting for the binary formats; memory-mapped
+    fields (e.g. computed out-of-core) are never loaded whole.
 
     Parameters
     ----------
     field_names: list of strings
-      Name of the field to write; choices: 'velocity', 'pressure'.
+      Name of the field to write; 'velocity' or the name of a scalar field
+      (e.g. 'pressure', 'q-criterion').
     time_step: integer
       Time-step to write.
     view: list of floats, optional
@@ -594,88 +1292,232 @@ class BarbaGroupSimulation(Simulation):
     stride: integer, optional
       Stride at which the field is written;
       default: 1.
+    fmt: string, optional
+      Format of the file;
+      choices: 'ascii' (legacy ASCII .vtk), 'binary' (legacy binary .vtk),
+      'vtr' (XML .vtr with appended raw data);
+      default: 'ascii'.
+    dtype: numpy dtype, optional
+      Floating-point type of the values written in binary formats
+      (numpy.float32 or numpy.float64);
+      default: numpy.float64.
+    compress: boolean, optional
+      Set 'True' to compress the data of a .vtr file with zlib;
+      default: True.
+
+    Returns
+    -------
+    file_path: string
+      Path of the file written.
     """
-    print('[info] writing the {} field into .vtk file ...'.format(field_name))
+    print('[info] writing the {} field into {} file ...'.format(field_name,
+                                                               fmt))
     dim3 = (len(self.grid) == 3)
     if field_name == 'velocity':
-      scalar_field = False
       field = [self.fields['x-velocity'], self.fields['y-velocity']]
       if dim3:
         field.append(self.fields['z-velocity'])
-    elif field_name == 'pressure':
-      scalar_field = True
-      field = [self.fields['pressure']]
-    # get mask for the view
-    mx = numpy.where(numpy.logical_and(field[0].x > view[0][0],
-                                       field[0].x < view[1][0]))[0][::stride]
-    my = numpy.where(numpy.logical_and(field[0].y > view[0][1],
-                                       field[0].y < view[1][1]))[0][::stride]
+    else:
+      # scalar field (pressure, derived quantity, ...)
+      field = [self.fields[field_name]]
+    # get slices for the view
+    def get_slice(stations, start, end):
+      indices = numpy.where(numpy.logical_and(stations > start,
+                                              stations < end))[0]
+      return slice(indices[0], indices[-1] + 1, stride)
+    sx = get_slice(field[0].x, view[0][0], view[1][0])
+    sy = get_slice(field[0].y, view[0][1], view[1][1])
     if dim3:
-      mz = numpy.where(numpy.logical_and(field[0].z > view[0][2],
-                                         field[0].z < view[1][2]))[0][::stride]
+      sz = get_slice(field[0].z, view[0][2], view[1][2])
     # create directory where .vtk file will be saved
     vtk_directory = os.path.join(self.directory, 'vtk_files', field_name)
     if not os.path.isdir(vtk_directory):
       print('[info] creating directory: {}'.format(vtk_directory))
       os.makedirs(vtk_directory)
+    extension = ('vtr' if fmt == 'vtr' else 'vtk')
     vtk_file_path = os.path.join(vtk_directory,
-                                 '{}{:0>7}.vtk'.format(field_name, time_step))
-    # get coordinates within the view
-    x = field[0].x[mx]
-    y = field[0].y[my]
-    z = (None if not dim3 else field[0].z[mz])
-    nx, ny, nz = x.size, y.size, (1 if not dim3 else z.size)
-    # write .vtk file
-    with open(vtk_file_path, 'w') as outfile:
-      outfile.write('# vtk DataFile Version 3.0\n')
-      outfile.write('contains {} field\n'.format(field_name))
-      outfile.write('ASCII\n')
-      outfile.write('DATASET RECTILINEAR_GRID\n')
-      outfile.write('DIMENSIONS {} {} {}\n'.format(nx, ny, nz))
-      outfile.write('X_COORDINATES {} double\n'.format(nx))
-      numpy.savetxt(outfile, x, fmt='%f')
-      outfile.write('Y_COORDINATES {} double\n'.format(ny))
-      numpy.savetxt(outfile, y, fmt='%f')
-      outfile.write('Z_COORDINATES {} double\n'.format(nz))
-      if dim3:
-        numpy.savetxt(outfile, z, fmt='%f')
-      else:
-        outfile.write('0.0\n')
-      outfile.write('POINT_DATA {}\n'.format(nx * ny * nz))
-      if scalar_field:
-        outfile.write('\nSCALARS {} double 1\nLOOKUP_TABLE default\n'
-                      ''.format(field_name))
-        if dim3:
-          values = field[0].values[mz[0]:mz[-1] + 1,
-                                   my[0]:my[-1] + 1,
-                                   mx[0]:mx[-1] + 1]
-        else:
-          values = field[0].values[my[0]:my[-1] + 1,
-                                   mx[0]:mx[-1] + 1]
-        numpy.savetxt(outfile, values.flatten(),
-                      fmt='%.6f', delimiter='\t')
-      else:
-        outfile.write('\nVECTORS {} double\n'.format(field_name))
-        if dim3:
-          values_x = field[0].values[mz[0]:mz[-1] + 1,
-                                     my[0]:my[-1] + 1,
-                                     mx[0]:mx[-1] + 1]
-          values_y = field[1].values[mz[0]:mz[-1] + 1,
-                                     my[0]:my[-1] + 1,
-                                     mx[0]:mx[-1] + 1]
-          values_z = field[2].values[mz[0]:mz[-1] + 1,
-                                     my[0]:my[-1] + 1,
-                                     mx[0]:mx[-1] + 1]
-          numpy.savetxt(outfile,
-                        numpy.c_[values_x.flatten(),
-                                 values_y.flatten(),
-                                 values_z.flatten()],
-                        fmt='%.6f', delimiter='\t')
-        else:
-          values_x = field[0].values[my[0]:my[-1] + 1,
-                                     mx[0]:mx[-1] + 1]
-          values_y = field[1].values[my[0]:my[-1] + 1,
-                                     mx[0]:mx[-1] + 1]
-          numpy.savetxt(outfile, numpy.c_[values_x.flatten(),
-                                          values_y.flatten()],
-                        fmt='%6f', delimiter='\t')
+                                 '{}{:0>7}.{}'.format(field_name, time_step,
+                                                      extension))
+    # get coordinates and values (views) within the view
+    x = field[0].x[sx]
+    y = field[0].y[sy]
+    z = (None if not dim3 else field[0].z[sz])
+    if dim3:
+      values = [f.values[sz, sy, sx] for f in field]
+    else:
+      values = [f.values[sy, sx] for f in field]
+    # staggered components may not share the same number of nodes:
+    # keep the nodes common to all of them
+    shape = numpy.min([v.shape for v in values], axis=0)
+    values = [v[tuple(slice(0, n) for n in shape)] for v in values]
+    x, y = x[:shape[-1]], y[:shape[-2]]
+    if dim3:
+      z = z[:shape[0]]
+    if fmt == 'vtr':
+      vtkWriter.write_vtr(vtk_file_path, x, y, z, [(field_name, values)],
+                          compress=compress, dtype=dtype)
+    elif fmt in ['ascii', 'binary']:
+      vtkWriter.write_legacy(vtk_file_path, x, y, z, [(field_name, values)],
+                             binary=(fmt == 'binary'), dtype=dtype,
+                             title='contains {} field'.format(field_name))
+    else:
+      raise ValueError('unknown VTK format: {}'.format(fmt))
+    return vtk_file_path
+
+  def write_vtk_series(self, field_name, time_steps,
+                       time_increment=None,
+                       periodic_directions=[],
+                       **kwargs):
+    """
+    Writes a field at several time-steps into VTK files and gathers them into
+    a ParaView collection file (.pvd).
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field to write; 'velocity' or the name of a scalar field
+      (e.g. 'pressure', 'q-criterion').
+    time_steps: list of integers
+      Time-steps to write.
+    time_increment: float, optional
+      Time-increment of the simulation used to set the time of each file in
+      the collection;
+      default: None (the time-step index is used).
+    periodic_directions: list of strings, optional
+      Directions that uses periodic boundary conditions;
+      choices: 'x', 'y', 'z';
+      default: [].
+    **kwargs: dictionary
+      Keyword-arguments passed to the method `write_vtk`
+      (default format: 'vtr').
+
+    Returns
+    -------
+    file_path: string
+      Path of the .pvd file.
+    """
+    kwargs.setdefault('fmt', 'vtr')
+    names = {'velocity': 'x-velocity', 'pressure': 'pressure'}
+    file_paths, times = [], []
+    for time_step in time_steps:
+      self.read_fields(names.get(field_name, field_name), time_step,
+                       periodic_directions=periodic_directions)
+      file_paths.append(self.write_vtk(field_name, time_step, **kwargs))
+      times.append(time_step * (time_increment if time_increment else 1))
+    file_path = os.path.join(self.directory, 'vtk_files', field_name,
+                             field_name + '.pvd')
+    print('[info] writing the collection file {} ...'.format(file_path))
+    vtkWriter.write_pvd(file_path, file_paths, times)
+    return file_path
+
+def get_face_areas(widths, direction):
+  """
+  Returns the areas of the cell-faces normal to a given direction,
+  shaped to be broadcast along a (z, y, x)-ordered flux array.
+
+  Parameters
+  ----------
+  widths: list of numpy 1D arrays of floats
+    Cell-widths in the x-, y-, and (optionally) z-directions.
+  direction: integer
+    Index of the direction normal to the faces (0: x, 1: y, 2: z).
+
+  Returns
+  -------
+  area: numpy array of floats
+    Face areas (in 2D, the face lengths); the array has a size of 1
+    along the normal direction.
+  """
+  dim = len(widths)
+  area = numpy.ones([1] * dim, dtype=numpy.float64)
+  for axis, width in enumerate(widths):
+    if axis == direction:
+      continue
+    shape = [1] * dim
+    shape[dim - 1 - axis] = width.size
+    area = area * width.reshape(shape)
+  return area
+
+
+def _read_probed_field(simulation, time_step, field_name,
+                       periodic_directions=[]):
+  """
+  Reads (memory-maps) the field sampled by a probe: the pressure or the flux
+  associated with a velocity-component.
+  """
+  if field_name == 'pressure':
+    return simulation.read_pressure(time_step)
+  names = ['x-flux', 'y-flux', 'z-flux', 'x-velocity', 'y-velocity',
+           'z-velocity']
+  if field_name not in names:
+    raise ValueError('cannot probe field {}'.format(field_name))
+  fluxes = simulation.read_fluxes(time_step,
+                                  periodic_directions=periodic_directions)
+  return fluxes[names.index(field_name) % 3]
+
+
+def _sample_probe(simulation, time_step,
+                  field_name=None, periodic_directions=[]):
+  """
+  Samples a field at the points of the probe attached to the simulation
+  (sent once per worker) at a given time-step (pipeline task).
+  """
+  field = _read_probed_field(simulation, time_step, field_name,
+                             periodic_directions=periodic_directions)
+  return simulation.probe.sample(field.values)
+
+
+def _get_contour_template(simulation, field_name, field, plot_settings,
+                          template_key):
+  """
+  Returns the figure template of the process (created with the first field).
+  """
+  renderer = contourRenderer.get_template(template_key)
+  if renderer is None:
+    renderer = simulation.get_contour_renderer(field_name, field=field,
+                                               **plot_settings)
+    contourRenderer.set_template(template_key, renderer)
+  return renderer
+
+
+def _render_contour(simulation, time_step,
+                    field_name=None, periodic_directions=[], plot_settings={},
+                    template_key=None):
+  """
+  Reads and plots a field at a given time-step (pipeline task).
+  With fixed contour levels, the figure template of the process is reused.
+  """
+  simulation.read_fields(field_name, time_step,
+                         periodic_directions=periodic_directions)
+  if not plot_settings.get('field_range'):
+    # the contour levels depend on the field: no template
+    simulation.plot_contour(field_name, **plot_settings)
+    return
+  field = simulation.fields[field_name]
+  if plot_settings.get('plane'):
+    field = field.get_plane(**plot_settings['plane'])
+  if abs(field.values.min() - field.values.max()) <= 1.0E-06:
+    print('[warning] uniform field; plot contour skipped!')
+    return
+  renderer = _get_contour_template(simulation, field_name, field,
+                                   plot_settings, template_key)
+  print('[time-step {}] plotting the {} contour ...'.format(time_step,
+                                                            field.label))
+  renderer.render(field)
+
+
+def _render_contour_frame(simulation, time_step,
+                          field_name=None, periodic_directions=[],
+                          plot_settings={}, template_key=None):
+  """
+  Reads a field at a given time-step and returns its contour as a raw RGB
+  buffer (pipeline task).
+  """
+  simulation.read_fields(field_name, time_step,
+                         periodic_directions=periodic_directions)
+  field = simulation.fields[field_name]
+  if plot_settings.get('plane'):
+    field = field.get_plane(**plot_settings['plane'])
+  renderer = _get_contour_template(simulation, field_name, field,
+                                   plot_settings, template_key)
+  return renderer.get_frame(field)
@@ -4,6 +4,8 @@ Implementation of the class `Body`.
 
 import numpy
 
+from .geometry import get_inside_mask
+
 
 class Body(object):
   """
@@ -48,3 +50,19 @@ class Body(object):
           '{} ...'.format(self.file_path))
     with open(self.file_path, 'r') as infile:
       return numpy.loadtxt(infile, dtype=float, skiprows=1, unpack=True)
+
+  def get_mask(self, x, y):
+    """
+    Returns the nodes of a Cartesian grid located inside the body.
+
+    Parameters
+    ----------
+    x, y: numpy 1D arrays of floats
+      Stations of the grid in the x- and y-directions.
+
+    Returns
+    -------
+    mask: numpy 2D array of booleans
+      'True' for nodes inside the body (y-axis first, x-axis last).
+    """
+    return get_inside_mask(self.x, self.y, x, y)
@@ -0,0 +1,298 @@
+"""
+Implementation of the class `ContourRenderer`, a figure template to render
+the contours of a field at many time-steps.
+
+The figure, the axes, the colorbar, and the body outlines are created once;
+each frame only replaces the contour and saves the image.
+"""
+
+import os
+
+import numpy
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mpl_toolkits.axes_grid1.inset_locator import inset_axes
+
+
+# template owned by the present process (see `get_template`)
+_template = (None, None)
+
+
+class ContourRenderer(object):
+  """
+  Figure template to render the contours of a field on a fixed grid,
+  with fixed contour levels, at several time-steps.
+  """
+
+  def __init__(self, x, y, levels,
+               label=None,
+               filled_contour=True,
+               view=[float('-inf'), float('-inf'),
+                     float('inf'), float('inf')],
+               bodies=[],
+               time_increment=None,
+               save_directory=os.getcwd(),
+               save_name=None,
+               fmt='png',
+               colorbar=True,
+               colorbar_ticks=None,
+               colorbar_format='%.01f',
+               cmap=None,
+               colors=None,
+               width=8.0,
+               dpi=100):
+    """
+    Creates the figure template.
+
+    Parameters
+    ----------
+    x, y: numpy 1D arrays of floats
+      Stations along a gridline in the x- and y-directions.
+    levels: numpy 1D array of floats
+      Contour levels (the same for every frame).
+    label: string, optional
+      Label of the field (prefix of the files if no save name);
+      default: None.
+    filled_contour: boolean, optional
+      Set 'True' to create a filled contour;
+      default: True.
+    view: 4-list of floats, optional
+      Bottom-left and top-right coordinates of the rectangular view to plot;
+      default: the whole domain.
+    bodies: list of Body objects, optional
+      The immersed bodies to add to the figure;
+      default: [] (no immersed body).
+    time_increment: float, optional
+      Time-increment used to advance the simulation (the time is displayed
+      if provided);
+      default: None.
+    save_directory: string, optional
+      Directory where to save the images;
+      default: '<current directory>'.
+    save_name: string, optional
+      Prefix of the files to save;
+      default: None (the label).
+    fmt: string, optional
+      Format of the files to save;
+      default: 'png'.
+    colorbar: boolean, optional
+      Set 'True' to display an horizontal colorbar at the bottom-left of the
+      figure;
+      default: True.
+    colorbar_ticks: numpy 1D array of floats, optional
+      Ticks of the colorbar;
+      default: None.
+    colorbar_format: string, optional
+      Format of the colorbar tick labels;
+      default: '%.01f'.
+    cmap: Matplotlib colormap, optional
+      The colormap to use;
+      default: None.
+    colors: string, optional
+      The Matplotlib colors to use;
+      default: None.
+    width: float, optional
+      Width of the figure (in inches);
+      default: 8.
+    dpi: integer, optional
+      Dots per inch (resolution);
+      default: 100.
+    """
+    if not isinstance(bodies, (list, tuple)):
+      bodies = [bodies]
+    view = [min(max(view[0], x[0]), x[-1]), min(max(view[1], y[0]), y[-1]),
+            max(min(view[2], x[-1]), x[0]), max(min(view[3], y[-1]), y[0])]
+    # only the nodes covering the view are contoured
+    self.sx = get_view_slice(x, view[0], view[2])
+    self.sy = get_view_slice(y, view[1], view[3])
+    self.X, self.Y = numpy.meshgrid(x[self.sx], y[self.sy])
+    self.levels = levels
+    self.label = label
+    self.filled_contour = filled_contour
+    self.time_increment = time_increment
+    self.save_directory = save_directory
+    self.save_name = save_name if save_name else label
+    self.fmt = fmt
+    self.colorbar = colorbar
+    self.colorbar_ticks = colorbar_ticks
+    self.colorbar_format = colorbar_format
+    self.cmap, self.colors = cmap, colors
+    self.dpi = dpi
+    height = width * (view[3] - view[1]) / (view[2] - view[0])
+    self.fig = Figure(figsize=(width, height), dpi=dpi)
+    FigureCanvasAgg(self.fig)
+    self.ax = self.fig.add_subplot(111)
+    self.ax.tick_params(axis='x', labelbottom=False)
+    self.ax.tick_params(axis='y', labelleft=False)
+    for body in bodies:
+      self.ax.plot(body.x, body.y,
+                   color='black', linewidth=1, linestyle='-', zorder=10)
+    self.ax.set_xlim(view[::2])
+    self.ax.set_ylim(view[1::2])
+    self.ax.set_aspect('equal')
+    self.text = None
+    if time_increment:
+      self.text = self.ax.text(0.05, 0.85, '',
+                               transform=self.ax.transAxes, fontsize=10)
+    self.contour = None
+    self.colorbar_axes = None
+    self.bbox = None
+
+  def render(self, field, file_path=None):
+    """
+    Replaces the contour with the one of a given field and saves the image.
+
+    Parameters
+    ----------
+    field: Field object
+      The field (defined on the grid of the template).
+    file_path: string, optional
+      Path of the image;
+      default: None (<save directory>/<save name><time-step>.<fmt>).
+
+    Returns
+    -------
+    file_path: string
+      Path of the image saved.
+    """
+    self.update(field)
+    if not file_path:
+      file_path = os.path.join(self.save_directory,
+                               '{}{:0>7}.{}'.format(self.save_name,
+                                                    field.time_step,
+                                                    self.fmt))
+    self.fig.savefig(file_path,
+                     dpi=self.dpi, bbox_inches=self.bbox, pad_inches=0,
+                     format=self.fmt)
+    return file_path
+
+  def update(self, field):
+    """
+    Replaces the contour (and the time annotation) with the one of a given
+    field.
+
+    Parameters
+    ----------
+    field: Field object
+      The field (defined on the grid of the template).
+    """
+    if self.contour is not None:
+      self.contour.remove()
+    contour_type = (self.ax.contourf if self.filled_contour
+                    else self.ax.contour)
+    self.contour = contour_type(self.X, self.Y,
+                                field.values[self.sy, self.sx],
+                                levels=self.levels, extend='both',
+                                colors=self.colors,
+                                cmap=self.cmap)
+    if self.colorbar and self.colorbar_axes is None:
+      # the levels do not change: the colorbar is created once
+      self.colorbar_axes = inset_axes(self.ax, width='30%', height='2%',
+                                      loc=3)
+      colorbar = self.fig.colorbar(self.contour,
+                                   cax=self.colorbar_axes,
+                                   orientation='horizontal',
+                                   ticks=self.colorbar_ticks,
+                                   format=self.colorbar_format)
+      colorbar.ax.tick_params(labelsize=10)
+      colorbar.ax.xaxis.set_ticks_position('top')
+    if self.text is not None:
+      self.text.set_text('{} time-units'.format(self.time_increment
+                                                * field.time_step))
+    if self.bbox is None:
+      # the tight bounding-box of the template is computed once
+      self.bbox = self.fig.get_tightbbox(self.fig.canvas.get_renderer())
+
+  def get_frame(self, field):
+    """
+    Replaces the contour with the one of a given field and returns the image
+    as a raw RGB buffer (cropped to the tight bounding-box of the template),
+    without saving any file.
+
+    Parameters
+    ----------
+    field: Field object
+      The field (defined on the grid of the template).
+
+    Returns
+    -------
+    frame: numpy 3D array of uint8
+      RGB values of the image (rows, columns, 3); all the frames of a
+      template have the same size.
+    """
+    self.update(field)
+    canvas = self.fig.canvas
+    canvas.draw()
+    pixels = numpy.asarray(canvas.buffer_rgba())
+    height, width = pixels.shape[:2]
+    x0, y0, x1, y1 = numpy.round(numpy.array(self.bbox.extents)
+                                 * self.dpi).astype(int)
+    x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+    return numpy.array(pixels[height - y1:height - y0, x0:x1, :3])
+
+  def close(self):
+    """
+    Releases the figure.
+    """
+    self.fig.clear()
+    self.contour = None
+
+
+def get_view_slice(stations, start, end):
+  """
+  Returns the slice of the stations covering a range: the stations inside
+  the range and, on each side, the closest station outside (unless a station
+  lies on the limit).
+
+  Parameters
+  ----------
+  stations: numpy 1D array of floats
+    Sorted stations along a gridline.
+  start, end: floats
+    Limits of the range.
+
+  Returns
+  -------
+  indices: slice object
+    The slice.
+  """
+  first = max(int(numpy.searchsorted(stations, start, side='right')) - 1, 0)
+  last = min(int(numpy.searchsorted(stations, end, side='left')) + 1,
+             stations.size)
+  return slice(first, last)
+
+
+def get_template(key):
+  """
+  Returns the figure template owned by the present process for a given key.
+
+  Parameters
+  ----------
+  key: string
+    Key of the template (e.g. one per call of `plot_contours`).
+
+  Returns
+  -------
+  renderer: ContourRenderer object or None
+    The template; None if the process has no template for that key.
+  """
+  template_key, renderer = _template
+  return renderer if template_key == key else None
+
+
+def set_template(key, renderer):
+  """
+  Sets the figure template owned by the present process
+  (the previous template is released).
+
+  Parameters
+  ----------
+  key: string
+    Key of the template.
+  renderer: ContourRenderer object
+    The template.
+  """
+  global _template
+  if _template[1] is not None and _template[1] is not renderer:
+    _template[1].close()
+  _template = (key, renderer)
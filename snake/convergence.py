@@ -19,7 +19,8 @@ def plot_grid_convergence(simulations, exact,
                           fmt='png',
                           dpi=100,
                           style=None,
-                          show=False):
+                          show=False,
+                          registry=None):
   """
   Plots the grid-convergence in a log-log figure.
 
@@ -54,6 +55,9 @@ def plot_grid_convergence(simulations, exact,
   show: boolean, optional
     Set 'True' if you want to display the figure;
     default: False.
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
   """
   print('[info] plotting the grid convergence ...')
   if style:
@@ -68,7 +72,8 @@ def plot_grid_convergence(simulations, exact,
     for norm in norms:
       differences = [case.get_difference(exact, field_name,
                                          mask=mask,
-                                         norm=norm)
+                                         norm=norm,
+                                         registry=registry)
                      for case in simulations]
       ax.plot(grid_spacings, differences,
               label='{} - {}-norm'.format(field_name, norm_labels[norm]),
@@ -100,7 +105,8 @@ def plot_grid_convergence(simulations, exact,
 
 def get_observed_orders(simulations, field_names, mask,
                         save_directory=os.getcwd(),
-                        save_name='observedOrders'):
+                        save_name='observedOrders',
+                        registry=None):
   """
   Computes the observed orders of convergence using the solution
   on three grids with constant grid refinement ratio.
@@ -119,6 +125,9 @@ def get_observed_orders(simulations, field_names, mask,
   save_name: string, optional
     Prefix of the name of the .dat files to save;
     default: 'observedOrders'.
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
 
   Returns
   -------
@@ -137,7 +146,8 @@ def get_observed_orders(simulations, field_names, mask,
                                      medium.fields[name],
                                      fine.fields[name],
                                      ratio,
-                                     grid)
+                                     grid,
+                                     registry=registry)
     print('\t{}: {}'.format(name, alpha[name]))
   if save_name:
     print('[info] writing orders into .dat file ...')
@@ -156,7 +166,8 @@ def get_observed_orders(simulations, field_names, mask,
   return alpha
 
 
-def get_observed_order(coarse, medium, fine, ratio, grid, order=None):
+def get_observed_order(coarse, medium, fine, ratio, grid, order=None,
+                       registry=None):
   """
   Computes the observed order of convergence using the solution on three
   consecutive grids with constant refinement ratio.
@@ -172,6 +183,9 @@ def get_observed_order(coarse, medium, fine, ratio, grid, order=None):
   order: non-zero integer, inf, -inf, 'fro', 'nuc', optional
     Order of the norm;
     default: None (L2-norm).
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
 
   Returns
   -------
@@ -180,11 +194,11 @@ def get_observed_order(coarse, medium, fine, ratio, grid, order=None):
   """
   x, y = grid
   # restrict coarse solution onto grid
-  coarse = coarse.restrict(x, y)
+  coarse = coarse.restrict(x, y, registry=registry)
   # restrict medium solution onto grid
-  medium = medium.restrict(x, y)
+  medium = medium.restrict(x, y, registry=registry)
   # restrict fine solution onto grid
-  fine = fine.restrict(x, y)
+  fine = fine.restrict(x, y, registry=registry)
   # return observed order of convergence
   return (numpy.log(numpy.linalg.norm(medium.values - coarse.values,
                                       ord=order)
@@ -194,7 +208,8 @@ def get_observed_order(coarse, medium, fine, ratio, grid, order=None):
 
 
 def plot_asymptotic_ranges(simulations, orders, mask,
-                           save_directory=os.path.join(os.getcwd(), 'images')):
+                           save_directory=os.path.join(os.getcwd(), 'images'),
+                           registry=None):
   """
   Computes and plots the asymptotic range fields using the grid convergence
   index and given the observed orders of convergence.
@@ -218,6 +233,9 @@ def plot_asymptotic_ranges(simulations, orders, mask,
     Name of the Matplotlib style-sheet to use.
     The .mplstyle file should be located in 'snake/styles';
     default: 'mesnardo'.
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
   """
   field_names = orders.keys()
   coarse, medium, fine = simulations
@@ -236,14 +254,16 @@ def plot_asymptotic_ranges(simulations, orders, mask,
                                  fine.fields[name],
                                  orders[name],
                                  ratio,
-                                 grid)
+                                 grid,
+                                 registry=registry)
     field.plot_contour(field_range=(0.0, 2.0, 101),
                        view=[coarse.grid[0][0], coarse.grid[1][0],
                              coarse.grid[0][-1], coarse.grid[1][-1]],
                        save_directory=images_directory)
 
 
-def get_asymptotic_range(coarse, medium, fine, order, ratio, grid):
+def get_asymptotic_range(coarse, medium, fine, order, ratio, grid,
+                         registry=None):
   """
   Computes the asymptotic range field using the grid convergence index.
 
@@ -264,6 +284,9 @@ def get_asymptotic_range(coarse, medium, fine, order, ratio, grid):
     Grid refinement ratio between the two consecutive grids.
   grid: 2-list of 1D arrays of floats
     Nodal stations in each direction used to restrict the fields.
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
 
   Returns
   -------
@@ -271,16 +294,17 @@ def get_asymptotic_range(coarse, medium, fine, order, ratio, grid):
     The asymptotic range as a Field.
   """
   gci_23 = get_grid_convergence_index(coarse, medium, order, ratio, grid,
-                                      Fs=1.25)
+                                      Fs=1.25, registry=registry)
   gci_12 = get_grid_convergence_index(medium, fine, order, ratio, grid,
-                                      Fs=1.25)
+                                      Fs=1.25, registry=registry)
   return Field(x=grid[0], y=grid[1],
                values=gci_23.values / (gci_12.values * ratio**order),
                time_step=coarse.time_step,
                label='asymptotic-range-' + coarse.label)
 
 
-def get_grid_convergence_index(coarse, fine, order, ratio, grid, Fs=1.25):
+def get_grid_convergence_index(coarse, fine, order, ratio, grid, Fs=1.25,
+                               registry=None):
   """
   Computes the Grid Convergence Index using the solution obtained on two grids,
   coarse and fine, with a constant grid refinement ratio.
@@ -305,6 +329,9 @@ def get_grid_convergence_index(coarse, fine, order, ratio, grid, Fs=1.25):
   Fs: float, optional
     Safety factor;
     default: 1.25.
+  registry: GridRegistry object, optional
+    Registry caching the index maps between gridlines;
+    default: None (a module-level registry shared by all calls).
 
   Returns
   -------
@@ -312,17 +339,19 @@ def get_grid_convergence_index(coarse, fine, order, ratio, grid, Fs=1.25):
     The Grid Convergence Index (in percentage) as a Field.
   """
   x, y = grid
-  coarse = coarse.restrict(x, y)
-  fine = fine.restrict(x, y)
+  coarse = coarse.restrict(x, y, registry=registry)
+  fine = fine.restrict(x, y, registry=registry)
   # remove small field values to avoid large estimations
   # in the relative difference
+  # (the restricted values may be views: the fields are not modified)
   tolerance = 1.0E-06
   mask = numpy.logical_or(numpy.absolute(coarse.values) < tolerance,
                           numpy.absolute(fine.values) < tolerance)
-  coarse.values[mask], fine.values[mask] = None, None
+  coarse_values = numpy.where(mask, numpy.nan, coarse.values)
+  fine_values = numpy.where(mask, numpy.nan, fine.values)
   # compute relative differences
-  relative_differences = numpy.absolute((coarse.values - fine.values)
-                                        / fine.values)
+  relative_differences = numpy.absolute((coarse_values - fine_values)
+                                        / fine_values)
   return Field(x=x, y=y,
                values=Fs * relative_differences / (ratio**order - 1.0) * 100.0,
                time_step=coarse.time_step,
@@ -9,7 +9,6 @@ import numpy
 
 from ..barbaGroupSimulation import BarbaGroupSimulation
 from ..field import Field
-from ..force import Force
 
 
 class CuIBMSimulation(BarbaGroupSimulation):
@@ -80,10 +79,16 @@ class CuIBMSimulation(BarbaGroupSimulation):
     self.grid = x, y
     print('\tgrid-size: {}x{}'.format(x.size - 1, y.size - 1))
 
-  def read_forces(self, file_path=None, labels=None, usecols=(0, 1, 2)):
+  def read_forces(self, file_path=None, labels=None, usecols=(0, 1, 2),
+                  cache=False):
     """
     Reads forces from files.
 
+    The file is read incrementally: only the rows written since the previous
+    call are parsed.
+    Optionally, the parsed rows are cached into a .npy file next to the
+    forces file and memory-mapped the next time the (unchanged) file is read.
+
     Parameters
     ----------
     file_path: string, optional
@@ -96,23 +101,21 @@ class CuIBMSimulation(BarbaGroupSimulation):
       Index of each column to read in the forces file
       (including the time column);
       default: (0, 1, 2)
+    cache: boolean, optional
+      Set 'True' to cache the parsed rows into a .npy file next to the
+      forces file;
+      default: False.
     """
     if not file_path:
       file_path = os.path.join(self.directory, 'forces')
     print('[info] reading forces ...')
-    with open(file_path, 'r') as infile:
-      data = numpy.loadtxt(infile,
-                           dtype=numpy.float64,
-                           usecols=usecols,
-                           unpack=True)
-    times = data[0]
+    reader = self.get_force_reader(file_path, usecols=usecols, cache=cache)
+    reader.update()
     if not labels:
       labels = ['f_x', 'f_y']  # default labels
-    self.forces = []  # reset forces if already present
-    for index, values in enumerate(data[1:]):
-      self.forces.append(Force(times, values, label=labels[index]))
+    self.forces = reader.get_forces(labels=labels)
 
-  def read_fluxes(self, time_step, directory=None, **kwargs):
+  def read_fluxes(self, time_step, directory=None, mode='r', **kwargs):
     """
     Reads the flux fields from file at a given time-step.
 
@@ -123,6 +126,10 @@ class CuIBMSimulation(BarbaGroupSimulation):
     directory: string, optional
       Directory containing the saved time-step folders;
       default: None (will be <simulation-directory>/<time-step>).
+    mode: string, optional
+      Mode used to memory-map a binary file;
+      choices: 'r' (read-only), 'c' (copy-on-write);
+      default: 'r'.
     **kwargs: dictionary
       Extra keyword-arguments.
 
@@ -147,9 +154,11 @@ class CuIBMSimulation(BarbaGroupSimulation):
     binary_format = is_binary_string(infile.read(1024))
     infile.close()
     if binary_format:
+      # memory-map the fluxes (only the entries used are read)
       with open(file_path, 'rb') as infile:
         nq = struct.unpack('i', infile.read(4))[0]
-        q = numpy.array(struct.unpack('d' * nq, infile.read(8 * nq)))
+      q = numpy.memmap(file_path, dtype=numpy.float64, mode=mode,
+                       offset=4, shape=(nq,))
     else:
       with open(file_path, 'r') as infile:
         nq = int(infile.readline())
@@ -168,7 +177,7 @@ class CuIBMSimulation(BarbaGroupSimulation):
                values=q[offset:].reshape(ny - 1, nx))
     return qx, qy
 
-  def read_pressure(self, time_step, directory=None, **kwargs):
+  def read_pressure(self, time_step, directory=None, mode='r', **kwargs):
     """
     Reads pressure field from solution file at given time-step.
 
@@ -179,6 +188,10 @@ class CuIBMSimulation(BarbaGroupSimulation):
     directory: string, optional
       Directory containing the saved time-step folders;
       default: None (will be <simulation-directory>/<time-step>).
+    mode: string, optional
+      Mode used to memory-map a binary file;
+      choices: 'r' (read-only), 'c' (copy-on-write);
+      default: 'r'.
     **kwargs: dictionary
       Extra keyword-arguments.
 
@@ -203,10 +216,11 @@ class CuIBMSimulation(BarbaGroupSimulation):
     binary_format = is_binary_string(infile.read(1024))
     infile.close()
     if binary_format:
+      # memory-map the pressure (only the entries used are read)
       with open(file_path, 'rb') as infile:
         nlambda = struct.unpack('i', infile.read(4))[0]
-        p = numpy.array(struct.unpack('d' * nlambda,
-                                      infile.read(8 * nlambda)))[:nx * ny]
+      p = numpy.memmap(file_path, dtype=numpy.float64, mode=mode,
+                       offset=4, shape=(nlambda,))[:nx * ny]
     else:
       with open(file_path, 'r') as infile:
         nlambda = int(infile.readline())
@@ -0,0 +1,207 @@
+"""
+Implementation of functions to compute quantities derived from the velocity
+on a staggered (MAC) grid: vorticity components, Q-criterion, lambda2,
+divergence, and velocity magnitude.
+
+The quantities are computed at the cell-centers of the interior cells.
+Normal derivatives use the face values of the staggered velocity;
+the other derivatives use the cell-centered velocity (second-order
+differences on non-uniform stations).
+3D fields are processed slab by slab along the z-direction, so that the
+temporaries (velocity gradient) never have the size of the whole field.
+"""
+
+import numpy
+
+from .outOfCore import iterate_slabs
+
+
+# quantities available in 2D and in 3D
+QUANTITIES_2D = ['z-vorticity', 'q-criterion', 'divergence',
+                 'velocity-magnitude']
+QUANTITIES_3D = ['x-vorticity', 'y-vorticity', 'z-vorticity', 'q-criterion',
+                 'lambda2', 'divergence', 'velocity-magnitude']
+
+
+def get_cell_centers(u, v, w=None):
+  """
+  Returns the stations of the interior cell-centers where the derived
+  quantities are computed.
+
+  Parameters
+  ----------
+  u, v: Field objects
+    Staggered velocity in the x- and y-directions.
+  w: Field object, optional
+    Staggered velocity in the z-direction (3D);
+    default: None.
+
+  Returns
+  -------
+  stations: list of numpy 1D arrays of floats
+    Stations along a gridline in the x-, y-, and (in 3D) z-directions.
+  """
+  stations = [v.x[1:-1], u.y[1:-1]]
+  if w is not None:
+    stations.append(u.z[1:-1])
+  return stations
+
+
+def get_velocity_gradient(u, v, w=None, start=None, end=None):
+  """
+  Computes the cell-centered velocity and the velocity gradient at the
+  interior cell-centers (of a slab of z-planes in 3D).
+
+  Parameters
+  ----------
+  u, v: Field objects
+    Staggered velocity in the x- and y-directions.
+  w: Field object, optional
+    Staggered velocity in the z-direction (3D);
+    default: None.
+  start, end: integers, optional
+    Cell-centered z-planes of the slab (3D);
+    default: None.
+
+  Returns
+  -------
+  velocity: list of numpy arrays of floats
+    Cell-centered velocity components.
+  gradient: list of lists of numpy arrays of floats
+    Velocity gradient; gradient[i][j] is the derivative of the i-th
+    component in the j-th direction.
+  """
+  xc, yc = v.x[1:-1], u.y[1:-1]
+  dx = u.x[1:] - u.x[:-1]
+  dy = (v.y[1:] - v.y[:-1])[:, numpy.newaxis]
+  if w is None:
+    uc = 0.5 * (u.values[1:-1, :-1] + u.values[1:-1, 1:])
+    vc = 0.5 * (v.values[:-1, 1:-1] + v.values[1:, 1:-1])
+    gradient = [[(u.values[1:-1, 1:] - u.values[1:-1, :-1]) / dx,
+                 numpy.gradient(uc, yc, axis=0)],
+                [numpy.gradient(vc, xc, axis=1),
+                 (v.values[1:, 1:-1] - v.values[:-1, 1:-1]) / dy]]
+    return [uc, vc], gradient
+  zc = u.z[1:-1]
+  dz = (w.z[1:] - w.z[:-1])[start:end, numpy.newaxis, numpy.newaxis]
+  # the z-derivatives need one plane on each side of the slab (halo)
+  halo_start, halo_end = max(start - 1, 0), min(end + 1, zc.size)
+  inner = slice(start - halo_start, end - halo_start)
+  planes = slice(halo_start + 1, halo_end + 1)
+  uc = 0.5 * (u.values[planes, 1:-1, :-1] + u.values[planes, 1:-1, 1:])
+  vc = 0.5 * (v.values[planes, :-1, 1:-1] + v.values[planes, 1:, 1:-1])
+  wc = 0.5 * (w.values[halo_start:halo_end, 1:-1, 1:-1]
+              + w.values[halo_start + 1:halo_end + 1, 1:-1, 1:-1])
+  zc = zc[halo_start:halo_end]
+  planes = slice(start + 1, end + 1)
+  gradient = [[(u.values[planes, 1:-1, 1:] - u.values[planes, 1:-1, :-1])
+               / dx,
+               numpy.gradient(uc[inner], yc, axis=1),
+               numpy.gradient(uc, zc, axis=0)[inner]],
+              [numpy.gradient(vc[inner], xc, axis=2),
+               (v.values[planes, 1:, 1:-1] - v.values[planes, :-1, 1:-1])
+               / dy,
+               numpy.gradient(vc, zc, axis=0)[inner]],
+              [numpy.gradient(wc[inner], xc, axis=2),
+               numpy.gradient(wc[inner], yc, axis=1),
+               (w.values[start + 1:end + 1, 1:-1, 1:-1]
+                - w.values[start:end, 1:-1, 1:-1]) / dz]]
+  return [uc[inner], vc[inner], wc[inner]], gradient
+
+
+def compute_quantity(name, velocity, gradient):
+  """
+  Computes a derived quantity from the cell-centered velocity and the
+  velocity gradient.
+
+  Parameters
+  ----------
+  name: string
+    Name of the quantity;
+    choices: 'x-vorticity', 'y-vorticity', 'z-vorticity', 'q-criterion',
+    'lambda2', 'divergence', 'velocity-magnitude'.
+  velocity: list of numpy arrays of floats
+    Cell-centered velocity components.
+  gradient: list of lists of numpy arrays of floats
+    Velocity gradient (gradient[i][j]: derivative of the i-th component in
+    the j-th direction).
+
+  Returns
+  -------
+  values: numpy array of floats
+    The quantity.
+  """
+  g = gradient
+  dim = len(velocity)
+  if name == 'x-vorticity':
+    return g[2][1] - g[1][2]
+  elif name == 'y-vorticity':
+    return g[0][2] - g[2][0]
+  elif name == 'z-vorticity':
+    return g[1][0] - g[0][1]
+  elif name == 'divergence':
+    return sum(g[i][i] for i in range(dim))
+  elif name == 'q-criterion':
+    # Q = (|Omega|^2 - |S|^2) / 2 = -g_ij g_ji / 2
+    return -0.5 * sum(g[i][j] * g[j][i]
+                      for i in range(dim) for j in range(dim))
+  elif name == 'lambda2':
+    # second eigenvalue of S^2 + Omega^2 = (G G + G^T G^T) / 2
+    G = numpy.stack([numpy.stack(row, axis=-1) for row in g], axis=-2)
+    GG = numpy.matmul(G, G)
+    M = 0.5 * (GG + numpy.swapaxes(GG, -1, -2))
+    return numpy.linalg.eigvalsh(M)[..., 1]
+  elif name == 'velocity-magnitude':
+    return numpy.sqrt(sum(c**2 for c in velocity))
+  raise ValueError('unknown derived quantity: {}'.format(name))
+
+
+def compute_derived_fields(names, u, v, w=None, slab_size=16, allocate=None):
+  """
+  Computes several quantities derived from the staggered velocity at the
+  interior cell-centers, in a single pass over the velocity.
+
+  Parameters
+  ----------
+  names: list of strings
+    Names of the quantities (see `QUANTITIES_2D` and `QUANTITIES_3D`).
+  u, v: Field objects
+    Staggered velocity in the x- and y-directions.
+  w: Field object, optional
+    Staggered velocity in the z-direction (3D);
+    default: None.
+  slab_size: integer, optional
+    Number of z-planes processed at once (3D);
+    default: 16.
+  allocate: function, optional
+    Function called as `allocate(name, shape)` to create the array of each
+    quantity (e.g. a memory-mapped file);
+    default: None (numpy.empty).
+
+  Returns
+  -------
+  stations: list of numpy 1D arrays of floats
+    Stations of the cell-centers (x, y, and z in 3D).
+  values: list of numpy arrays of floats
+    Values of each quantity (z, y, x).
+  """
+  available = QUANTITIES_2D if w is None else QUANTITIES_3D
+  for name in names:
+    if name not in available:
+      raise ValueError('{} is not available in {}D'
+                       ''.format(name, 2 if w is None else 3))
+  stations = get_cell_centers(u, v, w)
+  shape = tuple(s.size for s in reversed(stations))
+  if allocate is None:
+    allocate = lambda name, shape: numpy.empty(shape)
+  outputs = [allocate(name, shape) for name in names]
+  if w is None:
+    velocity, gradient = get_velocity_gradient(u, v)
+    for name, output in zip(names, outputs):
+      output[...] = compute_quantity(name, velocity, gradient)
+    return stations, outputs
+  for start, end, _, _ in iterate_slabs(shape[0], slab_size):
+    velocity, gradient = get_velocity_gradient(u, v, w, start=start, end=end)
+    for name, output in zip(names, outputs):
+      output[start:end] = compute_quantity(name, velocity, gradient)
+  return stations, outputs
@@ -6,16 +6,23 @@ import os
 
 import numpy
 from matplotlib import pyplot, cm
-from mpl_toolkits.axes_grid1.inset_locator import inset_axes
+
+from .gridRegistry import default_registry
+from .probe import Probe
+from .contourRenderer import ContourRenderer
 
 
 class Field(object):
   """
-  Contains information about a 2D field (pressure for example) on a structured
-  Cartesian grid.
+  Contains information about a 2D or 3D field (pressure for example) on a
+  structured Cartesian grid.
+
+  The values are stored in a N-dimensional array whose axes are ordered
+  (z, y, x); the x-axis is the last (contiguous) one.
   """
 
-  def __init__(self, x=None, y=None, values=None, time_step=None, label=None):
+  def __init__(self, x=None, y=None, values=None, time_step=None, label=None,
+               z=None):
     """
     Initializes the field by its grid and its values.
 
@@ -27,7 +34,7 @@ class Field(object):
     y: numpy 1D array of floats, optional
       Stations along a gridline in the y-direction;
       default: None.
-    values: numpy 2D array of floats, optional
+    values: numpy 2D or 3D array of floats, optional
       Discrete field values;
       default: None.
     time_step: integer, optional
@@ -36,15 +43,19 @@ class Field(object):
     label: string, optional
       Description of the field;
       default: None.
+    z: numpy 1D array of floats, optional
+      Stations along a gridline in the z-direction (3D field);
+      default: None.
     """
     self.label = None
-    self.x, self.y = None, None
+    self.x, self.y, self.z = None, None, None
     self.values = None
     self.time_step = None
-    if numpy.any(x) and numpy.any(y) and values.shape == (y.size, x.size):
-      self.set(x, y, values, time_step=time_step, label=label)
+    if (numpy.any(x) and numpy.any(y) and
+        values.shape == get_shape([x, y] + ([z] if z is not None else []))):
+      self.set(x, y, values, time_step=time_step, label=label, z=z)
 
-  def set(self, x, y, values, time_step=None, label=None):
+  def set(self, x, y, values, time_step=None, label=None, z=None):
     """
     Sets the stations along a gridline in each direction, the field values,
     the time-step, and the label.
@@ -55,7 +66,7 @@ class Field(object):
       Stations along a gridline in the x-direction.
     y: numpy 1D array of floats
       Stations along a gridline in the y-direction.
-    values: numpy 2D array of floats
+    values: numpy 2D or 3D array of floats
       Discrete field values.
     time_step: integer, optional
       Time-step;
@@ -63,13 +74,29 @@ class Field(object):
     label: string, optional
       Description of the field;
       default: None.
+    z: numpy 1D array of floats, optional
+      Stations along a gridline in the z-direction (3D field);
+      default: None.
     """
-    assert values.shape == (y.size, x.size)
-    self.x, self.y = x, y
+    assert values.shape == get_shape([x, y] + ([z] if z is not None else []))
+    self.x, self.y, self.z = x, y, z
     self.values = values
     self.time_step = time_step
     self.label = label
 
+  def get_stations(self):
+    """
+    Returns the stations along a gridline in each direction.
+
+    Returns
+    -------
+    stations: list of numpy 1D arrays of floats
+      Stations in the x-, y-, and (in 3D) z-directions.
+    """
+    if self.z is None:
+      return [self.x, self.y]
+    return [self.x, self.y, self.z]
+
   def subtract(self, other, label=None, atol=1.0E-12):
     """
     Subtracts a given field to the current one (returns 'self' - 'other').
@@ -93,21 +120,26 @@ class Field(object):
       The subtracted field.
     """
     # check the two solutions share the same grid
-    assert numpy.allclose(self.x, other.x, atol=atol)
-    assert numpy.allclose(self.y, other.y, atol=atol)
+    stations, other_stations = self.get_stations(), other.get_stations()
+    assert len(stations) == len(other_stations)
+    for s, other_s in zip(stations, other_stations):
+      assert numpy.allclose(s, other_s, atol=atol)
     assert self.values.shape == other.values.shape
     if not label:
       label = self.label + '-subtracted'
     return Field(label=label,
                  time_step=self.time_step,
-                 x=self.x, y=self.y,
+                 x=self.x, y=self.y, z=self.z,
                  values=self.values - other.values)
 
-  def restrict(self, x, y, label=None, atol=1.0E-12):
+  def restrict(self, x, y, label=None, atol=1.0E-12, registry=None, z=None):
     """
     Restricts the field solution onto a coarser grid.
     Note: all nodes on the coarser grid are present in the actual grid.
 
+    When the coarse nodes are evenly spaced in the index space of the actual
+    grid, the restricted values are a strided view (not a copy) of the values.
+
     Parameters
     ----------
     x: numpy 1D array of floats
@@ -120,32 +152,50 @@ class Field(object):
     atol: float, optional
       Absolute tolerance used to define shared nodes between two grids;
       default: 1.0E-06.
+    registry: GridRegistry object, optional
+      Registry caching the index maps between gridlines;
+      default: None (a module-level registry).
+    z: numpy 1D array of floats, optional
+      Stations along a gridline in the z-direction (3D field);
+      default: None (the z-stations of the field, if any).
 
     Returns
     -------
     restricted_field: Field object
       Field restricted onto the coarser grid.
     """
-    def intersection(a, b, atol=atol):
-      return numpy.any(numpy.abs(a - b[:, numpy.newaxis]) <= atol, axis=0)
-    mask_x = intersection(self.x, x, atol=atol)
-    mask_y = intersection(self.y, y, atol=atol)
+    if registry is None:
+      registry = default_registry
+    stations = self.get_stations()
+    targets = [x, y]
+    if self.z is not None:
+      targets.append(self.z if z is None else z)
+    indices = [registry.get_indices(s, target, atol=atol)
+               for s, target in zip(stations, targets)]
     if not label:
       label = self.label + '-restricted'
-    return Field(x=self.x[mask_x],
-                 y=self.y[mask_y],
-                 values=numpy.array([self.values[j][mask_x]
-                                     for j in range(self.y.size)
-                                     if mask_y[j]]),
+    # values are ordered (z, y, x)
+    if all(isinstance(i, slice) for i in indices):
+      values = self.values[tuple(reversed(indices))]
+    else:
+      values = self.values[numpy.ix_(*[numpy.arange(s.size)[i]
+                                       for s, i in zip(reversed(stations),
+                                                       reversed(indices))])]
+    restricted = [s[i] for s, i in zip(stations, indices)]
+    return Field(x=restricted[0],
+                 y=restricted[1],
+                 z=(restricted[2] if len(restricted) == 3 else None),
+                 values=values,
                  time_step=self.time_step,
                  label=label)
 
-  def get_difference(self, other, x, y, norm='L2'):
+  def get_difference(self, other, x, y, norm='L2', registry=None, z=None):
     """
     Returns the difference between two fields in a given norm and on a given
     grid.
     The grid is defined by its stations along a gridline in the x-direction and
-    its stations along a gridline in the y-direction.
+    its stations along a gridline in the y-direction (and in the z-direction
+    for 3D fields).
 
     Parameters
     ----------
@@ -159,17 +209,27 @@ class Field(object):
       Norm to use;
       choices: 'L2', 'Linf';
       default: 'L2'.
+    registry: GridRegistry object, optional
+      Registry caching the index maps between gridlines;
+      default: None (a module-level registry).
+    z: numpy 1D array of floats, optional
+      Stations along a gridline in the z-direction (3D fields);
+      default: None.
 
     Returns
     -------
     norm: float
-      The difference in the given norm.
+      The difference in the given norm
+      (in 3D, the norm of the flattened difference).
     """
     norms = {'L2': None, 'Linf': numpy.inf}
-    field = self.restrict(x, y)
-    other = other.restrict(x, y)
+    field = self.restrict(x, y, registry=registry, z=z)
+    other = other.restrict(x, y, registry=registry, z=z)
     subtracted = field.subtract(other)
-    return numpy.linalg.norm(subtracted.values, ord=norms[norm])
+    values = subtracted.values
+    if values.ndim > 2:
+      values = values.ravel()
+    return numpy.linalg.norm(values, ord=norms[norm])
 
   def get_gridline_values(self, x=None, y=None):
     """
@@ -219,16 +279,8 @@ class Field(object):
     y, u: two numpy 1D arrays of floats
       Stations and values along the vertical gridline.
     """
-    indices = numpy.where(numpy.abs(self.x - x) <= 1.0E-06)[0]
-    # if no station matches the given value, we interpolate
-    if indices.size == 0:
-      i = numpy.where(self.x > x)[0][0]
-      return (self.y, (abs(self.x[i] - x) * self.values[:, i - 1]
-                       + abs(self.x[i - 1] - x) * self.values[:, i])
-              / abs(self.x[i] - self.x[i - 1]))
-    else:
-      i = indices[0]
-      return self.y, self.values[:, i]
+    y, values = self.get_vertical_profiles([x])
+    return y, values[0]
 
   def get_horizontal_gridline_values(self, y):
     """
@@ -248,16 +300,181 @@ class Field(object):
     x, u: two numpy 1D arrays of floats
       Stations and values along the horizontal gridline.
     """
-    indices = numpy.where(numpy.abs(self.y - y) <= 1.0E-06)[0]
-    # if no station matches the given value, we interpolate
-    if indices.size == 0:
-      j = numpy.where(self.y > y)[0][0]
-      return (self.x, (abs(self.y[j] - y) * self.values[j - 1, :]
-                       + abs(self.y[j - 1] - y) * self.values[j, :])
-              / abs(self.y[j] - self.y[j - 1]))
+    x, values = self.get_horizontal_profiles([y])
+    return x, values[0]
+
+  def get_vertical_profiles(self, x, atol=1.0E-06):
+    """
+    Returns field values along a group of vertical gridlines defined by their
+    x-position, in a single pass.
+
+    Positions that do not match any gridline of the Cartesian grid are
+    linearly interpolated between the two bracketing gridlines.
+
+    Parameters
+    ----------
+    x: list or numpy 1D array of floats
+      x-position of each vertical gridline.
+    atol: float, optional
+      Absolute tolerance used to match a position with a gridline;
+      default: 1.0E-06.
+
+    Returns
+    -------
+    y: numpy 1D array of floats
+      Stations along the vertical gridlines.
+    values: numpy 2D array of floats
+      Values along each vertical gridline (one row per gridline);
+      for a 3D field, a 3D array (one (z, y)-plane per gridline).
+    """
+    return self.y, self._interpolate(0, x, atol=atol)
+
+  def get_horizontal_profiles(self, y, atol=1.0E-06):
+    """
+    Returns field values along a group of horizontal gridlines defined by
+    their y-position, in a single pass.
+
+    Positions that do not match any gridline of the Cartesian grid are
+    linearly interpolated between the two bracketing gridlines.
+
+    Parameters
+    ----------
+    y: list or numpy 1D array of floats
+      y-position of each horizontal gridline.
+    atol: float, optional
+      Absolute tolerance used to match a position with a gridline;
+      default: 1.0E-06.
+
+    Returns
+    -------
+    x: numpy 1D array of floats
+      Stations along the horizontal gridlines.
+    values: numpy 2D array of floats
+      Values along each horizontal gridline (one row per gridline);
+      for a 3D field, a 3D array (one (z, x)-plane per gridline).
+    """
+    return self.x, self._interpolate(1, y, atol=atol)
+
+  def _interpolate(self, direction, positions, atol=1.0E-06):
+    """
+    Interpolates the values at given positions along a direction
+    (0: x, 1: y, 2: z); the positions are stacked along the first axis of the
+    array returned.
+    """
+    stations = self.get_stations()[direction]
+    lower, upper, weights = get_interpolation_indices(stations, positions,
+                                                      atol=atol)
+    axis = self.values.ndim - 1 - direction
+    shape = [1] * self.values.ndim
+    shape[axis] = weights.size
+    weights = weights.reshape(shape)
+    values = ((1.0 - weights) * numpy.take(self.values, lower, axis=axis)
+              + weights * numpy.take(self.values, upper, axis=axis))
+    return numpy.moveaxis(values, axis, 0)
+
+  def get_plane(self, x=None, y=None, z=None, atol=1.0E-06):
+    """
+    Returns the plane of a 3D field normal to a direction, defined by its
+    position along that direction.
+
+    The values are a view on the values of the field when the position
+    matches a gridline; they are linearly interpolated otherwise.
+
+    Parameters
+    ----------
+    x: float, optional
+      x-position of the plane (normal to the x-direction);
+      default: None.
+    y: float, optional
+      y-position of the plane (normal to the y-direction);
+      default: None.
+    z: float, optional
+      z-position of the plane (normal to the z-direction);
+      default: None.
+    atol: float, optional
+      Absolute tolerance used to match the position with a gridline;
+      default: 1.0E-06.
+
+    Returns
+    -------
+    plane: Field object
+      2D field; its x- and y-stations are the remaining stations, in the
+      order (x, y, z) (e.g. (y, z) for a plane normal to the x-direction).
+    """
+    positions = [x, y, z]
+    if self.z is None or sum(p is not None for p in positions) != 1:
+      raise ValueError('provide the position of the plane (x, y, or z) '
+                       'of a 3D field')
+    direction = [p is not None for p in positions].index(True)
+    stations = self.get_stations()
+    lower, upper, _ = get_interpolation_indices(stations[direction],
+                                                [positions[direction]],
+                                                atol=atol)
+    if lower[0] == upper[0]:
+      index = [slice(None)] * self.values.ndim
+      index[self.values.ndim - 1 - direction] = lower[0]
+      values = self.values[tuple(index)]
     else:
-      j = indices[0]
-      return self.x, self.values[j, :]
+      values = self._interpolate(direction, [positions[direction]],
+                                 atol=atol)[0]
+    del stations[direction]
+    return Field(x=stations[0], y=stations[1],
+                 values=values,
+                 time_step=self.time_step,
+                 label=self.label)
+
+  def probe(self, x, y, z=None, atol=1.0E-12):
+    """
+    Returns the field values at scattered points (bilinear interpolation, or
+    trilinear interpolation for a 3D field).
+
+    To sample several fields (or time-steps) at the same points, create a
+    `Probe` once and call its method `sample` for each array of values.
+
+    Parameters
+    ----------
+    x, y: numpy 1D arrays of floats
+      Coordinates of the points (e.g. the coordinates of a body).
+    z: numpy 1D array of floats, optional
+      z-coordinate of the points (3D field);
+      default: None.
+    atol: float, optional
+      Absolute tolerance used to accept points on the boundary of the grid;
+      default: 1.0E-12.
+
+    Returns
+    -------
+    values: numpy 1D array of floats
+      Values at the points; NaN for points outside the grid.
+    """
+    coordinates = [x, y] + ([z] if self.z is not None else [])
+    points = numpy.column_stack([numpy.ravel(c) for c in coordinates])
+    probe = Probe(self.get_stations(), points, atol=atol)
+    return probe.sample(self.values)
+
+  def get_body_mask(self, bodies):
+    """
+    Returns the nodes of the field located inside immersed bodies
+    (e.g. to blank the values with `field.values[mask] = numpy.nan`).
+    The mask of a 3D field is the mask of the (x, y) plane repeated along the
+    z-direction (a read-only view).
+
+    Parameters
+    ----------
+    bodies: list of Body or Geometry2d objects or single object
+      The immersed bodies.
+
+    Returns
+    -------
+    mask: numpy array of booleans
+      'True' for nodes inside a body (same shape as the values).
+    """
+    if not isinstance(bodies, (list, tuple)):
+      bodies = [bodies]
+    mask = numpy.zeros((self.y.size, self.x.size), dtype=bool)
+    for body in bodies:
+      mask |= body.get_mask(self.x, self.y)
+    return numpy.broadcast_to(mask, self.values.shape)
 
   def plot_vertical_gridline_values(self, x,
                                     boundaries=(None, None),
@@ -273,7 +490,7 @@ class Field(object):
 
     Parameters
     ----------
-    x: list of floats
+    x: float or list or numpy 1D array of floats
       Group of vertical gridlines defined by their x-position.
     boundaries: 2-tuple of floats, optional
       Gridline limits to consider;
@@ -310,14 +527,12 @@ class Field(object):
     ax.grid(True, zorder=0)
     ax.set_xlabel('y-coordinate', fontsize=16)
     ax.set_ylabel('{} along vertical gridline'.format(self.label), fontsize=16)
-    if not isinstance(x, (list, tuple)):
-      x = [x]
-    for x_target in x:
-      y, u = self.get_vertical_gridline_values(x_target)
-      if all(boundaries):
-        mask = numpy.where(numpy.logical_and(y >= boundaries[0],
-                                             y <= boundaries[1]))[0]
-        y, u = y[mask], u[mask]
+    y, values = self.get_vertical_profiles(x)
+    if all(boundaries):
+      mask = numpy.where(numpy.logical_and(y >= boundaries[0],
+                                           y <= boundaries[1]))[0]
+      y, values = y[mask], values[:, mask]
+    for u in values:
       ax.plot(y, u, **plot_settings)
     if other_data:
       y, u = other_data
@@ -351,7 +566,7 @@ class Field(object):
 
     Parameters
     ----------
-    y: list of floats
+    y: float or list or numpy 1D array of floats
       Group of horizontal gridlines defined by their y-position.
     boundaries: 2-tuple of floats, optional
       Gridline limits to consider;
@@ -389,14 +604,12 @@ class Field(object):
     ax.set_xlabel('x-coordinate', fontsize=16)
     ax.set_ylabel('{} along horizontal gridline'.format(self.label),
                   fontsize=16)
-    if not isinstance(y, (list, tuple)):
-      y = [y]
-    for y_target in y:
-      x, u = self.get_horizontal_gridline_values(y_target)
-      if all(boundaries):
-        mask = numpy.where(numpy.logical_and(x >= boundaries[0],
-                                             x <= boundaries[1]))[0]
-        x, u = x[mask], u[mask]
+    x, values = self.get_horizontal_profiles(y)
+    if all(boundaries):
+      mask = numpy.where(numpy.logical_and(x >= boundaries[0],
+                                           x <= boundaries[1]))[0]
+      x, values = x[mask], values[:, mask]
+    for u in values:
       ax.plot(x, u, **plot_settings)
     if other_data:
       x, u = other_data
@@ -416,6 +629,108 @@ class Field(object):
       pyplot.show()
     print('done')
 
+  def get_contour_renderer(self,
+                           field_range=None,
+                           filled_contour=True,
+                           view=[float('-inf'), float('-inf'),
+                                 float('inf'), float('inf')],
+                           bodies=[],
+                           time_increment=None,
+                           save_name=None,
+                           save_directory=os.getcwd(),
+                           fmt='png',
+                           colorbar=True,
+                           cmap=None,
+                           colors=None,
+                           width=8.0,
+                           dpi=100):
+    """
+    Creates a figure template to render the contours of fields defined on the
+    same grid as the present field.
+
+    The contour levels are fixed: they are computed from the field range,
+    or from the min and max values of the present field if no range is
+    provided.
+
+    Parameters
+    ----------
+    field_range: 3-list of floats, optional
+      Min, max and number of contours to plot;
+      default: None.
+    filled_contour: boolean, optional
+      Set 'True' to create a filled contour;
+      default: True.
+    view: 4-list of floats, optional
+      Bottom-left and top-right coordinates of the rectangular view to plot;
+      default: the whole domain.
+    bodies: list of Body objects or single Body object, optional
+      The immersed bodies to add to the figure;
+      default: [] (no immersed body).
+    time_increment: float, optional
+      Time-increment used to advance the simulation;
+      default: None.
+    save_name: string, optional
+      Prefix used to create the images directory and to save the .png files;
+      default: None.
+    save_directory: string, optional
+      Directory where to save the image;
+      default: '<current directory>'.
+    fmt: string, optional
+      Format of the file to save;
+      default: 'png'.
+    colorbar: boolean, optional
+      Set 'True' to display an horizontal colorbar at the bottom-left of the
+      figure;
+      default: True.
+    cmap: string, optional
+      The Matplotlib colormap to use;
+      default: None.
+    colors: string, optional
+      The Matplotlib colors to use;
+      default: None.
+    width: float, optional
+      Width of the figure (in inches);
+      default: 8.
+    dpi: integer, optional
+      Dots per inch (resolution);
+      default: 100.
+
+    Returns
+    -------
+    renderer: ContourRenderer object
+      The figure template.
+    """
+    if field_range:
+      levels = numpy.linspace(*field_range)
+      colorbar_ticks = numpy.linspace(field_range[0], field_range[1], 5)
+      colorbar_format = '%.01f'
+    else:
+      levels = numpy.linspace(self.values.min(), self.values.max(), 101)
+      colorbar_ticks = numpy.linspace(self.values.min(), self.values.max(), 3)
+      colorbar_format = '%.04f'
+    color_map = {'pressure': cm.jet, 'vorticity': cm.RdBu_r,
+                 'x-velocity': cm.RdBu_r, 'y-velocity': cm.RdBu_r}
+    if not colors:
+      if not cmap:
+        cmap = (cm.RdBu_r if self.label not in color_map.keys()
+                else color_map[self.label])
+    return ContourRenderer(self.x, self.y, levels,
+                           label=self.label,
+                           filled_contour=filled_contour,
+                           view=view,
+                           bodies=bodies,
+                           time_increment=time_increment,
+                           save_directory=save_directory,
+                           save_name=save_name,
+                           fmt=fmt,
+                           colorbar=colorbar,
+                           colorbar_ticks=colorbar_ticks,
+                           colorbar_format=colorbar_format,
+                           cmap=cmap,
+                           colors=colors,
+                           width=width,
+                           dpi=dpi)
+
   def plot_contour(self,
                    field_range=None,
                    filled_contour=True,
@@ -434,6 +749,10 @@ class Field(object):
     """
     Plots and saves the field.
 
+    The figure is built by a `ContourRenderer`; use the renderer returned by
+    `get_contour_renderer` directly to render several time-steps with the same
+    figure template.
+
     Parameters
     ----------
     field_range: 3-list of floats, optional
@@ -480,66 +799,91 @@ class Field(object):
     if abs(self.values.min() - self.values.max()) <= 1.0E-06:
       print('[warning] uniform field; plot contour skipped!')
       return
-    # convert bodies in list if single body provided
-    if not isinstance(bodies, (list, tuple)):
-      bodies = [bodies]
     print('[time-step {}] plotting the {} contour ...'.format(self.time_step,
                                                               self.label))
-    height = width * (view[3] - view[1]) / (view[2] - view[0])
-    fig, ax = pyplot.subplots(figsize=(width, height), dpi=dpi)
-    ax.tick_params(axis='x', labelbottom='off')
-    ax.tick_params(axis='y', labelleft='off')
-    # create filled contour
     if field_range:
-      levels = numpy.linspace(*field_range)
       print('\tmin={}, max={}'.format(self.values.min(), self.values.max()))
-      colorbar_ticks = numpy.linspace(field_range[0], field_range[1], 5)
-      colorbar_format = '%.01f'
     else:
-      levels = numpy.linspace(self.values.min(), self.values.max(), 101)
-      print('\tmin={}, max={}, steps={}'.format(levels[0],
-                                                levels[-1],
-                                                levels.size))
-      colorbar_ticks = numpy.linspace(self.values.min(), self.values.max(), 3)
-      colorbar_format = '%.04f'
-    color_map = {'pressure': cm.jet, 'vorticity': cm.RdBu_r,
-                 'x-velocity': cm.RdBu_r, 'y-velocity': cm.RdBu_r}
-    X, Y = numpy.meshgrid(self.x, self.y)
-    contour_type = ax.contourf if filled_contour else ax.contour
-    if not colors:
-      if not cmap:
-        cmap = (cm.RdBu_r if self.label not in color_map.keys()
-                else color_map[self.label])
-    cont = contour_type(X, Y, self.values,
-                        levels=levels, extend='both',
-                        colors=colors,
-                        cmap=cmap)
-    if colorbar:
-      ains = inset_axes(pyplot.gca(), width='30%', height='2%', loc=3)
-      cont_bar = fig.colorbar(cont,
-                              cax=ains, orientation='horizontal',
-                              ticks=colorbar_ticks, format=colorbar_format)
-      cont_bar.ax.tick_params(labelsize=10)
-      cont_bar.ax.xaxis.set_ticks_position('top')
-    if time_increment:
-      ax.text(0.05, 0.85,
-              '{} time-units'.format(time_increment * self.time_step),
-              transform=ax.transAxes, fontsize=10)
-    # draw body
-    for body in bodies:
-      ax.plot(body.x, body.y,
-              color='black', linewidth=1, linestyle='-')
-    # set limits
-    ax.set_xlim(view[::2])
-    ax.set_ylim(view[1::2])
-    ax.set_aspect('equal')
-    # save image
-    save_name = (self.label if not save_name else save_name)
-    file_path = os.path.join(save_directory,
-                             '{}{:0>7}.{}'.format(save_name,
-                                                  self.time_step,
-                                                  fmt))
-    pyplot.savefig(file_path,
-                   dpi=dpi, bbox_inches='tight', pad_inches=0,
-                   format=fmt)
-    pyplot.close()
+      print('\tmin={}, max={}, steps={}'.format(self.values.min(),
+                                                self.values.max(), 101))
+    renderer = self.get_contour_renderer(field_range=field_range,
+                                         filled_contour=filled_contour,
+                                         view=view,
+                                         bodies=bodies,
+                                         time_increment=time_increment,
+                                         save_name=save_name,
+                                         save_directory=save_directory,
+                                         fmt=fmt,
+                                         colorbar=colorbar,
+                                         cmap=cmap,
+                                         colors=colors,
+                                         width=width,
+                                         dpi=dpi)
+    renderer.render(self)
+    renderer.close()
+
+
+def get_shape(stations):
+  """
+  Returns the shape of the array of values defined on a grid.
+
+  Parameters
+  ----------
+  stations: list of numpy 1D arrays of floats
+    Stations along a gridline in the x-, y-, and (optionally) z-directions.
+
+  Returns
+  -------
+  shape: tuple of integers
+    Shape of the array of values (z, y, x).
+  """
+  return tuple(s.size for s in reversed(stations))
+
+
+def get_interpolation_indices(stations, targets, atol=1.0E-06):
+  """
+  Returns the indices of the stations bracketing each target position and
+  the weights of the linear interpolation between them
+  (binary search in the sorted stations).
+
+  A target matching a station (within the tolerance) gets that station only,
+  so that its values are not mixed with the values of a neighbour.
+
+  Parameters
+  ----------
+  stations: numpy 1D array of floats
+    Sorted stations along a gridline.
+  targets: list or numpy 1D array of floats
+    Positions where to interpolate.
+  atol: float, optional
+    Absolute tolerance used to match a target with a station;
+    default: 1.0E-06.
+
+  Returns
+  -------
+  lower, upper: numpy 1D arrays of integers
+    Indices of the stations before and after each target.
+  weights: numpy 1D array of floats
+    Weight of the upper station for each target
+    (the lower station gets the complement).
+  """
+  targets = numpy.atleast_1d(numpy.asarray(targets, dtype=numpy.float64))
+  outside = numpy.logical_or(targets < stations[0] - atol,
+                             targets > stations[-1] + atol)
+  if numpy.any(outside):
+    raise ValueError('positions {} are outside the gridline [{}, {}]'
+                     ''.format(targets[outside], stations[0], stations[-1]))
+  upper = numpy.searchsorted(stations, targets, side='right')
+  upper = numpy.clip(upper, 1, stations.size - 1)
+  lower = upper - 1
+  weights = ((targets - stations[lower])
+             / (stations[upper] - stations[lower]))
+  # snap the targets that match a station
+  on_lower = numpy.abs(targets - stations[lower]) <= atol
+  on_upper = numpy.logical_and(~on_lower,
+                               numpy.abs(targets - stations[upper]) <= atol)
+  upper[on_lower] = lower[on_lower]
+  lower[on_upper] = upper[on_upper]
+  weights[on_lower] = 0.0
+  weights[on_upper] = 1.0
+  return lower, upper, weights
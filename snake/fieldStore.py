@@ -0,0 +1,238 @@
+"""
+Implementation of the class `FieldStore`, a cache of fields indexed by
+time-step and field name.
+"""
+
+import collections
+
+import numpy
+
+
+class FieldStore(object):
+  """
+  Contains Field objects indexed by (time-step, field name) and by the
+  keyword-arguments passed to the producers.
+
+  Each field name is associated with a producer (a function that reads or
+  computes the field) and with the names of the fields it depends on.
+  Fields are computed lazily: requesting a field computes its dependencies
+  first (reusing the ones already stored).
+  The fields of the least-recently-used time-steps are evicted when more
+  than `max_time_steps` time-steps are stored; the least-recently-used fields
+  are evicted when the memory used by the stored fields exceeds the memory
+  budget.
+  """
+
+  def __init__(self, memory_budget=None, max_time_steps=1):
+    """
+    Initializes an empty store.
+
+    Parameters
+    ----------
+    memory_budget: integer, optional
+      Maximum number of bytes used by the stored fields;
+      default: None (no limit).
+    max_time_steps: integer, optional
+      Maximum number of time-steps stored;
+      default: 1 (only the fields of the current time-step are kept);
+      None means no limit.
+    """
+    self.memory_budget = memory_budget
+    self.max_time_steps = max_time_steps
+    self.producers = {}
+    self.fields = collections.OrderedDict()
+    self.nbytes = 0
+
+  def register(self, names, producer, dependencies=[]):
+    """
+    Registers the producer of a group of fields.
+
+    Parameters
+    ----------
+    names: list of strings
+      Names of the fields returned by the producer (in the same order).
+    producer: function
+      Function called as `producer(time_step, *dependencies, **kwargs)`;
+      returns a Field object or a tuple of Field objects.
+    dependencies: list of strings, optional
+      Names of the fields passed to the producer;
+      default: [].
+    """
+    if not isinstance(names, (list, tuple)):
+      names = [names]
+    for name in names:
+      self.producers[name] = (list(names), producer, list(dependencies))
+
+  def get(self, time_step, name, **kwargs):
+    """
+    Returns a field at a given time-step, computing it if not stored.
+
+    Parameters
+    ----------
+    time_step: integer
+      Time-step of the field.
+    name: string
+      Name of the field.
+    **kwargs: dictionary
+      Extra keyword-arguments passed to the producers;
+      fields obtained with different keyword-arguments are stored apart.
+
+    Returns
+    -------
+    field: Field object
+      The requested field.
+    """
+    key = get_key(time_step, name, kwargs)
+    if key in self.fields:
+      # mark field as most-recently used
+      field = self.fields.pop(key)
+      self.fields[key] = field
+      return field
+    if name not in self.producers:
+      raise ValueError('no producer registered for the field '
+                       '{}'.format(name))
+    names, producer, dependencies = self.producers[name]
+    inputs = [self.get(time_step, dependency, **kwargs)
+              for dependency in dependencies]
+    outputs = producer(time_step, *inputs, **kwargs)
+    if not isinstance(outputs, (list, tuple)):
+      outputs = [outputs]
+    for output_name, field in zip(names, outputs):
+      self.add(time_step, output_name, field, **kwargs)
+    return outputs[names.index(name)]
+
+  def add(self, time_step, name, field, **kwargs):
+    """
+    Stores a field and evicts the least-recently-used fields if the memory
+    budget is exceeded.
+
+    Parameters
+    ----------
+    time_step: integer
+      Time-step of the field.
+    name: string
+      Name of the field.
+    field: Field object
+      The field to store.
+    **kwargs: dictionary
+      Keyword-arguments the field was obtained with.
+    """
+    self.remove(time_step, name, **kwargs)
+    self.fields[get_key(time_step, name, kwargs)] = field
+    self.nbytes += get_nbytes(field)
+    self.evict()
+
+  def remove(self, time_step, name, **kwargs):
+    """
+    Removes a field from the store (if present).
+
+    Parameters
+    ----------
+    time_step: integer
+      Time-step of the field.
+    name: string
+      Name of the field.
+    **kwargs: dictionary
+      Keyword-arguments the field was obtained with.
+    """
+    self._pop(get_key(time_step, name, kwargs))
+
+  def _pop(self, key):
+    """
+    Removes the field stored under a given key (if present).
+    """
+    field = self.fields.pop(key, None)
+    if field is not None:
+      self.nbytes -= get_nbytes(field)
+
+  def evict(self):
+    """
+    Evicts the fields of the least-recently-used time-steps beyond the
+    maximum number of time-steps, then the least-recently-used fields until
+    the memory budget is met.
+    The most-recently-used field is always kept.
+    """
+    if self.max_time_steps is not None:
+      recent = []
+      for time_step, _, _ in reversed(self.fields):
+        if time_step not in recent:
+          recent.append(time_step)
+      kept = set(recent[:max(self.max_time_steps, 1)])
+      for key in [key for key in self.fields if key[0] not in kept]:
+        self._pop(key)
+    if self.memory_budget is None:
+      return
+    while self.nbytes > self.memory_budget and len(self.fields) > 1:
+      self._pop(next(iter(self.fields)))
+
+  def clear(self):
+    """
+    Removes all fields from the store.
+    """
+    self.fields.clear()
+    self.nbytes = 0
+
+  def get_time_steps(self):
+    """
+    Returns the sorted list of time-steps with at least one stored field.
+    """
+    return sorted(set(key[0] for key in self.fields.keys()))
+
+  def __contains__(self, key):
+    # (time-step, name) refers to the field obtained without keyword-arguments
+    if len(key) == 2:
+      key = get_key(key[0], key[1], {})
+    return key in self.fields
+
+  def __len__(self):
+    return len(self.fields)
+
+
+def get_key(time_step, name, kwargs):
+  """
+  Returns the key of a field in the store.
+
+  Parameters
+  ----------
+  time_step: integer
+    Time-step of the field.
+  name: string
+    Name of the field.
+  kwargs: dictionary
+    Keyword-arguments passed to the producers; lists are converted into
+    tuples so that the key is hashable.
+
+  Returns
+  -------
+  key: tuple
+    The key (time-step, name, sorted keyword-arguments).
+  """
+  options = tuple(sorted((keyword,
+                          tuple(value) if isinstance(value, list) else value)
+                         for keyword, value in kwargs.items()))
+  return (time_step, name, options)
+
+
+def get_nbytes(field):
+  """
+  Returns the number of bytes held in memory by the values of a field.
+
+  Values memory-mapped from a file in read-only mode are backed by the file
+  and are not counted.
+
+  Parameters
+  ----------
+  field: Field object
+    The field.
+
+  Returns
+  -------
+  nbytes: integer
+    Number of bytes.
+  """
+  values = field.values
+  if values is None:
+    return 0
+  if isinstance(values, numpy.memmap) and not values.flags.writeable:
+    return 0
+  return values.nbytes
@@ -146,11 +146,14 @@ class Force(object):
     maxima = maxima[numpy.append(True, maxima[1:] - maxima[:-1] > order)]
     return minima, maxima
 
-  def get_strouhal(self, L=1.0, U=1.0, limits=(0.0, float('inf')), order=5):
+  def get_strouhal(self, L=1.0, U=1.0, limits=(0.0, float('inf')), order=5,
+                   method='extrema', **kwargs):
     """
     Computes the Strouhal number based on the frequency of the signal.
 
-    The frequency is computed using the minima of the signal.
+    The frequency is computed using the minima of the signal
+    (`method='extrema'`) or the peak of its power spectral density
+    (`method='welch'` or `method='fft'`, see `get_spectral_strouhal`).
 
     Parameters
     ----------
@@ -169,6 +172,12 @@ class Force(object):
     order: integer, optional
       Number of neighbors used on each side to define an extremum;
       default: 5.
+    method: string, optional
+      Method used to get the frequency;
+      choices: 'extrema', 'welch', 'fft';
+      default: 'extrema'.
+    **kwargs: dictionary
+      Extra keyword-arguments passed to `get_spectral_strouhal`.
 
     Returns
     -------
@@ -177,6 +186,9 @@ class Force(object):
       averaging, the actual time-limits used, and the value over each period
       used.
     """
+    if method != 'extrema':
+      return self.get_spectral_strouhal(L=L, U=U, limits=limits,
+                                        method=method, **kwargs)
     minima, _ = self.get_extrema(limits=limits, order=order)
     strouhals = L / U / (self.times[minima[1:]] - self.times[minima[:-1]])
     self.strouhal = {'n-periods': minima.size - 1,
@@ -185,3 +197,273 @@ class Force(object):
                      'values': strouhals,
                      'mean': strouhals.mean()}
     return self.strouhal
+
+  def get_spectrum(self, limits=(0.0, float('inf')), method='welch',
+                   n_samples=None, n_segments=4):
+    """
+    Computes the power spectral density of the force.
+
+    The signal is first resampled on a uniform time-grid.
+
+    Parameters
+    ----------
+    limits: 2-tuple of floats, optional
+      Time-limits of the signal to use;
+      default: (0.0, inf).
+    method: string, optional
+      Method used to estimate the spectral density;
+      choices: 'welch', 'fft';
+      default: 'welch'.
+    n_samples: integer, optional
+      Number of samples of the uniform time-grid;
+      default: None (number of samples within the time-limits).
+    n_segments: integer, optional
+      Number of segments (overlapping by half) averaged with Welch's method;
+      default: 4.
+
+    Returns
+    -------
+    frequencies: 1D array of floats
+      The frequencies.
+    psd: 1D array of floats
+      The power spectral density.
+    """
+    times, values = get_uniform_samples(self.times, self.values,
+                                        limits=limits, n_samples=n_samples)
+    return get_spectrum(times, values, method=method, n_segments=n_segments)
+
+  def get_spectral_strouhal(self, L=1.0, U=1.0, limits=(0.0, float('inf')),
+                            method='welch', n_samples=None, n_segments=4,
+                            n_harmonics=3):
+    """
+    Computes the Strouhal number based on the dominant frequency of the power
+    spectral density of the force.
+
+    Parameters
+    ----------
+    L: float, optional
+      Characteristics length of the body;
+      default: 1.0.
+    U: float, optional
+      Characteristics velocity of the body;
+      default: 1.0.
+    limits: 2-tuple of floats, optional
+      Time-limits used to compute the Strouhal number;
+      default: (0.0, inf).
+    method: string, optional
+      Method used to estimate the spectral density;
+      choices: 'welch', 'fft';
+      default: 'welch'.
+    n_samples: integer, optional
+      Number of samples of the uniform time-grid;
+      default: None (number of samples within the time-limits).
+    n_segments: integer, optional
+      Number of segments averaged with Welch's method;
+      default: 4.
+    n_harmonics: integer, optional
+      Number of harmonics of the dominant frequency to report;
+      default: 3.
+
+    Returns
+    -------
+    strouhal: dictionary
+      Contains the Strouhal number ('mean' and 'values'), its uncertainty,
+      the dominant frequency, the harmonics, the confidence indicators of the
+      peak, the actual time-limits used, and the number of periods they span.
+    """
+    times, values = get_uniform_samples(self.times, self.values,
+                                        limits=limits, n_samples=n_samples)
+    frequencies, psd = get_spectrum(times, values, method=method,
+                                    n_segments=n_segments)
+    peaks = get_spectral_peaks(frequencies, psd, n_harmonics=n_harmonics)
+    self.strouhal = get_strouhal_from_peaks(peaks, times, L=L, U=U)
+    return self.strouhal
+
+
+def get_uniform_samples(times, values, limits=(0.0, float('inf')),
+                        n_samples=None):
+  """
+  Resamples signals on a uniform time-grid with a linear interpolation.
+
+  Parameters
+  ----------
+  times: 1D array of floats
+    Discrete time values (increasing, possibly non-uniform).
+  values: N-D array of floats
+    Values of the signals (time along the last axis).
+  limits: 2-tuple of floats, optional
+    Time-limits of the signals to resample (at least 2 samples are required
+    within the limits);
+    default: (0.0, inf).
+  n_samples: integer, optional
+    Number of samples of the uniform time-grid;
+    default: None (number of samples within the time-limits).
+
+  Returns
+  -------
+  uniform_times: 1D array of floats
+    The uniform time-grid.
+  uniform_values: N-D array of floats
+    The resampled values.
+  """
+  mask = numpy.where(numpy.logical_and(times >= limits[0],
+                                       times <= limits[1]))[0]
+  times, values = times[mask], values[..., mask]
+  if times.size < 2:
+    raise ValueError('at least 2 samples are required between the '
+                     'time-limits {} and {} (got {})'.format(limits[0],
+                                                             limits[1],
+                                                             times.size))
+  if not n_samples:
+    n_samples = times.size
+  uniform_times = numpy.linspace(times[0], times[-1], n_samples)
+  # left neighbor and interpolation weight of each uniform time
+  indices = numpy.searchsorted(times, uniform_times, side='right') - 1
+  indices = indices.clip(0, times.size - 2)
+  steps = times[indices + 1] - times[indices]
+  weights = numpy.divide(uniform_times - times[indices], steps,
+                         out=numpy.zeros_like(steps), where=(steps > 0.0))
+  uniform_values = ((1.0 - weights) * values[..., indices] +
+                    weights * values[..., indices + 1])
+  return uniform_times, uniform_values
+
+
+def get_spectrum(times, values, method='welch', n_segments=4):
+  """
+  Computes the one-sided power spectral density of signals sampled on a
+  uniform time-grid (the mean value is removed).
+
+  Parameters
+  ----------
+  times: 1D array of floats
+    Uniform time-grid.
+  values: N-D array of floats
+    Values of the signals (time along the last axis).
+  method: string, optional
+    Method used to estimate the spectral density;
+    choices: 'welch' (averaged periodograms of overlapping segments),
+    'fft' (single periodogram with a Hann window);
+    default: 'welch'.
+  n_segments: integer, optional
+    Number of segments (overlapping by half) used with Welch's method;
+    default: 4.
+
+  Returns
+  -------
+  frequencies: 1D array of floats
+    The frequencies.
+  psd: N-D array of floats
+    The power spectral densities (frequency along the last axis).
+  """
+  dt = (times[-1] - times[0]) / (times.size - 1)
+  if method == 'welch':
+    nperseg = min(times.size, int(2 * times.size / (n_segments + 1)))
+    return signal.welch(values, fs=1.0 / dt, nperseg=nperseg,
+                        detrend='constant', axis=-1)
+  elif method == 'fft':
+    return signal.periodogram(values, fs=1.0 / dt, window='hann',
+                              detrend='constant', axis=-1)
+  raise ValueError('unknown spectral method: {}'.format(method))
+
+
+def get_spectral_peaks(frequencies, psd, n_harmonics=3):
+  """
+  Finds the dominant frequency of power spectral densities and reports the
+  harmonics of that frequency.
+
+  The location of the peak is refined with a parabolic interpolation of the
+  logarithm of the density around the maximum.
+
+  Parameters
+  ----------
+  frequencies: 1D array of floats
+    Frequencies (uniformly spaced, starting at zero).
+  psd: N-D array of floats
+    Power spectral densities (frequency along the last axis).
+  n_harmonics: integer, optional
+    Number of harmonics (2f, 3f, ...) to report;
+    default: 3.
+
+  Returns
+  -------
+  peaks: dictionary of (string, N-1-D array) items
+    Keys: - 'frequency': the dominant frequency;
+          - 'resolution': the frequency resolution of the spectrum;
+          - 'power-fraction': fraction of the power in the peak bins;
+          - 'peak-to-median': ratio of the peak density to the median density;
+          - 'harmonics': frequency of each harmonic (last axis);
+          - 'harmonic-ratios': density of each harmonic relative to the peak.
+  """
+  df = frequencies[1] - frequencies[0]
+  n = frequencies.size
+  # ignore the zero-frequency bin
+  k = 1 + numpy.argmax(psd[..., 1:], axis=-1)
+  tiny = numpy.finfo(numpy.float64).tiny
+  left, center, right = [numpy.log(_take(psd, indices) + tiny)
+                         for indices in [(k - 1).clip(1, n - 1), k,
+                                         (k + 1).clip(1, n - 1)]]
+  curvature = left - 2.0 * center + right
+  shift = numpy.divide(0.5 * (left - right), curvature,
+                       out=numpy.zeros_like(curvature),
+                       where=(curvature < 0.0)).clip(-0.5, 0.5)
+  frequency = (k + shift) * df
+  # power in the bins around the peak relative to the total power
+  bins = numpy.arange(1, n)
+  in_peak = (numpy.absolute(bins - k[..., None]) <= 1)
+  power_fraction = ((psd[..., 1:] * in_peak).sum(axis=-1) /
+                    psd[..., 1:].sum(axis=-1))
+  peak = _take(psd, k)
+  harmonics = frequency[..., None] * numpy.arange(2, n_harmonics + 2)
+  harmonic_indices = numpy.rint(harmonics / df).astype(int).clip(0, n - 1)
+  harmonic_ratios = (numpy.take_along_axis(psd, harmonic_indices, axis=-1) /
+                     peak[..., None])
+  return {'frequency': frequency,
+          'resolution': df,
+          'power-fraction': power_fraction,
+          'peak-to-median': peak / numpy.median(psd[..., 1:], axis=-1),
+          'harmonics': harmonics,
+          'harmonic-ratios': harmonic_ratios}
+
+
+def _take(psd, indices):
+  """
+  Returns the density at a given frequency index for each signal.
+  """
+  return numpy.take_along_axis(psd, indices[..., None], axis=-1)[..., 0]
+
+
+def get_strouhal_from_peaks(peaks, times, L=1.0, U=1.0):
+  """
+  Gathers the Strouhal number and the information about the spectral peak of
+  a signal.
+
+  Parameters
+  ----------
+  peaks: dictionary
+    Spectral peak of the signal (see `get_spectral_peaks`).
+  times: 1D array of floats
+    Time-grid of the signal.
+  L: float, optional
+    Characteristics length of the body;
+    default: 1.0.
+  U: float, optional
+    Characteristics velocity of the body;
+    default: 1.0.
+
+  Returns
+  -------
+  strouhal: dictionary
+    The Strouhal number and spectral information.
+  """
+  frequency = float(peaks['frequency'])
+  strouhal = frequency * L / U
+  return {'n-periods': int(frequency * (times[-1] - times[0])),
+          'time-limits': (times[0], times[-1]),
+          'values': numpy.array([strouhal]),
+          'mean': strouhal,
+          'uncertainty': 0.5 * peaks['resolution'] * L / U,
+          'frequency': frequency,
+          'harmonics': numpy.asarray(peaks['harmonics']),
+          'harmonic-ratios': numpy.asarray(peaks['harmonic-ratios']),
+          'power-fraction': float(peaks['power-fraction']),
+          'peak-to-median': float(peaks['peak-to-median'])}
@@ -0,0 +1,330 @@
+"""
+Implementation of the class `ForceHistoryReader`, an incremental reader of
+force-history files written by a running solver.
+"""
+
+import os
+import glob
+import time
+
+import numpy
+
+from .force import Force
+
+
+class ForceHistoryReader(object):
+  """
+  Reads a force-history file (one row per time-step, the first column being
+  the time) incrementally.
+
+  The reader remembers the byte offset of the last complete line parsed;
+  each update only parses the rows appended to the file since then, in bulk.
+  The rows are stored in a buffer whose capacity grows geometrically.
+
+  Optionally, the parsed rows are cached next to the file in a binary .npy
+  file keyed by the size and modification time of the file; the cache is
+  memory-mapped instead of parsing the file again.
+  The cache is written after the first complete parse of the file; the rows
+  appended afterwards are only saved by `close` (or `write_cache`), so that
+  polling a growing file does not rewrite the whole history.
+  """
+
+  def __init__(self, file_path, usecols=None, comments='#', cache=False,
+               delete_chars=None):
+    """
+    Initializes the reader (nothing is read yet).
+
+    Parameters
+    ----------
+    file_path: string
+      Path of the force-history file.
+    usecols: tuple of integers, optional
+      Index of each column to read (including the time column);
+      default: None (all columns).
+    comments: string, optional
+      Characters used to indicate the start of a comment;
+      default: '#'.
+    cache: boolean, optional
+      Set 'True' to load the rows from (or save them into) a .npy cache file;
+      default: False.
+    delete_chars: string, optional
+      Characters removed from the lines before parsing them
+      (e.g. '()' for the vector entries of OpenFOAM files);
+      default: None.
+    """
+    self.file_path = file_path
+    self.usecols = usecols
+    self.comments = comments
+    self.cache = cache
+    self.delete_chars = delete_chars
+    self.reset()
+
+  def reset(self):
+    """
+    Forgets the data read so far; the next update reads the whole file.
+    """
+    self.offset = 0
+    self.inode = None
+    self.n_rows = 0
+    self.data = None
+    self.cache_outdated = False
+
+  def update(self):
+    """
+    Parses the rows appended to the file since the last update.
+
+    An incomplete last line (being written by the solver) is left for the
+    next update.
+    The reader restarts from the beginning of the file if the file has been
+    truncated or replaced.
+
+    Returns
+    -------
+    n_new: integer
+      Number of rows parsed.
+    """
+    stat = os.stat(self.file_path)
+    if stat.st_size < self.offset or (self.inode is not None and
+                                      stat.st_ino != self.inode):
+      self.reset()
+    self.inode = stat.st_ino
+    if stat.st_size == self.offset:
+      return 0
+    first_parse = self.offset == 0
+    if self.cache and first_parse:
+      cache_path = self.get_cache_path(stat)
+      if os.path.isfile(cache_path):
+        self.data = numpy.load(cache_path, mmap_mode='r')
+        self.n_rows = self.data.shape[0]
+        self.offset = stat.st_size
+        return self.n_rows
+    with open(self.file_path, 'rb') as infile:
+      infile.seek(self.offset)
+      chunk = infile.read(stat.st_size - self.offset)
+    end = chunk.rfind(b'\n') + 1
+    if end == 0:
+      return 0
+    self.offset += end
+    chunk = chunk[:end]
+    if self.delete_chars:
+      chunk = chunk.translate(None, self.delete_chars.encode('ascii'))
+    lines = chunk.decode('ascii').splitlines()
+    rows = numpy.loadtxt(lines, dtype=numpy.float64, comments=self.comments,
+                         usecols=self.usecols, ndmin=2)
+    self._append(rows)
+    if self.cache:
+      if first_parse and self.offset == stat.st_size:
+        # the whole (complete) file has been parsed at once
+        self.write_cache(stat)
+      else:
+        self.cache_outdated = True
+    return rows.shape[0]
+
+  def close(self):
+    """
+    Saves the rows parsed since the cache was written (if caching is enabled
+    and the file has not been modified since the last update).
+    """
+    if not (self.cache and self.cache_outdated):
+      return
+    stat = os.stat(self.file_path)
+    if stat.st_size == self.offset and stat.st_ino == self.inode:
+      self.write_cache(stat)
+
+  def get_cache_path(self, stat=None):
+    """
+    Returns the path of the cache file associated with the current state of
+    the force-history file.
+
+    Parameters
+    ----------
+    stat: os.stat_result object, optional
+      Status of the force-history file;
+      default: None (the status is queried).
+
+    Returns
+    -------
+    cache_path: string
+      Path of the .npy cache file.
+    """
+    if stat is None:
+      stat = os.stat(self.file_path)
+    key = '{}-{}'.format(stat.st_size, int(round(stat.st_mtime * 1.0E+06)))
+    return self._get_cache_path(key)
+
+  def _get_cache_path(self, key):
+    """
+    Returns the path of the cache file for a given key (size and time of
+    modification) and the columns read.
+    """
+    directory, name = os.path.split(self.file_path)
+    columns = ('-'.join(str(c) for c in self.usecols) if self.usecols
+               else 'all')
+    if self.delete_chars:
+      # columns are not the same once characters have been deleted
+      columns += '-d'
+    return os.path.join(directory,
+                        '.{}.{}-{}.cache.npy'.format(name, key, columns))
+
+  def write_cache(self, stat=None):
+    """
+    Saves the rows read into a .npy cache file next to the force-history file
+    (and removes the outdated cache files of the same columns).
+    Nothing is saved if the directory is not writable.
+
+    Parameters
+    ----------
+    stat: os.stat_result object, optional
+      Status of the force-history file when the rows were read;
+      default: None (the status is queried).
+    """
+    cache_path = self.get_cache_path(stat)
+    pattern = self._get_cache_path('*-*')
+    try:
+      for path in glob.glob(pattern):
+        os.remove(path)
+      numpy.save(cache_path, self.get_data())
+      self.cache_outdated = False
+    except (IOError, OSError):
+      print('[warning] unable to write cache file {}'.format(cache_path))
+
+  def _append(self, rows):
+    """
+    Appends rows to the buffer, doubling its capacity when full.
+    """
+    self.data, self.n_rows = append_rows(self.data, self.n_rows, rows)
+
+  def get_data(self, start=0):
+    """
+    Returns the rows read so far.
+
+    Parameters
+    ----------
+    start: integer, optional
+      Index of the first row to return;
+      default: 0.
+
+    Returns
+    -------
+    data: numpy 2D array of floats
+      View on the rows (one column per column read).
+    """
+    if self.data is None:
+      return numpy.empty((0, len(self.usecols) if self.usecols else 0))
+    return self.data[start:self.n_rows]
+
+  def get_forces(self, labels=None, start=0):
+    """
+    Returns the forces read so far.
+
+    Parameters
+    ----------
+    labels: list of strings, optional
+      Label of each force (one per column after the time column);
+      default: None.
+    start: integer, optional
+      Index of the first sample to return;
+      default: 0.
+
+    Returns
+    -------
+    forces: list of Force objects
+      The forces (times and values are views on the buffer).
+    """
+    return get_forces(self.get_data(start=start), labels=labels)
+
+  def follow(self, labels=None, interval=1.0, timeout=None):
+    """
+    Yields the samples appended to the file while the solver writes it.
+    The reader is closed (see `close`) when the timeout is reached.
+
+    Parameters
+    ----------
+    labels: list of strings, optional
+      Label of each force;
+      default: None.
+    interval: float, optional
+      Time (in seconds) between two polls of the file;
+      default: 1.0.
+    timeout: float, optional
+      Stops when no new sample has been written for that time (in seconds);
+      default: None (follows the file forever).
+
+    Yields
+    ------
+    forces: list of Force objects
+      The new samples of each force.
+    """
+    last_update = time.time()
+    while True:
+      n_new = self.update()
+      if n_new > 0:
+        last_update = time.time()
+        yield self.get_forces(labels=labels, start=self.n_rows - n_new)
+      elif timeout is not None and time.time() - last_update >= timeout:
+        self.close()
+        return
+      else:
+        time.sleep(interval)
+
+
+def append_rows(data, n_rows, rows):
+  """
+  Appends rows to a buffer, doubling its capacity when full.
+
+  Parameters
+  ----------
+  data: numpy 2D array of floats or None
+    The buffer (None if not allocated yet).
+  n_rows: integer
+    Number of rows used in the buffer.
+  rows: numpy 2D array of floats
+    The rows to append.
+
+  Returns
+  -------
+  data: numpy 2D array of floats or None
+    The buffer (reallocated if its capacity was exceeded).
+  n_rows: integer
+    Number of rows used in the buffer.
+  """
+  if rows.shape[0] == 0:
+    return data, n_rows
+  if data is None:
+    data = numpy.empty((max(1024, rows.shape[0]), rows.shape[1]))
+  elif n_rows + rows.shape[0] > data.shape[0]:
+    capacity = max(2 * data.shape[0], n_rows + rows.shape[0])
+    buffer = numpy.empty((capacity, data.shape[1]))
+    buffer[:n_rows] = data[:n_rows]
+    data = buffer
+  data[n_rows:n_rows + rows.shape[0]] = rows
+  return data, n_rows + rows.shape[0]
+
+
+def get_forces(data, labels=None):
+  """
+  Returns the forces stored in the columns of an array.
+
+  Parameters
+  ----------
+  data: numpy 2D array of floats
+    The rows (time in the first column).
+  labels: list of strings, optional
+    Label of each force (one per column after the time column);
+    default: None.
+
+  Returns
+  -------
+  forces: list of Force objects
+    The forces (times and values are views on the array).
+  """
+  if data.shape[1] == 0:
+    return []
+  if not labels:
+    labels = [None] * (data.shape[1] - 1)
+  forces = []
+  for index in range(data.shape[1] - 1):
+    force = Force()
+    force.set(data[:, 0], data[:, index + 1], label=labels[index])
+    forces.append(force)
+  return forces
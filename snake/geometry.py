@@ -4,11 +4,12 @@ Implementation of the classes to generate various body coordinates.
 
 import os
 import math
-import copy
 
 import numpy
 from matplotlib import pyplot
 
+from .petibm.petscVec import write_vec
+
 
 class Point(object):
   """
@@ -81,26 +82,13 @@ class Point(object):
       center = center.as_array()
     else:
       return
-    if mode == 'deg':
-      roll *= math.pi / 180.0
-      yaw *= math.pi / 180.0
-      pitch *= math.pi / 180.0
+    R = get_rotation_matrix(roll=roll, yaw=yaw, pitch=pitch, mode=mode,
+                            dimensions=self.dimensions)
     point = self.as_array()
     if self.dimensions == 2:
-      Rz = numpy.array([[math.cos(pitch), -math.sin(pitch)],
-                        [math.sin(pitch), math.cos(pitch)]])
-      self.x, self.y = Rz.dot(point - center) + center
+      self.x, self.y = R.dot(point - center) + center
     else:
-      Rz = numpy.array([[math.cos(pitch), -math.sin(pitch), 0.0],
-                        [math.sin(pitch), math.cos(pitch), 0.0],
-                        [0.0, 0.0, 1.0]])
-      Ry = numpy.array([[math.cos(yaw), 0.0, math.sin(yaw)],
-                        [0.0, 1.0, 0.0],
-                        [-math.sin(yaw), 0.0, math.cos(yaw)]])
-      Rx = numpy.array([[1.0, 0.0, 0.0],
-                        [0.0, math.cos(roll), -math.sin(roll)],
-                        [0.0, math.sin(roll), math.cos(roll)]])
-      self.x, self.y, self.z = Rz.dot(Ry.dot(Rx.dot(point - center))) + center
+      self.x, self.y, self.z = R.dot(point - center) + center
 
   def translation(self, displacement=[0.0, 0.0, 0.0]):
     """
@@ -118,13 +106,66 @@ class Point(object):
       self.z += displacement[2]
 
 
+class PointView(Point):
+  """
+  Point whose coordinates are stored in a row of the coordinates array of a
+  geometry (kept for compatibility with the code using lists of points).
+  """
+
+  def __init__(self, coordinates, index):
+    """
+    Attaches the point to a row of an array.
+
+    Parameters
+    ----------
+    coordinates: numpy 2D array of floats
+      Coordinates of the points of the geometry (one row per point).
+    index: integer
+      Index of the point.
+    """
+    self._coordinates, self._index = coordinates, index
+    self.dimensions = coordinates.shape[1]
+
+  @property
+  def x(self):
+    return self._coordinates[self._index, 0]
+
+  @x.setter
+  def x(self, value):
+    self._coordinates[self._index, 0] = value
+
+  @property
+  def y(self):
+    return self._coordinates[self._index, 1]
+
+  @y.setter
+  def y(self, value):
+    self._coordinates[self._index, 1] = value
+
+  @property
+  def z(self):
+    if self.dimensions == 2:
+      return None
+    return self._coordinates[self._index, 2]
+
+  @z.setter
+  def z(self, value):
+    if self.dimensions == 3:
+      self._coordinates[self._index, 2] = value
+
+
 class Geometry(object):
   """
   Contains information about a geometry.
+
+  The coordinates of the points are stored in a 2D array (one row per point,
+  one column per direction); the list of `Point` objects (`points`) is a
+  view on that array kept for compatibility.
   """
   dimensions = None
 
-  def __init__(self, points=None, file_path=None, skiprows=0):
+  def __init__(self, points=None, file_path=None, skiprows=0,
+               coordinates=None):
     """
     Initializes the geometry with points.
 
@@ -139,15 +180,63 @@ class Geometry(object):
     skiprows: integer, optional
       Index of line to start read;
       default: 0.
+    coordinates: numpy 2D array of floats, optional
+      Coordinates of the points (one row per point);
+      default: None.
     """
+    self.coordinates = None
     if points:
       self.points = points
-      self.points_initial = copy.deepcopy(points)
+    if coordinates is not None:
+      self.set_coordinates(coordinates)
     if file_path:
       self.read_from_file(file_path, skiprows=skiprows)
-    if self.dimensions or self.points:
+    if self.coordinates is not None:
       self.get_mass_center()
 
+  def set_coordinates(self, coordinates, initial=True):
+    """
+    Sets the coordinates of the points.
+
+    Parameters
+    ----------
+    coordinates: numpy 2D array of floats
+      Coordinates of the points (one row per point, one column per
+      direction).
+    initial: boolean, optional
+      Set 'True' to also store them as the initial position;
+      default: True.
+    """
+    self.coordinates = numpy.array(coordinates, dtype=numpy.float64, ndmin=2)
+    if initial:
+      self.coordinates_initial = self.coordinates.copy()
+
+  @property
+  def points(self):
+    """
+    Points of the geometry (views on the rows of the coordinates).
+    """
+    return [PointView(self.coordinates, i)
+            for i in range(self.coordinates.shape[0])]
+
+  @points.setter
+  def points(self, points):
+    self.set_coordinates([point.as_array() for point in points])
+
+  @property
+  def points_initial(self):
+    """
+    Points of the geometry at the initial position.
+    """
+    return [PointView(self.coordinates_initial, i)
+            for i in range(self.coordinates_initial.shape[0])]
+
+  @points_initial.setter
+  def points_initial(self, points):
+    self.coordinates_initial = numpy.array([point.as_array()
+                                            for point in points],
+                                           dtype=numpy.float64, ndmin=2)
+
   def read_from_file(self, file_path, skiprows=0):
     """
     Reads the coordinates of the geometry from a file.
@@ -174,8 +263,7 @@ class Geometry(object):
                              dtype=numpy.float64,
                              skiprows=skiprows,
                              comments='#')
-    self.points = [Point(*coord) for coord in coords]
-    self.points_initial = copy.deepcopy(self.points)
+    self.set_coordinates(coords)
 
   def gather_coordinate(self, component, position='current'):
     """
@@ -194,12 +282,11 @@ class Geometry(object):
     array: Numpy array
       Array with the appropriate component of all points defining the geometry.
     """
+    index = 'xyz'.index(component)
     if position == 'current':
-      return numpy.array([getattr(point, component)
-                          for point in self.points])
+      return self.coordinates[:, index].copy()
     elif position == 'initial':
-      return numpy.array([getattr(point, component)
-                          for point in self.points_initial])
+      return self.coordinates_initial[:, index].copy()
 
   def broadcast_coordinate(self, array, component):
     """
@@ -212,18 +299,15 @@ class Geometry(object):
     component: string
       Point's component to be filled.
     """
-    for i, point in enumerate(self.points):
-      setattr(self.points[i], component, array[i])
+    self.coordinates[:, 'xyz'.index(component)] = array
 
   def get_mass_center(self):
     """
     Computes the center of mass of the geometry.
     """
-    x_mass = self.gather_coordinate('x').mean()
-    y_mass = self.gather_coordinate('y').mean()
-    z_mass = (self.gather_coordinate('z').mean()
-              if self.dimensions == 3 else None)
-    self.mass_center = Point(x_mass, y_mass, z_mass)
+    center = self.coordinates.mean(axis=0)
+    z_mass = center[2] if self.dimensions == 3 else None
+    self.mass_center = Point(center[0], center[1], z_mass)
     return self.mass_center
 
   def translation(self, displacement=[0.0, 0.0, 0.0]):
@@ -239,8 +323,8 @@ class Geometry(object):
     if not any(displacement):
       return
     print('\nTranslate the geometry ...')
-    for i, point in enumerate(self.points):
-      self.points[i].translation(displacement)
+    dim = self.coordinates.shape[1]
+    self.coordinates += numpy.asarray(displacement, dtype=numpy.float64)[:dim]
     self.get_mass_center()
 
   def rotation(self, center=None,
@@ -265,12 +349,16 @@ class Geometry(object):
     if not any([roll, yaw, pitch]):
       return
     print('\nRotate the geometry ...')
+    dim = self.coordinates.shape[1]
     if not center:
-      center = self.get_mass_center()
+      center = self.coordinates.mean(axis=0)
     else:
-      center = Point(*center)
-    for i, point in enumerate(self.points):
-      self.points[i].rotation(center, roll, yaw, pitch, mode)
+      center = numpy.asarray(center, dtype=numpy.float64)[:dim]
+    R = get_rotation_matrix(roll=roll, yaw=yaw, pitch=pitch, mode=mode,
+                            dimensions=dim)
+    self.coordinates -= center
+    self.coordinates[...] = self.coordinates.dot(R.T)
+    self.coordinates += center
     self.get_mass_center()
 
   def scale(self, ratio=1.0):
@@ -286,11 +374,12 @@ class Geometry(object):
     if ratio == 1.0:
       return
     print('\nScale the geometry ...')
-    components = (['x', 'y', 'z'] if self.dimensions == 3 else ['x', 'y'])
-    for component in components:
-      center = getattr(self.mass_center, component)
-      s = center + ratio * (self.gather_coordinate(component) - center)
-      self.broadcast_coordinate(s, component)
+    dim = self.coordinates.shape[1]
+    center = numpy.array([self.mass_center.x, self.mass_center.y,
+                          self.mass_center.z][:dim], dtype=numpy.float64)
+    self.coordinates -= center
+    self.coordinates *= ratio
+    self.coordinates += center
 
   def keep_inside(self, ds):
     """
@@ -307,12 +396,30 @@ class Geometry(object):
     y_min, y_max = y_body.min(), y_body.max()
     x_grid = numpy.arange(x_min, x_max, ds)
     y_grid = numpy.arange(y_min, y_max, ds)
-    points = []
-    for x in x_grid:
-      for y in y_grid:
-        if self.point_inside(x, y):
-          points.append(Point(x, y))
-    self.points = points
+    mask = self.get_mask(x_grid, y_grid)
+    # points ordered by x, then by y
+    i, j = numpy.nonzero(mask.T)
+    self.set_coordinates(numpy.column_stack((x_grid[i], y_grid[j])),
+                         initial=False)
+
+  def get_mask(self, x, y):
+    """
+    Returns the nodes of a Cartesian grid located inside the geometry
+    (closed polygon defined by the x- and y-coordinates of the points).
+
+    Parameters
+    ----------
+    x, y: numpy 1D arrays of floats
+      Stations of the grid in the x- and y-directions.
+
+    Returns
+    -------
+    mask: numpy 2D array of booleans
+      'True' for nodes inside the geometry (y-axis first, x-axis last).
+    """
+    return get_inside_mask(self.gather_coordinate('x'),
+                           self.gather_coordinate('y'),
+                           x, y)
 
   def point_inside(self, x, y):
     """
@@ -328,25 +435,9 @@ class Geometry(object):
     inside: boolean
       'True' if point inside polygon.
     """
-    inside = False
-    start = self.points[0]
-    tol = 1.0E-06
-    n = len(self.points)
-    for i in range(n + 1):
-      point = self.points[i % n]
-      if y > min(start.y, point.y) and y <= max(start.y, point.y):
-        if x <= max(start.x, point.x):
-          if abs(point.y - start.y) > tol:
-            x_inters = ((y - start.y)
-                        * (point.x - start.x)
-                        / (point.y - start.y)
-                        + start.x)
-          if abs(point.x - start.x) <= tol or x <= x_inters:
-            inside = not inside
-      start = point
-    return inside
-
-  def write(self, file_path=None):
+    return bool(self.get_mask(numpy.array([x]), numpy.array([y]))[0, 0])
+
+  def write(self, file_path=None, fmt='ascii'):
     """
     Writes the coordinates into a file.
 
@@ -355,21 +446,171 @@ class Geometry(object):
     file_path: string, optional
       Path of the output file;
       default: None (will be set to '<cwd>/new_body').
+    fmt: string, optional
+      Format of the file (see the function `write_coordinates`);
+      choices: 'ascii', 'binary';
+      default: 'ascii'.
     """
     print('\nWrite coordinates into file: {}'.format(file_path))
-    x = self.gather_coordinate('x')
-    y = self.gather_coordinate('y')
-    if self.dimensions == 2:
-      coords = numpy.c_[x, y]
-    elif self.dimensions == 3:
-      z = self.gather_coordinate('z')
-      coords = numpy.c_[x, y, z]
     if not file_path:
       file_path = os.path.join(os.getcwd(), 'new_body')
-    with open(file_path, 'w') as outfile:
-      outfile.write('{}\n'.format(x.size))
-    with open(file_path, 'ab') as outfile:
-      numpy.savetxt(outfile, coords, fmt='%.6f', delimiter='\t')
+    write_coordinates(file_path, self.coordinates, fmt=fmt)
+
+  def iterate_kinematics(self, displacements=None,
+                         roll=0.0, yaw=0.0, pitch=0.0,
+                         mode='deg',
+                         center=None,
+                         times=None,
+                         motion=None,
+                         position='initial',
+                         chunk_size=64):
+    """
+    Yields the positions of the rigid body at several time instants,
+    by chunks of instants (the positions of all instants are never stored
+    at once).
+
+    The body (at its reference position) is rotated about the center, then
+    translated. Each chunk is computed with batched rotation matrices.
+
+    Parameters
+    ----------
+    displacements: numpy 2D array of floats, optional
+      Displacement at each instant (one row per instant, one column per
+      direction);
+      default: None (no translation).
+    roll, yaw, pitch: floats or numpy 1D arrays of floats, optional
+      Angles of rotation at each instant;
+      default: 0.0, 0.0, 0.0.
+    mode: string, optional
+      Angles in degrees ('deg') or radians ('rad');
+      choices: 'deg', 'rad';
+      default: 'deg'.
+    center: tuple of floats, optional
+      Center of rotation;
+      default: None (mass center of the reference position).
+    times: numpy 1D array of floats, optional
+      Time instants (required with a prescribed motion);
+      default: None.
+    motion: function, optional
+      Prescribed motion called as `motion(times)` that returns a dictionary
+      with the arrays 'displacements', 'roll', 'yaw', and/or 'pitch' (they
+      replace the arguments of the same name);
+      default: None.
+    position: string, optional
+      Reference position of the body ('initial' or 'current');
+      default: 'initial'.
+    chunk_size: integer, optional
+      Number of instants computed at once;
+      default: 64.
+
+    Yields
+    ------
+    start: integer
+      Index of the first instant of the chunk.
+    positions: numpy 3D array of floats
+      Coordinates of the points at each instant of the chunk
+      (instants, points, directions).
+    """
+    reference = (self.coordinates_initial if position == 'initial'
+                 else self.coordinates)
+    dim = reference.shape[1]
+    if motion is not None:
+      prescribed = motion(numpy.asarray(times, dtype=numpy.float64))
+      displacements = prescribed.get('displacements', displacements)
+      roll = prescribed.get('roll', roll)
+      yaw = prescribed.get('yaw', yaw)
+      pitch = prescribed.get('pitch', pitch)
+    arrays = [numpy.atleast_1d(numpy.asarray(angle, dtype=numpy.float64))
+              for angle in (roll, yaw, pitch)]
+    if displacements is not None:
+      displacements = numpy.asarray(displacements, dtype=numpy.float64)
+      displacements = displacements.reshape(-1, displacements.shape[-1])
+      arrays.append(displacements[:, 0])
+    n_times = max(array.size for array in arrays)
+    if times is not None:
+      n_times = max(n_times, len(times))
+    roll, yaw, pitch = [numpy.broadcast_to(angle, (n_times,))
+                        for angle in arrays[:3]]
+    if center is None:
+      center = reference.mean(axis=0)
+    center = numpy.asarray(center, dtype=numpy.float64)[:dim]
+    # relative coordinates stored by direction (contiguous rows)
+    relative = numpy.ascontiguousarray((reference - center).T)
+    if displacements is not None:
+      displacements = numpy.broadcast_to(displacements[:, :dim],
+                                         (n_times, dim))
+    for start in range(0, n_times, chunk_size):
+      end = min(start + chunk_size, n_times)
+      R = get_rotation_matrices(roll=roll[start:end], yaw=yaw[start:end],
+                                pitch=pitch[start:end], mode=mode,
+                                dimensions=dim)
+      offsets = numpy.tile(center, (end - start, 1))
+      if displacements is not None:
+        offsets += displacements[start:end]
+      positions = numpy.matmul(R, relative)
+      positions += offsets[:, :, numpy.newaxis]
+      positions = numpy.ascontiguousarray(numpy.swapaxes(positions, 1, 2))
+      yield start, positions
+
+  def get_kinematics(self, **kwargs):
+    """
+    Returns the positions of the rigid body at several time instants.
+
+    Parameters
+    ----------
+    **kwargs: dictionary
+      Keyword-arguments passed to the method `iterate_kinematics`.
+
+    Returns
+    -------
+    positions: numpy 3D array of floats
+      Coordinates of the points at each instant
+      (instants, points, directions).
+    """
+    return numpy.concatenate([positions for _, positions
+                              in self.iterate_kinematics(**kwargs)])
+
+  def write_kinematics(self, directory, file_name='body{:0>7}.txt',
+                       indices=None, fmt='ascii', **kwargs):
+    """
+    Writes the positions of the rigid body at several time instants into
+    one file per instant (same format as the method `write`), chunk by
+    chunk.
+
+    Parameters
+    ----------
+    directory: string
+      Directory of the files (created if necessary).
+    file_name: string, optional
+      Name of the files, formatted with the index of the instant;
+      default: 'body{:0>7}.txt'.
+    indices: list of integers, optional
+      Index used in the name of each file (e.g. the time-steps);
+      default: None (0, 1, 2, ...).
+    fmt: string, optional
+      Format of the files (see the function `write_coordinates`);
+      choices: 'ascii', 'binary';
+      default: 'ascii'.
+    **kwargs: dictionary
+      Keyword-arguments passed to the method `iterate_kinematics`.
+
+    Returns
+    -------
+    file_paths: list of strings
+      Paths of the files written.
+    """
+    print('\nWrite the kinematics of the geometry into {} ...'
+          ''.format(directory))
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    file_paths = []
+    for start, positions in self.iterate_kinematics(**kwargs):
+      for i, coordinates in enumerate(positions, start):
+        index = i if indices is None else indices[i]
+        file_path = os.path.join(directory, file_name.format(index))
+        write_coordinates(file_path, coordinates, fmt=fmt)
+        file_paths.append(file_path)
+    return file_paths
 
 
 class Geometry2d(Geometry):
@@ -378,7 +619,8 @@ class Geometry2d(Geometry):
   """
   dimensions = 2
 
-  def __init__(self, points=None, file_path=None, skiprows=0):
+  def __init__(self, points=None, file_path=None, skiprows=0,
+               coordinates=None):
     """
     Initializes the geometry.
 
@@ -393,11 +635,15 @@ class Geometry2d(Geometry):
     skiprows: integer, optional
       The number of rows to skip at the beginning of the file;
       default: 0.
+    coordinates: numpy 2D array of floats, optional
+      Coordinates of the points (one row per point);
+      default: None.
     """
     Geometry.__init__(self,
                       points=points,
                       file_path=file_path,
-                      skiprows=skiprows)
+                      skiprows=skiprows,
+                      coordinates=coordinates)
 
   def perimeter(self):
     """
@@ -412,7 +658,8 @@ class Geometry2d(Geometry):
     x, y = numpy.append(x, x[0]), numpy.append(y, y[0])
     return numpy.sum(numpy.sqrt((x[1:] - x[:-1])**2 + (y[1:] - y[:-1])**2))
 
-  def extrusion(self, limits=[-0.5, 0.5], n=None, ds=None, force=False):
+  def extrusion(self, limits=[-0.5, 0.5], n=None, ds=None, force=False,
+                file_path=None, fmt='ascii'):
     """
     Extrudes the two-dimensional geometry in the z-direction.
 
@@ -430,6 +677,13 @@ class Geometry2d(Geometry):
     force: boolean, optional
       Forces the extrusion to the limits prescribed;
       default: False.
+    file_path: string, optional
+      Path of the file where to write the coordinates of the extruded body;
+      default: None (no file written).
+    fmt: string, optional
+      Format of the file (see the function `write_coordinates`);
+      choices: 'ascii', 'binary';
+      default: 'ascii'.
 
     Returns
     -------
@@ -450,13 +704,21 @@ class Geometry2d(Geometry):
       z = numpy.linspace(z_start, z_end, n + 1)
     else:
       z = numpy.linspace(z_start + s * 0.5 * ds, z_end - s * 0.5 * ds, n)
-    points = sum(([Point(point.x, point.y, z)
-                   for point in self.points] for z in z), [])
-    return Geometry3d(points)
+    # layers of the outline, from the first to the last z-station
+    n_points = self.coordinates.shape[0]
+    coordinates = numpy.empty((z.size * n_points, 3))
+    coordinates[:, :2] = numpy.tile(self.coordinates[:, :2], (z.size, 1))
+    coordinates[:, 2] = numpy.repeat(z, n_points)
+    geometry = Geometry3d(coordinates=coordinates)
+    if file_path:
+      geometry.write(file_path=file_path, fmt=fmt)
+    return geometry
 
-  def discretization(self, n=None, ds=None, tolerance=1.0E-06):
+  def discretization(self, n=None, ds=None, tolerance=1.0E-06,
+                     curvature_weight=0.0):
     """
-    Discretizes the geometry.
+    Discretizes the geometry: resamples the closed outline with points
+    equally spaced in arc-length (starting from the first point).
 
     Parameters
     ----------
@@ -467,58 +729,22 @@ class Geometry2d(Geometry):
       Desired segment-length;
       default: None.
     tolerance: float, optional
-      Desired tolerance for discretization;
+      Segments shorter than the tolerance (duplicated points) are ignored;
       default: 1.0E-06.
+    curvature_weight: float, optional
+      Refines the discretization where the outline is curved: the local
+      spacing is proportional to 1 / (1 + curvature_weight * |curvature|);
+      default: 0.0 (uniform spacing).
     """
     if not (n or ds):
       return
     print('\nDiscretize the geometry ...')
     if not n:
       n = int(math.ceil(self.perimeter() / ds))
-    ds = self.perimeter() / n
-    # store initial points
-    points_old = copy.deepcopy(self.points) + [self.points[0]]
-    last = len(points_old) - 1
-    # initialize new list of points
-    self.points = [points_old[0]]
-    # compute new points
-    next = 1
-    for i in range(1, n):
-      start = self.points[-1]
-      end = points_old[next]
-      distance = start.distance(end)
-      # copy
-      if abs(ds - distance) <= tolerance:
-        self.points.append(end)
-        next += 1
-      # interpolation
-      elif ds < distance:
-        length = start.distance(end)
-        start, end = start.as_array(), end.as_array()
-        new = start + ds / length * (end - start)
-        self.points.append(Point(*new))
-      # projection
-      else:
-        # get segment index
-        while distance < ds and next < last:
-          next += 1
-          distance = start.distance(points_old[next])
-        # gather coordinates as array
-        previous, end = (points_old[next - 1].as_array(),
-                         points_old[next].as_array())
-        # interpolate on segment
-        precision = 1
-        coeff = 0.0
-        while abs(ds - distance) > tolerance:
-          new = previous + coeff * (end - previous)
-          distance = start.distance(Point(*new))
-          if distance > ds:
-            coeff -= 0.1**precision
-            precision += 1
-          coeff += 0.1**precision
-        # check point not too close from first point before adding
-        if self.points[0].distance(Point(*new)) > 0.5 * ds:
-          self.points.append(Point(*new))
+    coordinates = resample_closed_curve(self.coordinates, n,
+                                        curvature_weight=curvature_weight,
+                                        tolerance=tolerance)
+    self.set_coordinates(coordinates, initial=False)
 
   def plot(self, style=None):
     """
@@ -548,7 +774,7 @@ class Geometry2d(Geometry):
     y = self.gather_coordinate('y')
     x_init = self.gather_coordinate('x', position='initial')
     y_init = self.gather_coordinate('y', position='initial')
-    if len(self.points) == len(self.points_initial):
+    if self.coordinates.shape == self.coordinates_initial.shape:
       same = (numpy.allclose(x, x_init, rtol=1.0E-06) and
               numpy.allclose(y, y_init, rtol=1.0E-06))
     else:
@@ -611,8 +837,7 @@ class Line(Geometry2d):
       self.n = int(math.ceil(self.length / self.ds))
     x = self.start.x + numpy.linspace(0.0, self.length, self.n + 1)
     y = self.start.y * numpy.ones(self.n + 1)
-    self.points = [Point(x[i], y[i]) for i in range(self.n + 1)]
-    self.points_initial = copy.deepcopy(self.points)
+    self.set_coordinates(numpy.column_stack((x, y)))
 
 
 class Circle(Geometry2d):
@@ -658,8 +883,7 @@ class Circle(Geometry2d):
     theta = numpy.linspace(0.0, 2.0 * math.pi, self.n + 1)
     x = self.center.x + self.radius * numpy.cos(theta)[:-1]
     y = self.center.y + self.radius * numpy.sin(theta)[:-1]
-    self.points = [Point(x[i], y[i]) for i in range(x.size)]
-    self.points_initial = copy.deepcopy(self.points)
+    self.set_coordinates(numpy.column_stack((x, y)))
 
 
 class Rectangle(Geometry2d):
@@ -709,24 +933,25 @@ class Rectangle(Geometry2d):
     elif not (self.ds or (self.nx and self.ny)):
       raise ValueError('ds is set to None '
                        'while nx and/or ny are set to None')
-    self.points = []
     # bottom
     x_bottom = numpy.linspace(self.bottom_left.x, self.top_right.x,
                               self.nx + 1)[:-1]
-    self.points += [Point(x, self.bottom_left.y) for x in x_bottom]
+    y_bottom = numpy.full(self.nx, self.bottom_left.y)
     # right
     y_right = numpy.linspace(self.bottom_left.y, self.top_right.y,
                              self.ny + 1)[:-1]
-    self.points += [Point(self.top_right.x, y) for y in y_right]
+    x_right = numpy.full(self.ny, self.top_right.x)
     # top
     x_top = numpy.linspace(self.top_right.x, self.bottom_left.x,
                            self.nx + 1)[:-1]
-    self.points += [Point(x, self.top_right.y) for x in x_top]
+    y_top = numpy.full(self.nx, self.top_right.y)
     # left
     y_left = numpy.linspace(self.top_right.y, self.bottom_left.y,
                             self.ny + 1)[:-1]
-    self.points += [Point(self.bottom_left.x, y) for y in y_left]
-    self.points_initial = copy.deepcopy(self.points)
+    x_left = numpy.full(self.ny, self.bottom_left.x)
+    self.set_coordinates(numpy.column_stack(
+        (numpy.concatenate((x_bottom, x_right, x_top, x_left)),
+         numpy.concatenate((y_bottom, y_right, y_top, y_left)))))
 
 
 class Geometry3d(Geometry):
@@ -735,7 +960,8 @@ class Geometry3d(Geometry):
   """
   dimensions = 3
 
-  def __init__(self, points=None, file_path=None, skiprows=0):
+  def __init__(self, points=None, file_path=None, skiprows=0,
+               coordinates=None):
     """
     Initializes the three-dimensional geometry with points.
 
@@ -750,11 +976,15 @@ class Geometry3d(Geometry):
     skiprows: integer, optional
       The number of rows to skip at the beginning of the file;
       default: 0.
+    coordinates: numpy 2D array of floats, optional
+      Coordinates of the points (one row per point);
+      default: None.
     """
     Geometry.__init__(self,
                       points=points,
                       file_path=file_path,
-                      skiprows=skiprows)
+                      skiprows=skiprows,
+                      coordinates=coordinates)
 
   def plot(self):
     """
@@ -828,22 +1058,261 @@ class Sphere(Geometry3d):
     n_phi = int(math.ceil(math.pi * self.radius / self.ds))
     phi = numpy.linspace(0.0, math.pi, n_phi)[1:-1]
     # north pole
-    x = self.center.x
-    y = self.center.y
-    z = self.center.z + self.radius
+    x = [numpy.array([self.center.x])]
+    y = [numpy.array([self.center.y])]
+    z = [numpy.array([self.center.z + self.radius])]
     # between poles
     for phi in phi:
       rsinphi = self.radius * math.sin(phi)
       rcosphi = self.radius * math.cos(phi)
       n_theta = int(math.ceil(2.0 * math.pi * rsinphi / self.ds))
       theta = numpy.linspace(0.0, 2.0 * math.pi, n_theta + 1)[:-1]
-      x = numpy.append(x, self.center.x + rsinphi * numpy.cos(theta))
-      y = numpy.append(y, self.center.y + rsinphi * numpy.sin(theta))
-      z = numpy.append(z, self.center.z + rcosphi * numpy.ones(n_theta))
+      x.append(self.center.x + rsinphi * numpy.cos(theta))
+      y.append(self.center.y + rsinphi * numpy.sin(theta))
+      z.append(self.center.z + rcosphi * numpy.ones(n_theta))
     # south pole
-    x = numpy.append(x, self.center.x)
-    y = numpy.append(y, self.center.y)
-    z = numpy.append(z, self.center.z - self.radius)
+    x.append(numpy.array([self.center.x]))
+    y.append(numpy.array([self.center.y]))
+    z.append(numpy.array([self.center.z - self.radius]))
     # create points
-    self.points = [Point(x[i], y[i], z[i]) for i in range(x.size)]
-    self.points_initial = copy.deepcopy(self.points)
+    x, y, z = numpy.concatenate(x), numpy.concatenate(y), numpy.concatenate(z)
+    self.set_coordinates(numpy.column_stack((x, y, z)))
+
+
+def get_inside_mask(x_polygon, y_polygon, x, y):
+  """
+  Returns the nodes of a Cartesian grid located inside a closed polygon
+  (crossing-number rule, evaluated scanline by scanline).
+
+  Each edge is only intersected with the rows of the grid it spans (binary
+  search in the sorted y-stations), so that the work scales with the number
+  of crossings rather than with the number of nodes times the number of
+  edges. A crossing toggles the parity of the nodes of its row located on
+  its left; the parities are accumulated along each row.
+
+  Parameters
+  ----------
+  x_polygon, y_polygon: numpy 1D arrays of floats
+    Coordinates of the vertices of the polygon (the last vertex is connected
+    to the first one).
+  x, y: numpy 1D arrays of floats
+    Sorted stations of the grid in the x- and y-directions.
+
+  Returns
+  -------
+  mask: numpy 2D array of booleans
+    'True' for nodes inside the polygon (y-axis first, x-axis last).
+  """
+  x_polygon = numpy.asarray(x_polygon, dtype=numpy.float64)
+  y_polygon = numpy.asarray(y_polygon, dtype=numpy.float64)
+  x, y = numpy.asarray(x), numpy.asarray(y)
+  x_start, x_end = x_polygon, numpy.roll(x_polygon, -1)
+  y_start, y_end = y_polygon, numpy.roll(y_polygon, -1)
+  # horizontal edges never cross a row
+  keep = y_start != y_end
+  x_start, x_end = x_start[keep], x_end[keep]
+  y_start, y_end = y_start[keep], y_end[keep]
+  # rows crossed by each edge: min(y) < y_row <= max(y)
+  first = numpy.searchsorted(y, numpy.minimum(y_start, y_end), side='right')
+  last = numpy.searchsorted(y, numpy.maximum(y_start, y_end), side='right')
+  counts = last - first
+  n_crossings = counts.sum()
+  edges = numpy.repeat(numpy.arange(counts.size), counts)
+  offsets = numpy.cumsum(counts) - counts
+  rows = first[edges] + numpy.arange(n_crossings) - offsets[edges]
+  x_crossings = (x_start[edges]
+                 + (y[rows] - y_start[edges])
+                 * (x_end[edges] - x_start[edges])
+                 / (y_end[edges] - y_start[edges]))
+  # a crossing toggles the nodes of its row such that x <= x_crossing
+  columns = numpy.searchsorted(x, x_crossings, side='right')
+  parities = numpy.bincount(rows * (x.size + 1) + columns,
+                            minlength=y.size * (x.size + 1))
+  parities = (parities.reshape(y.size, x.size + 1) & 1).astype(numpy.uint8)
+  # number of crossings on the right of each node (modulo 2)
+  parities = numpy.cumsum(parities[:, :0:-1], axis=1,
+                          dtype=numpy.uint8)[:, ::-1]
+  return (parities & 1).astype(bool)
+
+
+def get_rotation_matrix(roll=0.0, yaw=0.0, pitch=0.0, mode='deg',
+                        dimensions=3):
+  """
+  Returns the matrix of an intrinsic rotation (pitch about z, then yaw
+  about y, then roll about x applied to the point: R = Rz Ry Rx).
+
+  Parameters
+  ----------
+  roll, yaw, pitch: floats, optional
+    Angles of rotation;
+    default: 0.0, 0.0, 0.0.
+  mode: string, optional
+    Angles in degrees ('deg') or radians ('rad');
+    choices: 'deg', 'rad';
+    default: 'deg'.
+  dimensions: integer, optional
+    Number of dimensions (in 2D, only the pitch is used);
+    default: 3.
+
+  Returns
+  -------
+  R: numpy 2D array of floats
+    The rotation matrix.
+  """
+  if mode == 'deg':
+    roll *= math.pi / 180.0
+    yaw *= math.pi / 180.0
+    pitch *= math.pi / 180.0
+  Rz = numpy.array([[math.cos(pitch), -math.sin(pitch), 0.0],
+                    [math.sin(pitch), math.cos(pitch), 0.0],
+                    [0.0, 0.0, 1.0]])
+  if dimensions == 2:
+    return Rz[:2, :2]
+  Ry = numpy.array([[math.cos(yaw), 0.0, math.sin(yaw)],
+                    [0.0, 1.0, 0.0],
+                    [-math.sin(yaw), 0.0, math.cos(yaw)]])
+  Rx = numpy.array([[1.0, 0.0, 0.0],
+                    [0.0, math.cos(roll), -math.sin(roll)],
+                    [0.0, math.sin(roll), math.cos(roll)]])
+  return Rz.dot(Ry.dot(Rx))
+
+
+def resample_closed_curve(coordinates, n, curvature_weight=0.0,
+                          tolerance=1.0E-06):
+  """
+  Resamples a closed curve (polyline) with points equally spaced in
+  arc-length, or refined where the curve is curved.
+
+  The cumulative arc-length of the vertices is computed once; the new points
+  are located on the segments with a binary search and linearly interpolated.
+
+  Parameters
+  ----------
+  coordinates: numpy 2D array of floats
+    Coordinates of the vertices (one row per vertex); the last vertex is
+    connected to the first one.
+  n: integer
+    Number of points of the resampled curve.
+  curvature_weight: float, optional
+    The local spacing is proportional to
+    1 / (1 + curvature_weight * |curvature|);
+    default: 0.0 (uniform spacing: the points are exactly perimeter / n
+    apart along the curve).
+  tolerance: float, optional
+    Segments shorter than the tolerance are ignored;
+    default: 1.0E-06.
+
+  Returns
+  -------
+  resampled: numpy 2D array of floats
+    Coordinates of the new points (the first point is the first vertex).
+  """
+  coordinates = numpy.asarray(coordinates, dtype=numpy.float64)
+  closed = numpy.vstack((coordinates, coordinates[:1]))
+  lengths = numpy.sqrt(numpy.sum(numpy.diff(closed, axis=0)**2, axis=1))
+  keep = lengths > tolerance
+  if not numpy.any(keep):
+    raise ValueError('the curve has no segment longer than the tolerance')
+  starts, lengths = closed[:-1][keep], lengths[keep]
+  vectors = numpy.diff(numpy.vstack((starts, starts[:1])), axis=0)
+  # weighted length of each segment
+  weights = lengths
+  if curvature_weight:
+    # curvature at the vertices: turning angle over the mean adjacent length
+    previous = numpy.roll(vectors, 1, axis=0)
+    cosines = (numpy.sum(previous * vectors, axis=1)
+               / (numpy.roll(lengths, 1) * lengths))
+    angles = numpy.arccos(numpy.clip(cosines, -1.0, 1.0))
+    curvatures = angles / (0.5 * (numpy.roll(lengths, 1) + lengths))
+    # average curvature of each segment
+    curvatures = 0.5 * (curvatures + numpy.roll(curvatures, -1))
+    weights = lengths * (1.0 + curvature_weight * curvatures)
+  cumulative = numpy.concatenate(([0.0], numpy.cumsum(weights)))
+  targets = numpy.arange(n) * (cumulative[-1] / n)
+  indices = numpy.searchsorted(cumulative, targets, side='right') - 1
+  indices = numpy.clip(indices, 0, weights.size - 1)
+  fractions = (targets - cumulative[indices]) / weights[indices]
+  return starts[indices] + fractions[:, numpy.newaxis] * vectors[indices]
+
+
+def get_rotation_matrices(roll=0.0, yaw=0.0, pitch=0.0, mode='deg',
+                          dimensions=3):
+  """
+  Returns the matrices of intrinsic rotations (R = Rz Ry Rx, as
+  `get_rotation_matrix`) for arrays of angles.
+
+  Parameters
+  ----------
+  roll, yaw, pitch: floats or numpy 1D arrays of floats, optional
+    Angles of rotation;
+    default: 0.0, 0.0, 0.0.
+  mode: string, optional
+    Angles in degrees ('deg') or radians ('rad');
+    choices: 'deg', 'rad';
+    default: 'deg'.
+  dimensions: integer, optional
+    Number of dimensions (in 2D, only the pitch is used);
+    default: 3.
+
+  Returns
+  -------
+  R: numpy 3D array of floats
+    The rotation matrices (one per set of angles).
+  """
+  roll, yaw, pitch = numpy.broadcast_arrays(*[numpy.atleast_1d(angle)
+                                              .astype(numpy.float64)
+                                              for angle in (roll, yaw, pitch)])
+  if mode == 'deg':
+    roll, yaw, pitch = [numpy.radians(angle) for angle in (roll, yaw, pitch)]
+  cz, sz = numpy.cos(pitch), numpy.sin(pitch)
+  if dimensions == 2:
+    return numpy.stack([numpy.stack([cz, -sz], axis=-1),
+                        numpy.stack([sz, cz], axis=-1)], axis=-2)
+  cy, sy = numpy.cos(yaw), numpy.sin(yaw)
+  cx, sx = numpy.cos(roll), numpy.sin(roll)
+  return numpy.stack([
+      numpy.stack([cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx],
+                  axis=-1),
+      numpy.stack([sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx],
+                  axis=-1),
+      numpy.stack([-sy, cy * sx, cy * cx], axis=-1)], axis=-2)
+
+
+def write_coordinates(file_path, coordinates, fmt='ascii',
+                      block_size=100000):
+  """
+  Writes coordinates into a body file.
+
+  ASCII files contain the number of points on the first line, then one point
+  per line (tab-separated, 6 decimals); binary files are PETSc Vec files
+  (big-endian doubles, coordinates of each point stored contiguously).
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the file.
+  coordinates: numpy 2D array of floats
+    Coordinates of the points (one row per point).
+  fmt: string, optional
+    Format of the file;
+    choices: 'ascii', 'binary';
+    default: 'ascii'.
+  block_size: integer, optional
+    Number of points formatted at once (ASCII);
+    default: 100000.
+  """
+  coordinates = numpy.asarray(coordinates)
+  if fmt == 'binary':
+    write_vec(file_path, coordinates)
+    return
+  elif fmt != 'ascii':
+    raise ValueError('unknown format: {}'.format(fmt))
+  n, dim = coordinates.shape
+  # one formatting operation per block of points (as numpy.savetxt with
+  # fmt='%.6f' and delimiter='\t', without the loop over the rows)
+  row = '\t'.join(['%.6f'] * dim) + '\n'
+  with open(file_path, 'w') as outfile:
+    outfile.write('{}\n'.format(n))
+    for start in range(0, n, block_size):
+      block = coordinates[start:start + block_size]
+      outfile.write((row * block.shape[0]) % tuple(block.ravel().tolist()))
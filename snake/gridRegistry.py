@@ -0,0 +1,155 @@
+"""
+Implementation of the class `GridRegistry`, a cache of the index maps
+between the gridlines of different grids.
+"""
+
+import collections
+
+import numpy
+
+
+class GridRegistry(object):
+  """
+  Registers gridlines (arrays of stations) by fingerprint and caches the
+  indices of the stations a fine gridline shares with a coarser one.
+
+  A registry shared by the functions of a grid-convergence study computes
+  each index map once, whatever the number of fields and norms.
+  The fingerprint of an array is remembered: station arrays should not be
+  modified in place once registered.
+  """
+
+  def __init__(self, max_size=None):
+    """
+    Initializes an empty registry.
+
+    Parameters
+    ----------
+    max_size: integer, optional
+      Maximum number of index maps kept (the least-recently-used is dropped;
+      twice as many fingerprints are kept);
+      default: None (no limit).
+    """
+    self.max_size = max_size
+    self.fingerprints = collections.OrderedDict()
+    self.indices = collections.OrderedDict()
+    self.n_hits, self.n_misses = 0, 0
+
+  def get_fingerprint(self, stations):
+    """
+    Returns the fingerprint of a gridline.
+    The fingerprint of an array is computed once and remembered.
+
+    Parameters
+    ----------
+    stations: numpy 1D array of floats
+      Stations along the gridline.
+
+    Returns
+    -------
+    fingerprint: tuple
+      Number of stations and hash of their values.
+    """
+    key = id(stations)
+    if key in self.fingerprints:
+      array, fingerprint = self.fingerprints[key]
+      if array is stations:
+        return fingerprint
+    fingerprint = (stations.size, hash(numpy.ascontiguousarray(stations)
+                                       .tobytes()))
+    # the array is kept alive so that its id is not reused
+    self.fingerprints[key] = (stations, fingerprint)
+    if (self.max_size is not None and
+        len(self.fingerprints) > 2 * self.max_size):
+      self.fingerprints.popitem(last=False)
+    return fingerprint
+
+  def get_indices(self, fine, coarse, atol=1.0E-12):
+    """
+    Returns the indices of the stations of a fine gridline that are shared
+    with a coarse gridline (computed once per pair of gridlines).
+
+    Parameters
+    ----------
+    fine: numpy 1D array of floats
+      Stations of the fine gridline.
+    coarse: numpy 1D array of floats
+      Stations of the coarse gridline.
+    atol: float, optional
+      Absolute tolerance used to define shared stations;
+      default: 1.0E-12.
+
+    Returns
+    -------
+    indices: slice object or numpy 1D array of integers
+      Indices of the shared stations in the fine gridline.
+    """
+    key = (self.get_fingerprint(fine), self.get_fingerprint(coarse), atol)
+    if key in self.indices:
+      self.n_hits += 1
+      indices = self.indices.pop(key)
+    else:
+      self.n_misses += 1
+      indices = get_restriction_indices(fine, coarse, atol=atol)
+    self.indices[key] = indices
+    if self.max_size is not None and len(self.indices) > self.max_size:
+      self.indices.popitem(last=False)
+    return indices
+
+  def clear(self):
+    """
+    Removes all fingerprints and index maps.
+    """
+    self.fingerprints.clear()
+    self.indices.clear()
+    self.n_hits, self.n_misses = 0, 0
+
+
+def get_restriction_indices(fine, coarse, atol=1.0E-12):
+  """
+  Returns the indices of the stations of a fine gridline that are shared with
+  a coarser gridline.
+
+  The coarse stations are located among the (sorted) fine stations with a
+  binary search.
+
+  Parameters
+  ----------
+  fine: numpy 1D array of floats
+    Stations of the fine gridline.
+  coarse: numpy 1D array of floats
+    Stations of the coarse gridline.
+  atol: float, optional
+    Absolute tolerance used to define shared stations;
+    default: 1.0E-12.
+
+  Returns
+  -------
+  indices: slice object or numpy 1D array of integers
+    Indices of the shared stations in the fine gridline; a slice when they
+    are evenly spaced.
+  """
+  order = None
+  if numpy.any(fine[1:] < fine[:-1]):
+    order = numpy.argsort(fine, kind='mergesort')
+    fine = fine[order]
+  # range of fine stations matching each coarse station
+  starts = numpy.searchsorted(fine, coarse - atol, side='left')
+  ends = numpy.searchsorted(fine, coarse + atol, side='right')
+  counts = numpy.zeros(fine.size + 1, dtype=numpy.int64)
+  numpy.add.at(counts, starts, 1)
+  numpy.add.at(counts, ends, -1)
+  mask = (numpy.cumsum(counts[:-1]) > 0)
+  if order is not None:
+    mask[order] = mask.copy()
+  indices = numpy.flatnonzero(mask)
+  if indices.size > 1 and numpy.all(numpy.diff(indices) ==
+                                    indices[1] - indices[0]):
+    indices = slice(indices[0], indices[-1] + 1, indices[1] - indices[0])
+  elif indices.size == 1:
+    indices = slice(indices[0], indices[0] + 1)
+  return indices
+
+
+# registry used when none is provided
+default_registry = GridRegistry(max_size=64)
@@ -7,7 +7,6 @@ import os
 import numpy
 
 from ..simulation import Simulation
-from ..force import Force
 
 
 class IBAMRSimulation(Simulation):
@@ -34,10 +33,15 @@ class IBAMRSimulation(Simulation):
                                           directory=directory,
                                           **kwargs)
 
-  def read_forces(self, file_path=None, labels=None):
+  def read_forces(self, file_path=None, labels=None, cache=False):
     """
     Reads forces from files.
 
+    The file is read incrementally: only the rows written since the previous
+    call are parsed.
+    Optionally, the parsed rows are cached into a .npy file next to the
+    forces file and memory-mapped the next time the (unchanged) file is read.
+
     Parameters
     ----------
     file_path: string, optional
@@ -46,20 +50,22 @@ class IBAMRSimulation(Simulation):
     labels: list of strings, optional
       Label of each force to read;
       default: None.
+    cache: boolean, optional
+      Set 'True' to cache the parsed rows into a .npy file next to the
+      forces file;
+      default: False.
     """
     if not file_path:
       file_path = os.path.join(self.directory,
                                'dataIB',
                                'ib_Drag_force_struct_no_0')
     print('[info] reading forces from {} ...'.format(file_path)),
-    with open(file_path, 'r') as infile:
-      times, force_x, force_y = numpy.loadtxt(infile,
-                                              dtype=float,
-                                              usecols=(0, 4, 5),
-                                              unpack=True)
-    self.forces = []
-    self.forces.append(Force(times, force_x, '$F_x$'))
-    self.forces.append(Force(times, force_y, '$F_y$'))
+    reader = self.get_force_reader(file_path, usecols=(0, 4, 5),
+                                   cache=cache)
+    reader.update()
+    if not labels:
+      labels = ['$F_x$', '$F_y$']  # default labels
+    self.forces = reader.get_forces(labels=labels)
     print('done')
 
   def write_visit_summary_files(self, time_steps):
@@ -0,0 +1,212 @@
+"""
+Implementation of the class `LogReader`, an incremental parser of the log
+files written by OpenFOAM solvers.
+"""
+
+import os
+import re
+import itertools
+
+import numpy
+
+
+# patterns of the lines extracted from the log
+# (a time-step starts with a line "Time = <time>")
+_TIME_SEPARATOR = b'\nTime = '
+_COURANT_PATTERN = re.compile(br'\nCourant Number mean: ([^\s]+) '
+                              br'max: ([^\s]+)')
+_SOLVE_PATTERN = re.compile(br'Solving for (\w+), '
+                            br'Initial residual = ([^,\s]+), '
+                            br'Final residual = ([^,\s]+), '
+                            br'No Iterations (\d+)')
+_EXECUTION_PATTERN = re.compile(br'\nExecutionTime = ([^\s]+) s'
+                                br'\s+ClockTime = ([^\s]+) s')
+
+
+class LogReader(object):
+  """
+  Parses an OpenFOAM log file in a single pass and extracts the time, the
+  mean and maximum Courant numbers, the residuals and number of iterations of
+  each linear solve, and the execution and clock times.
+
+  The reader remembers the byte offset of the last complete line parsed;
+  each update only parses what has been appended to the log since then.
+  """
+
+  def __init__(self, file_path):
+    """
+    Initializes the reader (nothing is read yet).
+
+    Parameters
+    ----------
+    file_path: string
+      Path of the log file.
+    """
+    self.file_path = file_path
+    self.reset()
+
+  def reset(self):
+    """
+    Forgets the data read so far; the next update parses the whole log.
+    """
+    self.offset = 0
+    self.n_time_steps = 0
+    self.data = {'time': [],
+                 'courant-mean': [], 'courant-max': [],
+                 'courant-time-step': [],
+                 'execution-time': [], 'clock-time': []}
+    self.residuals = {}
+
+  def update(self, chunk_size=2**26):
+    """
+    Parses the lines appended to the log since the last update.
+
+    Parameters
+    ----------
+    chunk_size: integer, optional
+      Number of bytes read from the log at once;
+      default: 2**26.
+
+    Returns
+    -------
+    n_new: integer
+      Number of new time-steps.
+    """
+    if os.path.getsize(self.file_path) < self.offset:
+      self.reset()
+    n_time_steps = self.n_time_steps
+    with open(self.file_path, 'rb') as infile:
+      infile.seek(self.offset)
+      pending = b''
+      while True:
+        chunk = infile.read(chunk_size)
+        if not chunk:
+          break
+        chunk = pending + chunk
+        end = chunk.rfind(b'\n') + 1
+        self._parse(chunk[:end])
+        self.offset += end
+        pending = chunk[end:]
+    return self.n_time_steps - n_time_steps
+
+  def _parse(self, chunk):
+    """
+    Extracts the values of the complete lines of a chunk of the log.
+
+    The chunk is split into time-steps; the values matched in the chunk are
+    joined and converted into arrays at once.
+    All values are converted before being stored: a value that is not a
+    number raises a ValueError and leaves the data read so far unchanged.
+    """
+    # every line of the chunk (first one included) starts after a newline
+    chunk = b'\n' + chunk
+    segments = chunk.split(_TIME_SEPARATOR)
+    # the first segment belongs to the ongoing time-step
+    times = to_array([segment[:segment.find(b'\n')]
+                      for segment in segments[1:]])
+    # index of the time-step of each segment (-1 before the first one)
+    segment_time_steps = numpy.arange(self.n_time_steps - 1,
+                                      self.n_time_steps + times.size)
+    courants = [_COURANT_PATTERN.findall(segment) for segment in segments]
+    courant_time_steps = numpy.repeat(segment_time_steps,
+                                      [len(matches) for matches in courants])
+    courants = to_array(itertools.chain.from_iterable(courants), n_columns=2)
+    executions = to_array(_EXECUTION_PATTERN.findall(chunk), n_columns=2)
+    solves = [_SOLVE_PATTERN.findall(segment) for segment in segments]
+    time_steps = numpy.repeat(segment_time_steps,
+                              [len(matches) for matches in solves])
+    solves = list(itertools.chain.from_iterable(solves))
+    fields = numpy.array([solve[0] for solve in solves])
+    values = to_array([solve[1:] for solve in solves], n_columns=3)
+    self.data['time'].append(times)
+    self.data['courant-time-step'].append(courant_time_steps)
+    self.data['courant-mean'].append(courants[:, 0])
+    self.data['courant-max'].append(courants[:, 1])
+    self.data['execution-time'].append(executions[:, 0])
+    self.data['clock-time'].append(executions[:, 1])
+    self.n_time_steps += times.size
+    for field in numpy.unique(fields):
+      name = field.decode('ascii')
+      if name not in self.residuals:
+        self.residuals[name] = {'time-step': [], 'initial': [],
+                                'final': [], 'iterations': []}
+      residuals = self.residuals[name]
+      mask = (fields == field)
+      residuals['time-step'].append(time_steps[mask])
+      residuals['initial'].append(values[mask, 0])
+      residuals['final'].append(values[mask, 1])
+      residuals['iterations'].append(values[mask, 2].astype(numpy.int64))
+
+  def get(self, name):
+    """
+    Returns the values of a quantity extracted from the log.
+
+    Parameters
+    ----------
+    name: string
+      Name of the quantity;
+      choices: 'time', 'courant-mean', 'courant-max', 'courant-time-step'
+      (index of the time-step in which each Courant number is printed, -1
+      before the first one), 'execution-time', 'clock-time'.
+
+    Returns
+    -------
+    values: numpy 1D array
+      The values (one per time-step or per Courant line).
+    """
+    if name == 'courant-time-step':
+      return numpy.concatenate([numpy.empty(0, dtype=numpy.int64)] +
+                               self.data[name])
+    return numpy.concatenate([numpy.empty(0)] + self.data[name])
+
+  def get_residuals(self, field_name):
+    """
+    Returns the residuals and number of iterations of the linear solves of a
+    field.
+
+    Parameters
+    ----------
+    field_name: string
+      Name of the field (e.g. 'Ux', 'p').
+
+    Returns
+    -------
+    residuals: dictionary of (string, numpy 1D array) items
+      Keys: - 'time-step': index of the time-step of each solve;
+            - 'time': time of each solve;
+            - 'initial': initial residual;
+            - 'final': final residual;
+            - 'iterations': number of iterations.
+    """
+    residuals = dict((key, numpy.concatenate(values))
+                     for key, values in self.residuals[field_name].items())
+    # solves before the first time-step get no time (NaN)
+    times = numpy.append(numpy.nan, self.get('time'))
+    residuals['time'] = times[residuals['time-step'] + 1]
+    return residuals
+
+
+def to_array(matches, n_columns=None):
+  """
+  Converts strings matched in a log into an array of floats.
+
+  Parameters
+  ----------
+  matches: list of bytes or list of tuples of bytes
+    The matched strings (a tuple per match if several groups).
+  n_columns: integer, optional
+    Number of groups per match;
+    default: None (a single group, returns a 1D array).
+
+  Returns
+  -------
+  values: numpy 1D or 2D array of floats
+    The values.
+  """
+  if n_columns is not None:
+    matches = map(b' '.join, matches)
+  # raises a ValueError on a token that is not a number
+  values = numpy.array(b' '.join(matches).split(), dtype=numpy.float64)
+  if n_columns is not None:
+    values = values.reshape(-1, n_columns)
+  return values
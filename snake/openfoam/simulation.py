@@ -3,6 +3,7 @@ Implementation of the class `OpenFOAMSimulation`.
 """
 
 import os
+import multiprocessing
 
 import numpy
 from scipy import signal
@@ -10,6 +11,8 @@ from matplotlib import pyplot
 
 from ..simulation import Simulation
 from ..force import Force
+from ..forceReader import ForceHistoryReader
+from .logReader import LogReader
 
 
 class OpenFOAMSimulation(Simulation):
@@ -43,10 +46,21 @@ class OpenFOAMSimulation(Simulation):
                                              'forces'),
                   force_coefficients_folder=os.path.join('postProcessing',
                                                          'forceCoeffs'),
-                  usecols=(0, 2, 3)):
+                  usecols=None,
+                  n_processes=1,
+                  cache=False):
     """
     Reads forces from files.
 
+    Each time-folder (segment written after a restart) is parsed on its own
+    (in parallel); where segments overlap in time, the values of the latest
+    segment are kept.
+    The parentheses of the vector entries are ignored: in a forces file, the
+    columns after the time are the pressure, viscous, and porous forces
+    (x, y, z), followed by the pressure, viscous, and porous moments.
+    Optionally, the parsed rows of each file are cached into a .npy file
+    next to it and memory-mapped the next time the (unchanged) file is read.
+
     Parameters
     ----------
     display_coefficients: boolean, optional
@@ -65,7 +79,17 @@ class OpenFOAMSimulation(Simulation):
       default: 'postProcessing/forceCoeffs'.
     usecols: tuple of integers, optional
       Index of columns to read from file, including the time-column index;
-      default: (0, 2, 3).
+      default: None ((0, 1, 2) for the forces, i.e. the x- and y-components
+      of the pressure force; (0, 2, 3) for the force coefficients, i.e. the
+      drag and lift coefficients).
+    n_processes: integer, optional
+      Number of processes used to parse the segments
+      (None for the number of CPUs);
+      default: 1 (the segments are parsed in the present process).
+    cache: boolean, optional
+      Set 'True' to cache the parsed rows into a .npy file next to each
+      file;
+      default: False.
     """
     if display_coefficients:
       info = {'directory': os.path.join(self.directory,
@@ -74,6 +98,8 @@ class OpenFOAMSimulation(Simulation):
               'description': 'force-coefficients'}
       if not labels:
         labels = ['$C_d$', '$C_l$']
+      if usecols is None:
+        usecols = (0, 2, 3)
     else:
       info = {'directory': os.path.join(self.directory,
                                         forces_folder),
@@ -81,8 +107,9 @@ class OpenFOAMSimulation(Simulation):
               'description': 'forces'}
       if not labels:
         labels = ['$F_x$', '$F_y$']
+      if usecols is None:
+        usecols = (0, 1, 2)
     info['usecols'] = usecols
-    info['labels'] = labels
     # backward compatibility from 2.2.2 to 2.0.1
     if not os.path.isdir(info['directory']):
       info['directory'] = '{}/forces'.format(self.directory)
@@ -90,25 +117,52 @@ class OpenFOAMSimulation(Simulation):
     # end of backward compatibility
     print('[info] reading {} in {} ...'.format(info['description'],
                                                info['directory']))
-    subdirectories = sorted(os.listdir(info['directory']))
-    times = numpy.empty(0)
-    force_x, force_y = numpy.empty(0), numpy.empty(0)
-    for subdirectory in subdirectories:
-      forces_path = os.path.join(info['directory'],
-                                 subdirectory,
-                                 info['file-name'])
-      with open(forces_path, 'r') as infile:
-        t, fx, fy = numpy.loadtxt(infile,
-                                  dtype=float,
-                                  comments='#',
-                                  usecols=info['usecols'],
-                                  unpack=True)
-      times = numpy.append(times, t)
-      force_x, force_y = numpy.append(force_x, fx), numpy.append(force_y, fy)
-    # set Force objects
+    # segments sorted by starting time
+    subdirectories = sorted(os.listdir(info['directory']), key=float)
+    file_paths = [os.path.join(info['directory'], subdirectory,
+                               info['file-name'])
+                  for subdirectory in subdirectories]
+    segments = read_force_segments(file_paths, usecols=info['usecols'],
+                                   n_processes=n_processes, cache=cache)
+    data = merge_force_segments(segments)
+    # the last segment is the one written by a running simulation;
+    # the rows of the earlier segments are kept when following it
+    self.get_force_reader(file_paths[-1], usecols=info['usecols'],
+                          cache=cache, delete_chars='()')
+    self.force_history = data[:data.shape[0] - segments[-1].shape[0]]
+    # set Force objects (default labels for the extra columns)
+    labels = list(labels) + ['column {}'.format(index + 1)
+                             for index in range(len(labels),
+                                                data.shape[1] - 1)]
     self.forces = []
-    self.forces.append(Force(times, force_x, label=labels[0]))
-    self.forces.append(Force(times, force_y, label=labels[1]))
+    for index in range(data.shape[1] - 1):
+      force = Force()
+      force.set(data[:, 0], data[:, index + 1], label=labels[index])
+      self.forces.append(force)
+
+  def read_log(self, file_path):
+    """
+    Parses the log file of the solver (only the lines written since the
+    previous call for the same file).
+
+    Parameters
+    ----------
+    file_path: string
+      Path of the log file.
+
+    Returns
+    -------
+    reader: LogReader object
+      The reader with the time, Courant numbers, residuals, and execution
+      times extracted from the log.
+    """
+    if getattr(self, 'log_readers', None) is None:
+      self.log_readers = {}
+    key = os.path.abspath(file_path)
+    if key not in self.log_readers:
+      self.log_readers[key] = LogReader(file_path)
+    self.log_readers[key].update()
+    return self.log_readers[key]
 
   def read_maximum_cfl(self, file_path):
     """
@@ -125,15 +179,19 @@ class OpenFOAMSimulation(Simulation):
       Contains the discrete time and cfl values.
     """
     print('[info] reading CFL from {} ...'.format(file_path)),
-    with open(file_path, 'r') as infile:
-      times = numpy.array([float(line.split()[-1])
-                           for line in infile if line.startswith('Time = ')])
-    with open(file_path, 'r') as infile:
-      cfl = numpy.array([float(line.split()[-1])
-                         for line in infile
-                         if line.startswith('Courant Number mean')])
-    assert(times.shape == cfl.shape)
-    self.cfl = {'times': times, 'values': cfl}
+    reader = self.read_log(file_path)
+    times, cfl = reader.get('time'), reader.get('courant-max')
+    time_steps = reader.get('courant-time-step')
+    # Courant numbers printed before the first time-step belong to the
+    # time-step that follows them (e.g. pimpleFoam)
+    if time_steps.size > 0 and time_steps[0] < 0:
+      time_steps = time_steps + 1
+    # last Courant number of each time-step whose time has been printed
+    # (the last time-step may be incomplete in the log of a running solver)
+    mask = numpy.append(time_steps[1:] != time_steps[:-1], True)
+    mask = mask[:time_steps.size]
+    mask &= (time_steps >= 0) & (time_steps < times.size)
+    self.cfl = {'times': times[time_steps[mask]], 'values': cfl[mask]}
     print('done')
     return self.cfl
 
@@ -375,3 +433,88 @@ class OpenFOAMSimulation(Simulation):
     script = os.path.join(os.environ['SNAKE'], 'snake', 'openfoam',
                           'plotMesh2dParaView.py')
     os.system('pvbatch {} {}'.format(script, ' '.join(arguments)))
+
+
+def _read_force_segment(arguments):
+  """
+  Reads the rows of a force file (OpenFOAM format).
+  """
+  file_path, usecols, cache = arguments
+  reader = ForceHistoryReader(file_path, usecols=usecols,
+                              cache=cache, delete_chars='()')
+  reader.update()
+  return numpy.array(reader.get_data())
+
+
+def read_force_segments(file_paths, usecols=None, n_processes=1,
+                        cache=False):
+  """
+  Reads force files written by OpenFOAM in parallel.
+
+  Parameters
+  ----------
+  file_paths: list of strings
+    Path of each force file.
+  usecols: tuple of integers, optional
+    Index of columns to read (including the time column), once the
+    parentheses have been removed;
+    default: None (all columns).
+  n_processes: integer, optional
+    Number of processes (None for the number of CPUs);
+    default: 1 (the files are parsed in the present process).
+  cache: boolean, optional
+    Set 'True' to cache the parsed rows into a .npy file next to each file;
+    default: False.
+
+  Returns
+  -------
+  segments: list of numpy 2D arrays of floats
+    Rows read from each file.
+  """
+  arguments = [(file_path, usecols, cache) for file_path in file_paths]
+  if n_processes is None:
+    n_processes = multiprocessing.cpu_count()
+  n_processes = min(n_processes, len(file_paths))
+  if n_processes <= 1:
+    return [_read_force_segment(argument) for argument in arguments]
+  pool = multiprocessing.Pool(processes=n_processes)
+  try:
+    segments = pool.map(_read_force_segment, arguments)
+    pool.close()
+  finally:
+    pool.terminate()
+    pool.join()
+  return segments
+
+
+def merge_force_segments(segments):
+  """
+  Concatenates force segments sorted by starting time into a single array.
+  Where two segments overlap (restart from an earlier time), the rows of the
+  latest segment are kept.
+
+  Parameters
+  ----------
+  segments: list of numpy 2D arrays of floats
+    Rows of each segment (time in the first column).
+
+  Returns
+  -------
+  data: numpy 2D array of floats
+    The merged rows.
+  """
+  segments = [segment for segment in segments if segment.shape[0] > 0]
+  if not segments:
+    return numpy.empty((0, 0))
+  # number of rows of each segment before the start of the next ones
+  n_rows = []
+  next_start = float('inf')
+  for segment in segments[::-1]:
+    n_rows.insert(0, numpy.searchsorted(segment[:, 0], next_start))
+    next_start = min(next_start, segment[0, 0])
+  data = numpy.empty((sum(n_rows), segments[0].shape[1]))
+  start = 0
+  for segment, n in zip(segments, n_rows):
+    data[start:start + n] = segment[:n]
+    start += n
+  return data
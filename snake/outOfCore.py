@@ -0,0 +1,154 @@
+"""
+Implementation of helpers to process 3D fields larger than the memory,
+slab by slab along the z-direction (the first axis of the arrays), from
+memory-mapped inputs into memory-mapped outputs.
+"""
+
+import os
+import glob
+import tempfile
+
+import numpy
+
+
+# suffix of the files created by `open_output`
+SCRATCH_SUFFIX = '.scratch.npy'
+
+
+def get_slab_size(plane_size, n_arrays, memory_limit, halo=0, itemsize=8):
+  """
+  Returns the number of planes per slab so that the slabs of all arrays
+  involved in a computation fit in a given amount of memory.
+
+  Parameters
+  ----------
+  plane_size: integer
+    Number of values in a plane (normal to the z-direction).
+  n_arrays: integer
+    Number of arrays (inputs, outputs, and temporaries) whose slabs are in
+    memory at the same time.
+  memory_limit: integer
+    Maximum number of bytes used by the slabs.
+  halo: integer, optional
+    Number of extra planes needed on each side of a slab;
+    default: 0.
+  itemsize: integer, optional
+    Number of bytes of a value;
+    default: 8.
+
+  Returns
+  -------
+  slab_size: integer
+    Number of planes per slab (at least 1).
+  """
+  plane_bytes = plane_size * n_arrays * itemsize
+  return max(1, int(memory_limit // plane_bytes) - 2 * halo)
+
+
+def iterate_slabs(n_planes, slab_size, halo=0):
+  """
+  Yields the planes of each slab, with and without halo.
+
+  Parameters
+  ----------
+  n_planes: integer
+    Number of planes to process.
+  slab_size: integer
+    Number of planes per slab.
+  halo: integer, optional
+    Number of extra planes on each side of a slab (clipped at the
+    boundaries);
+    default: 0.
+
+  Yields
+  ------
+  start, end: integers
+    Planes of the slab.
+  halo_start, halo_end: integers
+    Planes of the slab extended with its halo.
+  """
+  for start in range(0, n_planes, slab_size):
+    end = min(start + slab_size, n_planes)
+    yield start, end, max(0, start - halo), min(n_planes, end + halo)
+
+
+def open_output(directory, name, shape, dtype=numpy.float64):
+  """
+  Creates a memory-mapped .npy file to store a result computed slab by slab.
+
+  Each call creates a new file (the name is made unique with a random
+  suffix), so that the results returned previously are never overwritten.
+
+  Parameters
+  ----------
+  directory: string
+    Directory of the file (created if necessary).
+  name: string
+    Prefix of the name of the file.
+  shape: tuple of integers
+    Shape of the array.
+  dtype: numpy dtype, optional
+    Type of the values;
+    default: numpy.float64.
+
+  Returns
+  -------
+  values: numpy.memmap
+    The (writable) memory-mapped array.
+  """
+  if not os.path.isdir(directory):
+    os.makedirs(directory)
+  descriptor, file_path = tempfile.mkstemp(prefix=name + '-',
+                                           suffix=SCRATCH_SUFFIX,
+                                           dir=directory)
+  os.close(descriptor)
+  return numpy.lib.format.open_memmap(file_path, mode='w+', dtype=dtype,
+                                      shape=tuple(shape))
+
+
+def close_output(values):
+  """
+  Flushes a memory-mapped result to its file and maps it again in read-only
+  mode (the pages are then backed by the file and can be dropped at any
+  time).
+
+  Parameters
+  ----------
+  values: numpy.memmap
+    The memory-mapped array created by `open_output`.
+
+  Returns
+  -------
+  values: numpy.memmap
+    Read-only view on the file.
+  """
+  values.flush()
+  return numpy.load(values.filename, mmap_mode='r')
+
+
+def remove_outputs(directory):
+  """
+  Removes the files created by `open_output` in a directory (and the
+  directory if it is then empty).
+
+  On POSIX systems, the arrays already mapped remain readable until they are
+  released.
+
+  Parameters
+  ----------
+  directory: string
+    The directory.
+
+  Returns
+  -------
+  n_files: integer
+    Number of files removed.
+  """
+  if not os.path.isdir(directory):
+    return 0
+  file_paths = glob.glob(os.path.join(directory, '*' + SCRATCH_SUFFIX))
+  for file_path in file_paths:
+    os.remove(file_path)
+  if not os.listdir(directory):
+    os.rmdir(directory)
+  return len(file_paths)
@@ -0,0 +1,108 @@
+"""
+Implementation of functions to read and write PETSc Vec objects
+saved in the PETSc binary format.
+
+A PETSc binary Vec file starts with the Vec class identifier and the number
+of entries (both big-endian integers), followed by the entries stored as
+big-endian double-precision floats.
+The reader memory-maps the file and returns a view on the entries;
+the values are not copied until they are modified or used in an operation.
+"""
+
+import os
+
+import numpy
+
+
+VEC_FILE_CLASSID = 1211214
+
+
+def read_vec_header(file_path):
+  """
+  Reads the header of a PETSc binary Vec file.
+
+  PETSc may be configured with 32-bit or 64-bit integers;
+  the size of the integer holding the number of entries is deduced from the
+  size of the file.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the PETSc binary file.
+
+  Returns
+  -------
+  size: integer
+    Number of entries in the Vec.
+  offset: integer
+    Offset (in bytes) of the first entry from the beginning of the file.
+  """
+  file_size = os.path.getsize(file_path)
+  with open(file_path, 'rb') as infile:
+    header = infile.read(12)
+  if len(header) < 8:
+    raise IOError('{} is not a PETSc binary file'.format(file_path))
+  classid = numpy.frombuffer(header[:4], dtype='>i4')[0]
+  if classid != VEC_FILE_CLASSID:
+    raise IOError('{} does not contain a PETSc Vec '
+                  '(class id {})'.format(file_path, classid))
+  candidates = [(int(numpy.frombuffer(header[4:8], dtype='>i4')[0]), 8)]
+  if len(header) == 12:
+    candidates.append((int(numpy.frombuffer(header[4:12], dtype='>i8')[0]),
+                       12))
+  # exact match first (single Vec in file), then Vec followed by other objects
+  for size, offset in candidates:
+    if size >= 0 and offset + 8 * size == file_size:
+      return size, offset
+  for size, offset in candidates:
+    if size >= 0 and offset + 8 * size <= file_size:
+      return size, offset
+  raise IOError('{}: inconsistent PETSc Vec header'.format(file_path))
+
+
+def read_vec(file_path, shape=None, mode='r'):
+  """
+  Memory-maps the entries of a PETSc Vec saved in binary format.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the PETSc binary file.
+  shape: tuple of integers, optional
+    Shape of the array to return (C-order);
+    default: None (1D array).
+  mode: string, optional
+    Mode used to memory-map the file;
+    choices: 'r' (read-only), 'c' (copy-on-write), 'r+' (read-write);
+    default: 'r'.
+
+  Returns
+  -------
+  values: numpy.memmap of big-endian floats
+    View on the entries of the Vec.
+  """
+  size, offset = read_vec_header(file_path)
+  if shape is None:
+    shape = (size,)
+  if numpy.prod(shape) != size:
+    raise ValueError('cannot reshape Vec of size {} read from {} '
+                     'into shape {}'.format(size, file_path, shape))
+  return numpy.memmap(file_path, dtype='>f8', mode=mode,
+                      offset=offset, shape=tuple(shape))
+
+
+def write_vec(file_path, values):
+  """
+  Writes an array into a PETSc binary Vec file (32-bit integers).
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the file to write.
+  values: numpy array of floats
+    Values to write; the array is flattened in C-order.
+  """
+  values = numpy.ascontiguousarray(values, dtype='>f8').ravel()
+  with open(file_path, 'wb') as outfile:
+    numpy.array([VEC_FILE_CLASSID, values.size], dtype='>i4').tofile(outfile)
+    values.tofile(outfile)
@@ -3,20 +3,13 @@ Implementation of the class `PetIBMSimulation`.
 """
 
 import os
-import sys
 import struct
 
 import numpy
 
-try:
-  sys.path.append(os.path.join(os.environ['PETSC_DIR'], 'bin'))
-  import PetscBinaryIO
-except:
-  pass
-
 from ..barbaGroupSimulation import BarbaGroupSimulation
 from ..field import Field
-from ..force import Force
+from .petscVec import read_vec
 
 
 class PetIBMSimulation(BarbaGroupSimulation):
@@ -75,18 +68,17 @@ class PetIBMSimulation(BarbaGroupSimulation):
         ny = struct.unpack('i', infile.read(4))[0]
         y = numpy.array(struct.unpack('d' * (ny + 1),
                                       infile.read(8 * (ny + 1))))
-        self.grid = numpy.array([x, y])
+        self.grid = [x, y]
     else:
       with open(file_path, 'r') as infile:
         n_cells = numpy.array([int(n)
                                for n in infile.readline().strip().split()])
         coords = numpy.loadtxt(infile, dtype=numpy.float64)
-      self.grid = numpy.array(numpy.split(coords,
-                                          numpy.cumsum(n_cells[:-1] + 1)))
-    if self.grid.size == 2:
+      self.grid = numpy.split(coords, numpy.cumsum(n_cells[:-1] + 1))
+    if len(self.grid) == 2:
       print('\tgrid-size: {}x{}'.format(self.grid[0].size - 1,
                                         self.grid[1].size - 1))
-    elif self.grid.size == 3:
+    elif len(self.grid) == 3:
       print('\tgrid-size: {}x{}x{}'.format(self.grid[0].size - 1,
                                            self.grid[1].size - 1,
                                            self.grid[2].size - 1))
@@ -104,7 +96,7 @@ class PetIBMSimulation(BarbaGroupSimulation):
       default: '%0.16g'.
     """
     with open(file_path, 'w') as outfile:
-      if self.grid.size == 3:
+      if len(self.grid) == 3:
         outfile.write('{}\t{}\t{}\n'.format(self.grid[0].size - 1,
                                             self.grid[1].size - 1,
                                             self.grid[2].size - 1))
@@ -114,13 +106,18 @@ class PetIBMSimulation(BarbaGroupSimulation):
     with open(file_path, 'ab') as outfile:
         numpy.savetxt(outfile, numpy.c_[self.grid[0]], fmt=fmt)
         numpy.savetxt(outfile, numpy.c_[self.grid[1]], fmt=fmt)
-        if self.grid.size == 3:
+        if len(self.grid) == 3:
           numpy.savetxt(outfile, numpy.c_[self.grid[2]], fmt=fmt)
 
-  def read_forces(self, file_path=None, labels=None):
+  def read_forces(self, file_path=None, labels=None, cache=False):
     """
     Reads forces from files.
 
+    The file is read incrementally: only the rows written since the previous
+    call are parsed.
+    Optionally, the parsed rows are cached into a .npy file next to the
+    forces file and memory-mapped the next time the (unchanged) file is read.
+
     Parameters
     ----------
     file_path: string, optional
@@ -129,27 +126,33 @@ class PetIBMSimulation(BarbaGroupSimulation):
     labels: list of strings, optional
       Label to give to each force that will be read from file;
       default: None
+    cache: boolean, optional
+      Set 'True' to cache the parsed rows into a .npy file next to the
+      forces file;
+      default: False.
     """
     if not file_path:
       file_path = os.path.join(self.directory, 'forces.txt')
     print('[info] reading forces ...'),
-    with open(file_path, 'r') as infile:
-      data = numpy.loadtxt(infile, dtype=numpy.float64, unpack=True)
-    times = data[0]
+    reader = self.get_force_reader(file_path, cache=cache)
+    reader.update()
     if not labels:
       labels = ['f_x', 'f_z', 'f_z']  # default labels
-    self.forces = []
-    for index, values in enumerate(data[1:]):
-      self.forces.append(Force(times, values, label=labels[index]))
+    self.forces = reader.get_forces(labels=labels)
     print('done')
 
   def read_fluxes(self, time_step,
                   periodic_directions=[],
                   directory=None,
+                  mode='r',
                   **kwargs):
     """
     Reads the flux fields at a given time-step.
 
+    The PETSc binary files are memory-mapped: the values of the returned
+    fields are big-endian views on the files, reshaped into the staggered
+    arrangement without copy.
+
     Parameters
     ----------
     time_step: integer
@@ -160,6 +163,10 @@ class PetIBMSimulation(BarbaGroupSimulation):
     directory: string, optional
       Directory where are saved the flux fields;
       default: None (defined as <simulation-directory>/<time-step>).
+    mode: string, optional
+      Mode used to memory-map the files;
+      choices: 'r' (read-only), 'c' (copy-on-write);
+      default: 'r'.
 
     Returns
     -------
@@ -171,69 +178,67 @@ class PetIBMSimulation(BarbaGroupSimulation):
     # directory with numerical solution
     if not directory:
       directory = os.path.join(self.directory, '{:0>7}'.format(time_step))
-    # read grid-stations and fluxes
+    # get grid-stations and number of cells along each direction
     x, y = self.grid[:2]
     nx, ny = x.size - 1, y.size - 1
+    # number of fluxes stored in each direction
+    # (the last face of a periodic direction is stored but not used)
+    mx = (nx if 'x' in periodic_directions else nx - 1)
+    my = (ny if 'y' in periodic_directions else ny - 1)
     qx_file_path = os.path.join(directory, 'qx.dat')
-    qx = PetscBinaryIO.PetscBinaryIO().readBinaryFile(qx_file_path)[0]
     qy_file_path = os.path.join(directory, 'qy.dat')
-    qy = PetscBinaryIO.PetscBinaryIO().readBinaryFile(qy_file_path)[0]
+    # create flux Field objects in staggered arrangement
     if dim3:
       z = self.grid[2]
       nz = z.size - 1
+      mz = (nz if 'z' in periodic_directions else nz - 1)
       qz_file_path = os.path.join(directory, 'qz.dat')
-      qz = PetscBinaryIO.PetscBinaryIO().readBinaryFile(qz_file_path)[0]
-    # create flux Field objects in staggered arrangement
-    # reshape fluxes in multi-dimensional arrays
-    if dim3:
-      qx = qx.reshape((nz, ny, (nx if 'x' in periodic_directions else nx - 1)))
-      qx = qx[:, :, :(-1 if 'x' in periodic_directions else None)]
+      qx = read_vec(qx_file_path, shape=(nz, ny, mx), mode=mode)
       qx = Field(label='x-flux',
                  time_step=time_step,
                  x=x[1:-1],
                  y=0.5 * (y[:-1] + y[1:]),
                  z=0.5 * (z[:-1] + z[1:]),
-                 values=qx)
-      qy = qy.reshape((nz, (ny if 'y' in periodic_directions else ny - 1), nx))
-      qy = qy[:, :(-1 if 'y' in periodic_directions else None), :]
+                 values=qx[:, :, :nx - 1])
+      qy = read_vec(qy_file_path, shape=(nz, my, nx), mode=mode)
       qy = Field(label='y-flux',
                  time_step=time_step,
                  x=0.5 * (x[:-1] + x[1:]),
                  y=y[1:-1],
                  z=0.5 * (z[:-1] + z[1:]),
-                 values=qy)
-      qz = qz.reshape(((nz if 'z' in periodic_directions else nz - 1), ny, nx))
-      qz = qz[:(-1 if 'z' in periodic_directions else None), :, :]
+                 values=qy[:, :ny - 1, :])
+      qz = read_vec(qz_file_path, shape=(mz, ny, nx), mode=mode)
       qz = Field(label='z-flux',
                  time_step=time_step,
                  x=0.5 * (x[:-1] + x[1:]),
                  y=0.5 * (y[:-1] + y[1:]),
                  z=z[1:-1],
-                 values=qz)
+                 values=qz[:nz - 1, :, :])
       print('done')
       return qx, qy, qz
     else:
-      qx = qx.reshape((ny, (nx if 'x' in periodic_directions else nx - 1)))
-      qx = qx[:, :(-1 if 'x' in periodic_directions else None)]
+      qx = read_vec(qx_file_path, shape=(ny, mx), mode=mode)
       qx = Field(label='x-flux',
                  time_step=time_step,
                  x=x[1:-1],
                  y=0.5 * (y[:-1] + y[1:]),
-                 values=qx)
-      qy = qy.reshape(((ny if 'y' in periodic_directions else ny - 1), nx))
-      qy = qy[:(-1 if 'y' in periodic_directions else None), :]
+                 values=qx[:, :nx - 1])
+      qy = read_vec(qy_file_path, shape=(my, nx), mode=mode)
       qy = Field(label='y-flux',
                  time_step=time_step,
                  x=0.5 * (x[:-1] + x[1:]),
                  y=y[1:-1],
-                 values=qy)
+                 values=qy[:ny - 1, :])
       print('done')
       return qx, qy
 
-  def read_pressure(self, time_step, directory=None, **kwargs):
+  def read_pressure(self, time_step, directory=None, mode='r', **kwargs):
     """
     Reads the pressure field from file given the time-step.
 
+    The PETSc binary file is memory-mapped: the values of the returned field
+    are a big-endian view on the file.
+
     Parameters
     ----------
     time_step: integer
@@ -241,6 +246,10 @@ class PetIBMSimulation(BarbaGroupSimulation):
     directory: string, optional
       Directory where is saved the pressure field;
       default: None (set to <simulation-directory>/<time-step>).
+    mode: string, optional
+      Mode used to memory-map the file;
+      choices: 'r' (read-only), 'c' (copy-on-write);
+      default: 'r'.
 
     Returns
     -------
@@ -260,7 +269,6 @@ class PetIBMSimulation(BarbaGroupSimulation):
       directory = os.path.join(self.directory, '{:0>7}'.format(time_step))
     # read pressure
     phi_file_path = os.path.join(directory, 'phi.dat')
-    p = PetscBinaryIO.PetscBinaryIO().readBinaryFile(phi_file_path)[0]
     # set pressure Field object
     if dim3:
       p = Field(label='pressure',
@@ -268,12 +276,12 @@ class PetIBMSimulation(BarbaGroupSimulation):
                 x=0.5 * (x[:-1] + x[1:]),
                 y=0.5 * (y[:-1] + y[1:]),
                 z=0.5 * (z[:-1] + z[1:]),
-                values=p.reshape((nz, ny, nx)))
+                values=read_vec(phi_file_path, shape=(nz, ny, nx), mode=mode))
     else:
       p = Field(label='pressure',
                 time_step=time_step,
                 x=0.5 * (x[:-1] + x[1:]),
                 y=0.5 * (y[:-1] + y[1:]),
-                values=p.reshape((ny, nx)))
+                values=read_vec(phi_file_path, shape=(ny, nx), mode=mode))
     print('done')
     return p
@@ -0,0 +1,158 @@
+"""
+Implementation of a pipeline to post-process several time-steps of a
+simulation in parallel.
+"""
+
+import copy
+import collections
+import multiprocessing
+
+
+# copy of the simulation owned by a worker process
+_worker_simulation = None
+
+
+def _initialize_worker(simulation):
+  """
+  Stores the copy of the simulation sent to a worker process.
+  """
+  global _worker_simulation
+  _worker_simulation = simulation
+
+
+def _process_time_step(arguments):
+  """
+  Applies a function to a time-step using the simulation of the worker.
+  The fields of the time-step are released once the function returns.
+  """
+  function, time_step, kwargs = arguments
+  return process_time_step(_worker_simulation, function, time_step, **kwargs)
+
+
+def process_time_step(simulation, function, time_step, **kwargs):
+  """
+  Applies a function to a time-step and releases the fields read or computed
+  for that time-step.
+
+  Parameters
+  ----------
+  simulation: Simulation object
+    The simulation.
+  function: function
+    Function called as `function(simulation, time_step, **kwargs)`.
+  time_step: integer
+    The time-step.
+  **kwargs: dictionary
+    Extra keyword-arguments passed to the function.
+
+  Returns
+  -------
+  result: object
+    Value returned by the function.
+  """
+  try:
+    return function(simulation, time_step, **kwargs)
+  finally:
+    simulation.fields = {}
+    if getattr(simulation, 'field_store', None) is not None:
+      simulation.field_store.clear()
+
+
+def get_worker_copy(simulation, attributes=None):
+  """
+  Returns a lightweight copy of the simulation to send to worker processes
+  (fields and field store are not copied).
+
+  Parameters
+  ----------
+  simulation: Simulation object
+    The simulation.
+  attributes: dictionary of (string, object) items, optional
+    Attributes set on the copy;
+    default: None.
+
+  Returns
+  -------
+  worker_simulation: Simulation object
+    The copy.
+  """
+  worker_simulation = copy.copy(simulation)
+  worker_simulation.fields = {}
+  worker_simulation.field_store = None
+  for name, value in (attributes or {}).items():
+    setattr(worker_simulation, name, value)
+  return worker_simulation
+
+
+def map_time_steps(simulation, function, time_steps,
+                   n_processes=None,
+                   max_in_flight=None,
+                   shared=None,
+                   **kwargs):
+  """
+  Applies a function to each time-step on a pool of processes and yields the
+  results in the order of the time-steps.
+
+  Each worker process gets its own copy of the simulation and handles one
+  time-step at a time (read, derive, render, ...).
+  No more than `max_in_flight` time-steps are submitted to the pool at any
+  time, which bounds the memory used by pending results.
+
+  Parameters
+  ----------
+  simulation: Simulation object
+    The simulation.
+  function: function
+    Module-level function called as `function(simulation, time_step,
+    **kwargs)`.
+  time_steps: list of integers
+    The time-steps to process.
+  n_processes: integer, optional
+    Number of worker processes;
+    default: None (number of CPUs; 1 runs in the present process).
+  max_in_flight: integer, optional
+    Maximum number of time-steps submitted but not yet collected;
+    default: None (twice the number of processes).
+  shared: dictionary of (string, object) items, optional
+    Attributes set on the copy of the simulation of each worker; unlike the
+    keyword-arguments, they are sent once per worker, not with every
+    time-step (e.g. large read-only data);
+    default: None.
+  **kwargs: dictionary
+    Extra keyword-arguments passed to the function.
+
+  Yields
+  ------
+  time_step, result: integer, object
+    Time-step and value returned by the function.
+  """
+  if n_processes is None:
+    n_processes = multiprocessing.cpu_count()
+  if n_processes <= 1:
+    worker_simulation = get_worker_copy(simulation, attributes=shared)
+    for time_step in time_steps:
+      yield time_step, process_time_step(worker_simulation, function,
+                                         time_step, **kwargs)
+    return
+  if not max_in_flight:
+    max_in_flight = 2 * n_processes
+  pool = multiprocessing.Pool(processes=n_processes,
+                              initializer=_initialize_worker,
+                              initargs=(get_worker_copy(simulation,
+                                                        attributes=shared),))
+  try:
+    pending = collections.deque()
+    for time_step in time_steps:
+      if len(pending) >= max_in_flight:
+        done, result = pending.popleft()
+        yield done, result.get()
+      pending.append((time_step,
+                      pool.apply_async(_process_time_step,
+                                       ((function, time_step, kwargs),))))
+    while pending:
+      done, result = pending.popleft()
+      yield done, result.get()
+    pool.close()
+  finally:
+    pool.terminate()
+    pool.join()
@@ -0,0 +1,126 @@
+"""
+Implementation of the class `Probe`, which samples fields defined on
+structured Cartesian grids at scattered points (bilinear interpolation in 2D,
+trilinear interpolation in 3D).
+"""
+
+import numpy
+
+
+class Probe(object):
+  """
+  Samples fields at scattered points of a structured Cartesian grid
+  (uniform or stretched).
+
+  The cell containing each point and the interpolation weights of its corners
+  are computed once, when the probe is created; sampling a field (at any
+  time-step) is then a weighted sum of gathered values.
+  """
+
+  def __init__(self, stations, points, atol=1.0E-12):
+    """
+    Locates the points in the grid.
+
+    Parameters
+    ----------
+    stations: list of numpy 1D arrays of floats
+      Sorted stations along a gridline in each direction (x, y, and z in 3D).
+    points: numpy 2D array of floats
+      Coordinates of the points (one row per point, one column per direction).
+    atol: float, optional
+      Absolute tolerance used to accept points on the boundary of the grid;
+      default: 1.0E-12.
+    """
+    points = numpy.asarray(points, dtype=numpy.float64)
+    if points.ndim == 1:
+      points = points.reshape(1, -1)
+    assert points.shape[1] == len(stations)
+    self.shape = tuple(s.size for s in reversed(stations))
+    self.n_points = points.shape[0]
+    self.outside = numpy.zeros(self.n_points, dtype=bool)
+    # flat index of the (lower) cell corner, and the upper-corner offset
+    # and weight in each direction
+    strides = numpy.cumprod((1,) + self.shape[:0:-1])
+    lower = numpy.zeros(self.n_points, dtype=numpy.int64)
+    offsets, weights = [], []
+    for s, coordinates, stride in zip(stations, points.T, strides):
+      i, w, outside = locate(s, coordinates, atol=atol)
+      lower += i * stride
+      offsets.append(stride if s.size > 1 else 0)
+      weights.append(w)
+      self.outside |= outside
+    # flat index and weight of each corner of the cells
+    n_corners = 2**len(stations)
+    self.indices = numpy.empty((n_corners, self.n_points), dtype=numpy.int64)
+    self.weights = numpy.empty((n_corners, self.n_points))
+    for corner in range(n_corners):
+      self.indices[corner] = lower
+      self.weights[corner] = 1.0
+      for direction, (offset, w) in enumerate(zip(offsets, weights)):
+        if (corner >> direction) & 1:
+          self.indices[corner] += offset
+          self.weights[corner] *= w
+        else:
+          self.weights[corner] *= 1.0 - w
+    self.indices[:, self.outside] = 0
+
+  def sample(self, values):
+    """
+    Interpolates the values of a field at the points of the probe.
+
+    Parameters
+    ----------
+    values: numpy array of floats
+      Values of the field on the grid (z-axis first, x-axis last);
+      extra leading axes (e.g. time-steps) are sampled at once.
+
+    Returns
+    -------
+    samples: numpy array of floats
+      Values at the points (last axis); NaN for points outside the grid.
+    """
+    values = numpy.asarray(values)
+    leading = values.shape[:values.ndim - len(self.shape)]
+    assert values.shape[len(leading):] == self.shape
+    flat = values.reshape(leading + (-1,))
+    samples = numpy.zeros(leading + (self.n_points,))
+    for indices, weights in zip(self.indices, self.weights):
+      samples += weights * numpy.take(flat, indices, axis=-1)
+    samples[..., self.outside] = numpy.nan
+    return samples
+
+
+def locate(stations, coordinates, atol=1.0E-12):
+  """
+  Locates coordinates along a gridline (binary search in the sorted stations).
+
+  Parameters
+  ----------
+  stations: numpy 1D array of floats
+    Sorted stations along the gridline.
+  coordinates: numpy 1D array of floats
+    Coordinates to locate.
+  atol: float, optional
+    Absolute tolerance used to accept coordinates on the boundaries;
+    default: 1.0E-12.
+
+  Returns
+  -------
+  indices: numpy 1D array of integers
+    Index of the station before each coordinate.
+  weights: numpy 1D array of floats
+    Weight of the station after each coordinate (between 0 and 1).
+  outside: numpy 1D array of booleans
+    Coordinates outside the gridline.
+  """
+  outside = numpy.logical_or(coordinates < stations[0] - atol,
+                             coordinates > stations[-1] + atol)
+  if stations.size == 1:
+    return (numpy.zeros(coordinates.size, dtype=numpy.int64),
+            numpy.zeros(coordinates.size), outside)
+  indices = numpy.searchsorted(stations, coordinates, side='right') - 1
+  indices = numpy.clip(indices, 0, stations.size - 2)
+  weights = ((coordinates - stations[indices])
+             / (stations[indices + 1] - stations[indices]))
+  weights = numpy.clip(weights, 0.0, 1.0)
+  return indices, weights, outside
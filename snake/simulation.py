@@ -9,6 +9,10 @@ import numpy
 from matplotlib import pyplot
 import pandas
 
+from .forceReader import ForceHistoryReader, append_rows, get_forces
+from .force import get_uniform_samples, get_spectrum
+from .force import get_spectral_peaks, get_strouhal_from_peaks
+
 
 class Simulation(object):
   """
@@ -48,6 +52,7 @@ class Simulation(object):
     self._print_registration()
     self.fields = {}
     self.forces = []
+    self.force_readers = {}
     self._derive_class()
 
   def _print_registration(self):
@@ -81,6 +86,89 @@ class Simulation(object):
             'cuibm, petibm, openfoam, or ibamr')
       sys.exit(0)
 
+  def get_force_reader(self, file_path, usecols=None, cache=False, **kwargs):
+    """
+    Returns the incremental reader of a force-history file.
+    Readers are kept between calls so that a file is never parsed twice.
+
+    Parameters
+    ----------
+    file_path: string
+      Path of the force-history file.
+    usecols: tuple of integers, optional
+      Index of each column to read (including the time column);
+      default: None (all columns).
+    cache: boolean, optional
+      Set 'True' to cache the parsed rows into a .npy file next to the
+      force-history file (memory-mapped the next time the file is read);
+      default: False.
+    **kwargs: dictionary
+      Other keyword-arguments passed to the constructor of the reader.
+
+    Returns
+    -------
+    reader: ForceHistoryReader object
+      The reader.
+    """
+    if getattr(self, 'force_readers', None) is None:
+      self.force_readers = {}
+    key = (os.path.abspath(file_path),
+           tuple(usecols) if usecols is not None else None,
+           cache,
+           tuple(sorted(kwargs.items())))
+    if key not in self.force_readers:
+      self.force_readers[key] = ForceHistoryReader(file_path, usecols=usecols,
+                                                   cache=cache, **kwargs)
+    self.force_reader = self.force_readers[key]
+    return self.force_reader
+
+  def follow_forces(self, interval=1.0, timeout=None, **kwargs):
+    """
+    Yields the force samples appended to the forces file while the solver
+    runs; the attribute `forces` is kept up-to-date with the whole history.
+
+    The rows read before the followed file (attribute `force_history`, e.g.
+    the earlier segments of a restarted OpenFOAM run) are kept; only the new
+    rows are appended to them.
+
+    Parameters
+    ----------
+    interval: float, optional
+      Time (in seconds) between two polls of the file;
+      default: 1.0.
+    timeout: float, optional
+      Stops when no new sample has been written for that time (in seconds);
+      default: None (follows the file forever).
+    **kwargs: dictionary
+      Keyword-arguments passed to the method `read_forces` if the forces
+      have not been read yet.
+
+    Yields
+    ------
+    forces: list of Force objects
+      The new samples of each force.
+    """
+    if getattr(self, 'force_reader', None) is None:
+      self.read_forces(**kwargs)
+    labels = [force.label for force in self.forces]
+    history = getattr(self, 'force_history', None)
+    data, n_rows = None, 0
+    if history is not None:
+      data, n_rows = append_rows(None, 0, history)
+      data, n_rows = append_rows(data, n_rows, self.force_reader.get_data())
+    for forces in self.force_reader.follow(labels=labels,
+                                           interval=interval,
+                                           timeout=timeout):
+      if history is None:
+        self.forces = self.force_reader.get_forces(labels=labels)
+      else:
+        n_new = forces[0].times.size if forces else 0
+        rows = self.force_reader.get_data(start=self.force_reader.n_rows -
+                                          n_new)
+        data, n_rows = append_rows(data, n_rows, rows)
+        self.forces = get_forces(data[:n_rows], labels=labels)
+      yield forces
+
   def get_mean_forces(self,
                       limits=(0.0, float('inf')),
                       last_period=False,
@@ -109,7 +197,9 @@ class Simulation(object):
                    L=1.0, U=1.0,
                    limits=(0.0, float('inf')),
                    order=5,
-                   index=1):
+                   index=1,
+                   method='extrema',
+                   **kwargs):
     """
     Computes the Strouhal number based on the frequency of the force signal.
 
@@ -130,9 +220,86 @@ class Simulation(object):
     index: integer, optional
       Index of the list of forces to use to compute the Strouhal number;
       default: 1 (most of the time, 1 corresponds to the lift force).
+    method: string, optional
+      Method used to get the frequency of the signal;
+      choices: 'extrema', 'welch', 'fft';
+      default: 'extrema'.
+    **kwargs: dictionary
+      Extra keyword-arguments passed to the spectral analysis.
     """
     return self.forces[index].get_strouhal(L=L, U=U,
-                                           limits=limits, order=order)
+                                           limits=limits, order=order,
+                                           method=method, **kwargs)
+
+  def get_spectral_analysis(self,
+                            L=1.0, U=1.0,
+                            limits=(0.0, float('inf')),
+                            indices=None,
+                            method='welch',
+                            n_samples=None,
+                            n_segments=4,
+                            n_harmonics=3):
+    """
+    Computes the dominant frequency, harmonics, and Strouhal number of
+    several forces at once from their power spectral densities.
+
+    The forces are resampled on a common uniform time-grid and analyzed
+    together (one 2D array).
+
+    Parameters
+    ----------
+    L: float, optional
+      Characteristics length of the body;
+      default: 1.0.
+    U: float, optional
+      Characteristics velocity of the body;
+      default: 1.0.
+    limits: 2-tuple of floats, optional
+      Time-limits of the signals to analyze;
+      default: (0.0, inf).
+    indices: list of integers, optional
+      Index of each force to analyze;
+      default: None (all forces).
+    method: string, optional
+      Method used to estimate the spectral densities;
+      choices: 'welch', 'fft';
+      default: 'welch'.
+    n_samples: integer, optional
+      Number of samples of the uniform time-grid;
+      default: None (number of samples within the time-limits).
+    n_segments: integer, optional
+      Number of segments averaged with Welch's method;
+      default: 4.
+    n_harmonics: integer, optional
+      Number of harmonics of the dominant frequency to report;
+      default: 3.
+
+    Returns
+    -------
+    strouhals: list of dictionaries
+      Strouhal number and spectral information of each force (also stored
+      in the attribute `strouhal` of each force).
+    """
+    if indices is None:
+      indices = range(len(self.forces))
+    forces = [self.forces[index] for index in indices]
+    times = forces[0].times
+    values = numpy.array([force.values
+                          if numpy.array_equal(force.times, times)
+                          else numpy.interp(times, force.times, force.values)
+                          for force in forces])
+    times, values = get_uniform_samples(times, values,
+                                        limits=limits, n_samples=n_samples)
+    frequencies, psd = get_spectrum(times, values, method=method,
+                                    n_segments=n_segments)
+    peaks = get_spectral_peaks(frequencies, psd, n_harmonics=n_harmonics)
+    strouhals = []
+    for i, force in enumerate(forces):
+      force.strouhal = get_strouhal_from_peaks(
+          dict((key, value if key == 'resolution' else value[i])
+               for key, value in peaks.items()), times, L=L, U=U)
+      strouhals.append(force.strouhal)
+    return strouhals
 
   def plot_forces(self,
                   indices=None, labels=None,
@@ -2,8 +2,12 @@
 Tests for the class `CuIBMSimulation`.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 import numpy
+from matplotlib import image
 
 from snake.cuibm.simulation import CuIBMSimulation
 
@@ -68,6 +72,22 @@ class CuIBMSimulationTest(unittest.TestCase, CuIBMSimulation):
     assert numpy.allclose(qy.y, y, atol)
     assert qy.values.shape == (qy.y.size, qy.x.size)
 
+  def test_compute_velocity(self):
+    self.read_grid()
+    fluxes = self.read_fluxes(nt)
+    for flux in fluxes:
+      flux.values = numpy.array(flux.values)
+    copies = [flux.values.copy() for flux in fluxes]
+    ux, uy = self.compute_velocity(fluxes)
+    for flux, values in zip(fluxes, copies):
+      assert numpy.array_equal(flux.values, values)
+    dx = self.grid[0][1:] - self.grid[0][:-1]
+    dy = self.grid[1][1:] - self.grid[1][:-1]
+    assert numpy.allclose(ux.values, copies[0] / dy[:, numpy.newaxis], atol)
+    assert numpy.allclose(uy.values, copies[1] / dx, atol)
+    ux, uy = self.compute_velocity(fluxes, in_place=True)
+    assert ux.values is fluxes[0].values
+
   def test_read_pressure(self):
     self.read_grid()
     p = self.read_pressure(nt)
@@ -81,6 +101,61 @@ class CuIBMSimulationTest(unittest.TestCase, CuIBMSimulation):
     assert numpy.allclose(p.y, y, atol)
     assert p.values.shape == (p.y.size, p.x.size)
 
+  def test_get_probe_history(self):
+    self.read_grid()
+    points = numpy.array([[0.1, 0.2], [-0.55, 0.0], [0.9, -1.0]])
+    fields = dict(zip(['pressure', 'x-velocity', 'y-velocity'],
+                      (self.read_pressure(nt),) +
+                      self.compute_velocity(self.read_fluxes(nt))))
+    for field_name, field in fields.items():
+      histories = self.get_probe_history(field_name, points,
+                                         time_steps=[nt, nt],
+                                         time_increment=0.01,
+                                         n_processes=1)
+      values = field.probe(points[:, 0], points[:, 1])
+      assert len(histories) == points.shape[0]
+      for history, value in zip(histories, values):
+        assert numpy.allclose(history.times, [nt * 0.01] * 2, atol=atol)
+        assert numpy.allclose(history.values, value, atol=atol,
+                              equal_nan=True)
+
+  def test_plot_contours(self):
+    self.read_grid()
+    directory = tempfile.mkdtemp()
+    images = []
+    for n_processes in [1, 2]:
+      save_directory = os.path.join(directory, str(n_processes))
+      self.plot_contours('pressure', time_steps=[nt],
+                         n_processes=n_processes,
+                         field_range=[-1.0, 1.0, 11],
+                         save_directory=save_directory)
+      file_path = os.path.join(save_directory,
+                               'pressure_-1.00_-1.10_1.00_1.10',
+                               'pressure{:0>7}.png'.format(nt))
+      images.append(image.imread(file_path))
+    assert numpy.array_equal(images[0], images[1])
+    shutil.rmtree(directory)
+
+  def test_animate_contours(self):
+    self.read_grid()
+    directory = tempfile.mkdtemp()
+    frames = []
+    for n_processes in [1, 2]:
+      file_path = os.path.join(directory, str(n_processes), 'pressure.mp4')
+      path = self.animate_contours('pressure', [-1.0, 1.0, 11],
+                                   time_steps=[nt],
+                                   file_path=file_path,
+                                   ffmpeg=None,
+                                   n_processes=n_processes,
+                                   time_increment=0.01)
+      # without ffmpeg, the frames are saved as images
+      assert path == os.path.splitext(file_path)[0]
+      frames.append(image.imread(os.path.join(path,
+                                              'pressure{:0>7}.png'
+                                              ''.format(nt))))
+    assert frames[0].ndim == 3 and frames[0].std() > 0.0
+    assert numpy.array_equal(frames[0], frames[1])
+    shutil.rmtree(directory)
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the class `OpenFOAMSimulation`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+
+from snake.openfoam.simulation import OpenFOAMSimulation
+from snake.openfoam.simulation import merge_force_segments
+
+
+atol = 1.0E-12
+
+
+class OpenFOAMSimulationTest(unittest.TestCase, OpenFOAMSimulation):
+  def __init__(self, *args, **kwargs):
+    super(OpenFOAMSimulationTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.directory = 'data'
+
+  def test_read_forces(self):
+    last_time, last_fx, last_my = 2.0E-02, 6.108744E-01, 3.054372E-01
+    self.read_forces(usecols=(0, 1, 2, 11), n_processes=1)
+    assert len(self.forces) == 3
+    assert self.forces[2].label == 'column 3'
+    assert abs(self.forces[0].times[-1] - last_time) <= atol
+    assert abs(self.forces[0].values[-1] - last_fx) <= atol
+    assert abs(self.forces[2].values[-1] - last_my) <= atol
+
+  def test_read_forces_default_columns(self):
+    last_fx, last_fy = 6.108744E-01, 5.675007E-01
+    self.read_forces(n_processes=1)
+    assert [force.label for force in self.forces] == ['$F_x$', '$F_y$']
+    assert abs(self.forces[0].values[-1] - last_fx) <= atol
+    assert abs(self.forces[1].values[-1] - last_fy) <= atol
+
+  def write_forces(self, file_path, times, mode='w'):
+    with open(file_path, mode) as outfile:
+      for time in times:
+        outfile.write('{}\t(({} {} 0) (0 0 0) (0 0 0)) '
+                      '((0 0 {}) (0 0 0) (0 0 0))\n'
+                      ''.format(time, 10.0 * time, -time, 2.0 * time))
+
+  def test_follow_forces_restart(self):
+    directory = self.directory
+    self.directory = tempfile.mkdtemp()
+    folder = os.path.join(self.directory, 'postProcessing', 'forces')
+    for start, times in [('0', [1.0, 2.0, 3.0, 4.0]), ('2.5', [3.0, 4.0])]:
+      os.makedirs(os.path.join(folder, start))
+      self.write_forces(os.path.join(folder, start, 'forces.dat'), times)
+    self.read_forces(n_processes=1)
+    assert numpy.allclose(self.forces[0].times, [1.0, 2.0, 3.0, 4.0],
+                          atol=atol)
+    assert numpy.allclose(self.forces[0].values, [10.0, 20.0, 30.0, 40.0],
+                          atol=atol)
+    samples = self.follow_forces(interval=0.01, timeout=0.05)
+    forces = next(samples)
+    assert numpy.allclose(forces[0].times, [3.0, 4.0], atol=atol)
+    self.write_forces(os.path.join(folder, '2.5', 'forces.dat'), [5.0],
+                      mode='a')
+    forces = next(samples)
+    assert numpy.allclose(forces[1].values, [-5.0], atol=atol)
+    assert len(list(samples)) == 0
+    assert numpy.allclose(self.forces[0].times, [1.0, 2.0, 3.0, 4.0, 5.0],
+                          atol=atol)
+    assert numpy.allclose(self.forces[1].values,
+                          [-1.0, -2.0, -3.0, -4.0, -5.0], atol=atol)
+    shutil.rmtree(self.directory)
+    self.directory = directory
+
+  def write_log(self, file_path, time_steps, mode='w'):
+    with open(file_path, mode) as outfile:
+      for time_step in time_steps:
+        outfile.write('Courant Number mean: 0.01 max: {}\n'
+                      'Time = {}\n\n'.format(0.1 * time_step, time_step))
+        for field in ['Ux', 'Uy', 'p']:
+          outfile.write('DILUPBiCG:  Solving for {}, Initial residual = 0.5, '
+                        'Final residual = 1e-06, No Iterations {}\n'
+                        ''.format(field, time_step))
+        outfile.write('ExecutionTime = {} s  ClockTime = 1 s\n\n'
+                      ''.format(0.5 * time_step))
+
+  def test_read_log(self):
+    file_path = 'log_test.pimpleFoam'
+    self.write_log(file_path, [1, 2, 3])
+    with open(file_path, 'a') as outfile:
+      outfile.write('Courant Number mean: 0.01 ma')
+    cfl = self.read_maximum_cfl(file_path)
+    assert numpy.allclose(cfl['times'], [1.0, 2.0, 3.0], atol=atol)
+    assert numpy.allclose(cfl['values'], [0.1, 0.2, 0.3], atol=atol)
+    with open(file_path, 'a') as outfile:
+      outfile.write('x: 0.4\n')
+    self.write_log(file_path, [5], mode='a')
+    reader = self.read_log(file_path)
+    assert reader.offset == os.path.getsize(file_path)
+    assert numpy.allclose(reader.get('courant-max'), [0.1, 0.2, 0.3, 0.4, 0.5],
+                          atol=atol)
+    assert numpy.allclose(reader.get('execution-time'), [0.5, 1.0, 1.5, 2.5],
+                          atol=atol)
+    residuals = reader.get_residuals('p')
+    assert numpy.array_equal(residuals['iterations'], [1, 2, 3, 5])
+    assert numpy.allclose(residuals['time'], [1.0, 2.0, 3.0, 5.0], atol=atol)
+    # the Courant numbers are paired with the time of their time-step
+    cfl = self.read_maximum_cfl(file_path)
+    assert numpy.allclose(cfl['times'], [1.0, 2.0, 3.0, 5.0], atol=atol)
+    assert numpy.allclose(cfl['values'], [0.1, 0.2, 0.3, 0.5], atol=atol)
+    # a value that is not a number is reported
+    with open(file_path, 'a') as outfile:
+      outfile.write('Courant Number mean: 0.01 max: nope\n')
+    with self.assertRaises(ValueError):
+      self.read_log(file_path)
+    assert reader.get('time').size == reader.n_time_steps == 4
+    os.remove(file_path)
+
+  def test_merge_force_segments(self):
+    times = numpy.arange(10.0)
+    segments = [numpy.column_stack((times[:6], numpy.zeros(6))),
+                numpy.column_stack((times[4:8], numpy.ones(4))),
+                numpy.column_stack((times[7:], 2.0 * numpy.ones(3)))]
+    data = merge_force_segments(segments)
+    assert numpy.allclose(data[:, 0], times, atol=atol)
+    assert numpy.allclose(data[:, 1], [0, 0, 0, 0, 1, 1, 1, 2, 2, 2],
+                          atol=atol)
+
+
+if __name__ == '__main__':
+  unittest.main()
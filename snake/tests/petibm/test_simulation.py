@@ -3,16 +3,14 @@ Tests for the class `PetIBMSimulation`.
 """
 
 import os
-import sys
+import glob
 import shutil
 import unittest
 import numpy
 
-if sys.version_info < (2, 8):
-  sys.path.append(os.path.join(os.environ['PETSC_DIR'], 'bin'))
-  import PetscBinaryIO
-
+from snake.field import Field
 from snake.petibm.simulation import PetIBMSimulation
+from snake.petibm.petscVec import read_vec, write_vec
 
 
 atol = 1.0E-12
@@ -25,8 +23,8 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
 
   def generate_stubs(self):
     self.directory = 'data'
-    self.grid = numpy.array([numpy.linspace(0.0, 10.0, 11),
-                             numpy.linspace(-1.0, 1.0, 101)])
+    self.grid = [numpy.linspace(0.0, 10.0, 11),
+                 numpy.linspace(-1.0, 1.0, 101)]
 
   def test_read_grid(self):
     x, y = self.grid
@@ -59,7 +57,17 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
     assert numpy.allclose(self.forces[0].times, self.forces[1].times,
                           atol=atol)
 
-  @unittest.skipIf(sys.version_info >= (3, 0), 'Not supported with Python 3')
+  def test_read_vec(self):
+    values_ref = numpy.random.rand(7, 5)
+    file_name = 'vec_test.dat'
+    write_vec(file_name, values_ref)
+    values = read_vec(file_name, shape=values_ref.shape)
+    assert values.shape == values_ref.shape
+    assert values.dtype.byteorder == '>'
+    assert numpy.allclose(values_ref, values, atol=atol)
+    del values
+    os.remove(file_name)
+
   def test_read_fluxes(self):
     x, y = self.grid
     # create flux fields on staggered grid
@@ -72,12 +80,8 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
     if not os.path.isdir(directory):
       os.makedirs(directory)
     # write fluxes
-    vec = qx_ref.flatten().view(PetscBinaryIO.Vec)
-    file_path = os.path.join(directory, 'qx.dat')
-    PetscBinaryIO.PetscBinaryIO().writeBinaryFile(file_path, [vec, ])
-    vec = qy_ref.flatten().view(PetscBinaryIO.Vec)
-    file_path = os.path.join(directory, 'qy.dat')
-    PetscBinaryIO.PetscBinaryIO().writeBinaryFile(file_path, [vec, ])
+    write_vec(os.path.join(directory, 'qx.dat'), qx_ref)
+    write_vec(os.path.join(directory, 'qy.dat'), qy_ref)
     # read fluxes
     qx, qy = self.read_fluxes(0)
     assert numpy.allclose(qx_ref, qx.values, atol=atol)
@@ -88,7 +92,6 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
     assert numpy.allclose(yv, qy.y, atol=atol)
     shutil.rmtree(directory)
 
-  @unittest.skipIf(sys.version_info >= (3, 0), 'Not supported with Python 3')
   def test_read_pressure(self):
     x, y = self.grid
     # create pressure field
@@ -99,9 +102,7 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
     if not os.path.isdir(directory):
       os.makedirs(directory)
     # write pressure
-    vec = p_ref.flatten().view(PetscBinaryIO.Vec)
-    file_path = os.path.join(directory, 'phi.dat')
-    PetscBinaryIO.PetscBinaryIO().writeBinaryFile(file_path, [vec, ])
+    write_vec(os.path.join(directory, 'phi.dat'), p_ref)
     # read pressure
     p = self.read_pressure(0)
     assert numpy.allclose(p_ref, p.values, atol=atol)
@@ -109,6 +110,86 @@ class PetIBMSimulationTest(unittest.TestCase, PetIBMSimulation):
     assert numpy.allclose(yp, p.y, atol=atol)
     shutil.rmtree(directory)
 
+  def test_get_velocity_3d(self):
+    grid = self.grid
+    self.grid = grid + [numpy.linspace(0.0, 2.0, 6)]
+    x, y, z = self.grid
+    nx, ny, nz = x.size - 1, y.size - 1, z.size - 1
+    qz_ref = numpy.random.rand(nz - 1, ny, nx)
+    directory = os.path.join(self.directory, '0000000')
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    write_vec(os.path.join(directory, 'qx.dat'), numpy.ones((nz, ny, nx - 1)))
+    write_vec(os.path.join(directory, 'qy.dat'), numpy.ones((nz, ny - 1, nx)))
+    write_vec(os.path.join(directory, 'qz.dat'), qz_ref)
+    u, v, w = self.get_velocity(0)
+    assert numpy.allclose(w.z, z[1:-1], atol=atol)
+    areas = numpy.outer(y[1:] - y[:-1], x[1:] - x[:-1])
+    assert numpy.allclose(w.values, qz_ref / areas, atol=atol)
+    plane = w.get_plane(z=z[2])
+    assert numpy.allclose(plane.values, qz_ref[1] / areas, atol=atol)
+    u, v, w = self.get_velocity_cell_centers(u, v, w)
+    assert w.values.shape == (nz - 2, ny - 2, nx - 2)
+    del u, v, w, plane
+    shutil.rmtree(directory)
+    self.grid = grid
+
+  def test_out_of_core(self):
+    grid = self.grid
+    self.grid = grid + [numpy.linspace(0.0, 2.0, 8)]
+    x, y, z = self.grid
+    nx, ny, nz = x.size - 1, y.size - 1, z.size - 1
+    directory = os.path.join(self.directory, '0000000')
+    if not os.path.isdir(directory):
+      os.makedirs(directory)
+    write_vec(os.path.join(directory, 'qx.dat'),
+              numpy.random.rand(nz, ny, nx - 1))
+    write_vec(os.path.join(directory, 'qy.dat'),
+              numpy.random.rand(nz, ny - 1, nx))
+    write_vec(os.path.join(directory, 'qz.dat'),
+              numpy.random.rand(nz - 1, ny, nx))
+    self.set_out_of_core(memory_limit=None)
+    velocity = self.get_velocity(0)
+    centered = self.get_velocity_cell_centers(*velocity)
+    vorticity = self.compute_vorticity(*velocity[:2])
+    derived = self.compute_derived_fields(['lambda2', 'y-vorticity'],
+                                          *velocity)
+    # slabs of two planes
+    scratch = os.path.join(self.directory, 'scratch')
+    self.set_out_of_core(memory_limit=2 * 8 * 9 * nx * ny,
+                         directory=scratch)
+    velocity_ooc = self.get_velocity(0)
+    centered_ooc = self.get_velocity_cell_centers(*velocity_ooc)
+    vorticity_ooc = self.compute_vorticity(*velocity_ooc[:2])
+    derived_ooc = self.compute_derived_fields(['lambda2', 'y-vorticity'],
+                                              *velocity_ooc)
+    for field, field_ooc in zip(velocity + centered + (vorticity,) + derived,
+                                velocity_ooc + centered_ooc +
+                                (vorticity_ooc,) + derived_ooc):
+      assert isinstance(field_ooc.values, numpy.memmap)
+      assert not field_ooc.values.flags.writeable
+      assert numpy.allclose(field.values, field_ooc.values, atol=atol)
+    assert len(glob.glob(os.path.join(scratch, 'vorticity0000000-*'))) == 1
+    # a new computation does not overwrite the previous results
+    doubled = [Field(x=u.x, y=u.y, z=u.z, values=2.0 * u.values,
+                     time_step=0, label=u.label) for u in velocity_ooc[:2]]
+    vorticity_doubled = self.compute_vorticity(*doubled)
+    assert numpy.allclose(vorticity_doubled.values, 2.0 * vorticity.values,
+                          atol=atol)
+    assert numpy.allclose(vorticity_ooc.values, vorticity.values, atol=atol)
+    del doubled, vorticity_doubled
+    # derived quantities are available from the field store
+    self.set_field_store()
+    q = self.get_field('q-criterion', 0)
+    assert q.values.shape == derived[0].values.shape
+    del velocity_ooc, centered_ooc, vorticity_ooc, derived_ooc, field_ooc, q
+    self.field_store = None
+    shutil.rmtree(directory)
+    assert self.clear_scratch() > 0
+    assert not os.path.isdir(scratch)
+    self.grid = grid
+    self.set_out_of_core(memory_limit=None)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the module `animationWriter`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+from matplotlib import image
+
+from snake.field import Field
+from snake.animationWriter import (VideoWriter, ImageSequenceWriter,
+                                   get_animation_writer, which)
+
+
+class AnimationWriterTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(AnimationWriterTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    x = numpy.linspace(-2.0, 2.0, 41)
+    y = numpy.linspace(-1.0, 1.0, 21)
+    X, Y = numpy.meshgrid(x, y)
+    self.fields = [Field(x=x, y=y, values=numpy.sin(X - 0.1 * i) * Y,
+                         time_step=i, label='vorticity')
+                   for i in range(1, 4)]
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def get_frames(self):
+    renderer = self.fields[0].get_contour_renderer(
+        field_range=[-1.0, 1.0, 21], time_increment=0.01,
+        view=[-2.0, -1.0, 2.0, 1.0])
+    frames = [renderer.get_frame(field) for field in self.fields]
+    renderer.close()
+    return frames
+
+  def test_get_frame(self):
+    frames = self.get_frames()
+    assert all(frame.dtype == numpy.uint8 for frame in frames)
+    assert all(frame.shape == frames[0].shape for frame in frames)
+    assert frames[0].ndim == 3 and frames[0].shape[2] == 3
+    assert not numpy.array_equal(frames[0], frames[1])
+
+  def test_image_sequence(self):
+    file_path = os.path.join(self.directory, 'vorticity.mp4')
+    writer = get_animation_writer(file_path, ffmpeg=None)
+    assert isinstance(writer, ImageSequenceWriter)
+    frames = self.get_frames()
+    with writer:
+      for field, frame in zip(self.fields, frames):
+        writer.write_frame(frame, time_step=field.time_step)
+    file_path = os.path.join(self.directory, 'vorticity',
+                             'vorticity0000002.png')
+    values = image.imread(file_path)
+    assert values.shape[:2] == frames[1].shape[:2]
+    assert numpy.array_equal(numpy.rint(values[..., :3] * 255), frames[1])
+
+  @unittest.skipIf(not which('ffmpeg'), 'ffmpeg not available')
+  def test_video(self):
+    file_path = os.path.join(self.directory, 'vorticity.mp4')
+    writer = get_animation_writer(file_path)
+    assert isinstance(writer, VideoWriter)
+    with writer:
+      for frame in self.get_frames():
+        writer.write_frame(frame)
+    assert os.path.getsize(file_path) > 0
+
+  @unittest.skipIf(os.name != 'posix', 'shell script used as encoder')
+  def test_video_error(self):
+    # fake encoder that consumes the frames and fails
+    ffmpeg = os.path.join(self.directory, 'ffmpeg')
+    with open(ffmpeg, 'w') as outfile:
+      outfile.write('#!/bin/sh\ncat > /dev/null\necho failure >&2\nexit 1\n')
+    os.chmod(ffmpeg, 0o755)
+    frame = self.get_frames()[0]
+    file_path = os.path.join(self.directory, 'test.mp4')
+    with self.assertRaises(RuntimeError):
+      with VideoWriter(file_path, ffmpeg=ffmpeg) as writer:
+        writer.write_frame(frame)
+    # the error of the render loop is not hidden by the encoder failure
+    with self.assertRaises(KeyError):
+      with VideoWriter(file_path, ffmpeg=ffmpeg) as writer:
+        writer.write_frame(frame)
+        raise KeyError('render')
+    assert writer.process is None
+
+  def test_video_frame_size(self):
+    writer = VideoWriter(os.path.join(self.directory, 'test.mp4'))
+    command = writer.get_command(621, 313)
+    assert command[command.index('-s') + 1] == '621x313'
+    assert command[-1] == writer.file_path
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for the class `ContourRenderer`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+from matplotlib import image
+
+from snake.field import Field
+from snake.contourRenderer import (ContourRenderer, get_view_slice,
+                                   get_template, set_template)
+
+
+class ContourRendererTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(ContourRendererTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.x = numpy.linspace(-2.0, 2.0, 41)
+    self.y = numpy.linspace(-1.0, 1.0, 21)
+    X, Y = numpy.meshgrid(self.x, self.y)
+    self.fields = [Field(x=self.x, y=self.y,
+                         values=numpy.sin(X - 0.1 * i) * Y,
+                         time_step=i, label='pressure')
+                   for i in range(1, 4)]
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_get_view_slice(self):
+    assert get_view_slice(self.x, -2.0, 2.0) == slice(0, 41)
+    assert get_view_slice(self.x, -0.95, 0.45) == slice(10, 26)
+    assert get_view_slice(self.x, -1.0, 0.5) == slice(10, 26)
+
+  def test_render(self):
+    renderer = self.fields[0].get_contour_renderer(
+        field_range=[-1.0, 1.0, 21], view=[-1.0, -0.5, 1.0, 0.5],
+        time_increment=0.01, save_directory=self.directory)
+    assert renderer.X.shape == (11, 21)
+    figure, axes = renderer.fig, renderer.ax
+    for field in self.fields:
+      file_path = renderer.render(field)
+      assert file_path == os.path.join(self.directory,
+                                       'pressure{:0>7}.png'
+                                       ''.format(field.time_step))
+      assert os.path.getsize(file_path) > 0
+    # the template is reused: same figure, a single colorbar and contour
+    assert renderer.fig is figure and renderer.ax is axes
+    assert len(figure.axes) == 2
+    assert renderer.text.get_text() == '0.03 time-units'
+    renderer.close()
+    # same image as the one-off plot
+    self.fields[-1].plot_contour(field_range=[-1.0, 1.0, 21],
+                                 view=[-1.0, -0.5, 1.0, 0.5],
+                                 time_increment=0.01,
+                                 save_directory=self.directory,
+                                 save_name='single')
+    single = image.imread(os.path.join(self.directory, 'single0000003.png'))
+    templated = image.imread(file_path)
+    assert single.shape == templated.shape
+    assert numpy.array_equal(single, templated)
+
+  def test_template(self):
+    renderer = ContourRenderer(self.x, self.y, numpy.linspace(-1.0, 1.0, 5))
+    set_template('a', renderer)
+    assert get_template('a') is renderer
+    assert get_template('b') is None
+    set_template(None, None)
+    assert get_template('a') is None
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the module `derivedFields`.
+"""
+
+import unittest
+import numpy
+
+from snake.field import Field
+from snake import derivedFields
+
+
+atol = 1.0E-10
+
+
+class DerivedFieldsTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(DerivedFieldsTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    # stretched grid
+    self.grid = [numpy.cumsum(1.05**numpy.arange(12)),
+                 numpy.cumsum(1.10**numpy.arange(10)),
+                 numpy.cumsum(0.95**numpy.arange(9))]
+    # constant velocity gradient (gradient[i, j] = du_i / dx_j)
+    self.gradient = numpy.array([[0.5, 1.0, -2.0],
+                                 [3.0, -1.5, 0.25],
+                                 [-0.75, 2.0, 1.0]])
+
+  def get_velocity(self, dim):
+    """
+    Returns the staggered velocity of a linear flow.
+    """
+    nodes = [0.5 * (s[:-1] + s[1:]) for s in self.grid[:dim]]
+    fields = []
+    for i in range(dim):
+      stations = list(nodes)
+      stations[i] = self.grid[i][1:-1]
+      mesh = numpy.meshgrid(*reversed(stations), indexing='ij')[::-1]
+      values = sum(self.gradient[i, j] * mesh[j] for j in range(dim))
+      fields.append(Field(x=stations[0], y=stations[1],
+                          z=(stations[2] if dim == 3 else None),
+                          values=values))
+    return fields
+
+  def test_3d(self):
+    g = self.gradient
+    names = derivedFields.QUANTITIES_3D
+    u, v, w = self.get_velocity(3)
+    stations, values = derivedFields.compute_derived_fields(names, u, v, w,
+                                                            slab_size=2)
+    assert values[0].shape == tuple(s.size for s in reversed(stations))
+    S, Omega = 0.5 * (g + g.T), 0.5 * (g - g.T)
+    expected = {'x-vorticity': g[2, 1] - g[1, 2],
+                'y-vorticity': g[0, 2] - g[2, 0],
+                'z-vorticity': g[1, 0] - g[0, 1],
+                'divergence': numpy.trace(g),
+                'q-criterion': 0.5 * (numpy.sum(Omega**2) - numpy.sum(S**2)),
+                'lambda2': numpy.linalg.eigvalsh(S.dot(S) +
+                                                 Omega.dot(Omega))[1]}
+    for name, value in zip(names, values):
+      if name in expected:
+        assert numpy.allclose(value, expected[name], atol=atol)
+    # slab size does not matter
+    _, values_all = derivedFields.compute_derived_fields(names, u, v, w,
+                                                         slab_size=100)
+    for value, value_all in zip(values, values_all):
+      assert numpy.allclose(value, value_all, atol=atol)
+
+  def test_2d(self):
+    g = self.gradient[:2, :2]
+    u, v = self.get_velocity(2)
+    names = ['z-vorticity', 'q-criterion', 'divergence', 'velocity-magnitude']
+    stations, values = derivedFields.compute_derived_fields(names, u, v)
+    x, y = numpy.meshgrid(*stations)
+    assert numpy.allclose(values[0], g[1, 0] - g[0, 1], atol=atol)
+    assert numpy.allclose(values[1], -0.5 * numpy.sum(g * g.T), atol=atol)
+    assert numpy.allclose(values[2], numpy.trace(g), atol=atol)
+    assert numpy.allclose(values[3],
+                          numpy.hypot(g[0, 0] * x + g[0, 1] * y,
+                                      g[1, 0] * x + g[1, 1] * y),
+                          atol=atol)
+    with self.assertRaises(ValueError):
+      derivedFields.compute_derived_fields(['lambda2'], u, v)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -21,6 +21,7 @@ class FieldTest(unittest.TestCase, Field):
     self.time_step = 0
     self.x = numpy.linspace(0.0, 10.0, 9 * 4)
     self.y = numpy.linspace(-1.0, 1.0, 9 * 5)
+    self.z = None
     self.values = numpy.random.rand(self.y.size, self.x.size)
 
   def test_restrict(self):
@@ -37,6 +38,16 @@ class FieldTest(unittest.TestCase, Field):
     assert numpy.allclose(field3.y, self.y[::9], atol=atol)
     assert numpy.allclose(field3.values, self.values[::9, ::9], atol=atol)
 
+  def test_restrict_view(self):
+    field = self.restrict(self.x[2::3], self.y[::4], atol=atol)
+    assert numpy.shares_memory(field.values, self.values)
+    assert numpy.allclose(field.values, self.values[::4, 2::3], atol=atol)
+    x = self.x[[0, 1, 5, 20]]
+    field = self.restrict(x, self.y[::2], atol=atol)
+    assert numpy.allclose(field.x, x, atol=atol)
+    assert numpy.allclose(field.values, self.values[::2][:, [0, 1, 5, 20]],
+                          atol=atol)
+
   def test_get_difference(self):
     assert (self.get_difference(self, self.x, self.y, norm='L2') == 0.0)
     assert (self.get_difference(self, self.x, self.y, norm='Linf') == 0.0)
@@ -84,6 +95,90 @@ class FieldTest(unittest.TestCase, Field):
                                     self.values[:, index + 1]),
                           atol=atol)
 
+  def test_get_profiles(self):
+    indices = numpy.arange(1, 30, 3)
+    x = numpy.append(self.x[indices],
+                     0.25 * self.x[indices] + 0.75 * self.x[indices + 1])
+    y, values = self.get_vertical_profiles(x)
+    assert values.shape == (x.size, self.y.size)
+    # independent reference: linear interpolation along each row
+    reference = numpy.array([numpy.interp(x, self.x, row)
+                             for row in self.values]).T
+    assert numpy.allclose(values, reference, atol=atol)
+    assert numpy.allclose(values[:indices.size], self.values[:, indices].T,
+                          atol=atol)
+    assert numpy.allclose(values[indices.size:],
+                          (0.25 * self.values[:, indices]
+                           + 0.75 * self.values[:, indices + 1]).T,
+                          atol=atol)
+    y = [self.y[0], self.y[-1], 0.5 * (self.y[2] + self.y[3])]
+    x, values = self.get_horizontal_profiles(y)
+    assert numpy.allclose(values[0], self.values[0], atol=atol)
+    assert numpy.allclose(values[1], self.values[-1], atol=atol)
+    assert numpy.allclose(values[2], 0.5 * (self.values[2] + self.values[3]),
+                          atol=atol)
+    y = numpy.random.uniform(self.y[0], self.y[-1], 7)
+    x, values = self.get_horizontal_profiles(y)
+    reference = numpy.array([numpy.interp(y, self.y, column)
+                             for column in self.values.T]).T
+    assert numpy.allclose(values, reference, atol=atol)
+    with self.assertRaises(ValueError):
+      self.get_horizontal_profiles([2.0])
+
+
+class Field3DTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(Field3DTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.x = numpy.linspace(0.0, 10.0, 9 * 4)
+    self.y = numpy.linspace(-1.0, 1.0, 9 * 3)
+    self.z = numpy.linspace(0.0, 2.0, 9 * 2)
+    self.field = Field(x=self.x, y=self.y, z=self.z,
+                       values=numpy.random.rand(self.z.size, self.y.size,
+                                                self.x.size),
+                       label='test')
+
+  def test_init(self):
+    assert self.field.z is self.z
+    assert len(self.field.get_stations()) == 3
+    with self.assertRaises(AssertionError):
+      self.field.set(self.x, self.y, self.field.values[:, :, 1:], z=self.z)
+
+  def test_restrict(self):
+    values = self.field.values
+    field = self.field.restrict(self.x[::3], self.y[::2], z=self.z[1::4],
+                                atol=atol)
+    assert numpy.shares_memory(field.values, values)
+    assert numpy.allclose(field.z, self.z[1::4], atol=atol)
+    assert numpy.allclose(field.values, values[1::4, ::2, ::3], atol=atol)
+    field = self.field.restrict(self.x[[0, 1, 5]], self.y, atol=atol)
+    assert numpy.allclose(field.values, values[:, :, [0, 1, 5]], atol=atol)
+
+  def test_get_difference(self):
+    other = self.field.subtract(self.field)
+    assert numpy.count_nonzero(other.values) == 0
+    for norm in ['L2', 'Linf']:
+      assert self.field.get_difference(self.field, self.x[::3], self.y[::3],
+                                       z=self.z[::3], norm=norm) == 0.0
+
+  def test_get_plane(self):
+    values = self.field.values
+    plane = self.field.get_plane(y=self.y[4])
+    assert numpy.shares_memory(plane.values, values)
+    assert plane.x is self.x and plane.y is self.z
+    assert numpy.allclose(plane.values, values[:, 4, :], atol=atol)
+    plane = self.field.get_plane(x=0.5 * (self.x[2] + self.x[3]))
+    assert numpy.allclose(plane.values,
+                          0.5 * (values[:, :, 2] + values[:, :, 3]),
+                          atol=atol)
+    y, profiles = self.field.get_vertical_profiles([self.x[1], self.x[7]])
+    assert profiles.shape == (2, self.z.size, self.y.size)
+    assert numpy.allclose(profiles[1], values[:, :, 7], atol=atol)
+    with self.assertRaises(ValueError):
+      self.field.get_plane(x=self.x[0], z=self.z[0])
+
 
 if __name__ == '__main__':
   unittest.main()
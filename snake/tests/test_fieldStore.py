@@ -0,0 +1,94 @@
+"""
+Tests for the class `FieldStore`.
+"""
+
+import unittest
+import numpy
+
+from snake.field import Field
+from snake.fieldStore import FieldStore
+
+
+class FieldStoreTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(FieldStoreTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.x = numpy.linspace(0.0, 1.0, 10)
+    self.y = numpy.linspace(0.0, 1.0, 20)
+    self.calls = {'base': 0, 'derived': 0}
+
+  def produce_base(self, time_step, **kwargs):
+    self.calls['base'] += 1
+    return (Field(x=self.x, y=self.y,
+                  values=time_step * numpy.ones((self.y.size, self.x.size)),
+                  time_step=time_step, label='a'),
+            Field(x=self.x, y=self.y,
+                  values=numpy.ones((self.y.size, self.x.size)),
+                  time_step=time_step, label='b'))
+
+  def produce_derived(self, time_step, a, b, **kwargs):
+    self.calls['derived'] += 1
+    return Field(x=self.x, y=self.y, values=a.values + b.values,
+                 time_step=time_step, label='c')
+
+  def create_store(self, memory_budget=None, max_time_steps=1):
+    store = FieldStore(memory_budget=memory_budget,
+                       max_time_steps=max_time_steps)
+    store.register(['a', 'b'], self.produce_base)
+    store.register(['c'], self.produce_derived, dependencies=['a', 'b'])
+    return store
+
+  def test_lazy_dependencies(self):
+    store = self.create_store(max_time_steps=None)
+    c = store.get(2, 'c')
+    assert numpy.allclose(c.values, 3.0)
+    store.get(2, 'a')
+    store.get(2, 'c')
+    assert self.calls == {'base': 1, 'derived': 1}
+    store.get(3, 'c')
+    assert self.calls == {'base': 2, 'derived': 2}
+    assert store.get_time_steps() == [2, 3]
+
+  def test_eviction(self):
+    nbytes = self.x.size * self.y.size * 8
+    store = self.create_store(memory_budget=2 * nbytes)
+    store.get(0, 'c')
+    assert len(store) == 2
+    assert (0, 'c') in store
+    assert (0, 'a') not in store
+    assert store.nbytes <= 2 * nbytes
+    store.get(0, 'c')
+    assert self.calls == {'base': 1, 'derived': 1}
+    store.get(0, 'a')
+    assert self.calls == {'base': 2, 'derived': 1}
+
+  def test_current_time_step_only(self):
+    store = self.create_store()
+    nbytes = 3 * self.x.size * self.y.size * 8
+    for time_step in range(10):
+      c = store.get(time_step, 'c')
+      assert numpy.allclose(c.values, time_step + 1.0)
+      assert store.get_time_steps() == [time_step]
+      assert len(store) == 3
+      assert store.nbytes == nbytes
+    assert self.calls == {'base': 10, 'derived': 10}
+
+  def test_keyword_arguments(self):
+    def produce(time_step, scale=1.0):
+      self.calls['base'] += 1
+      return Field(x=self.x, y=self.y,
+                   values=scale * numpy.ones((self.y.size, self.x.size)),
+                   time_step=time_step, label='d')
+    store = FieldStore()
+    store.register(['d'], produce)
+    assert numpy.allclose(store.get(0, 'd').values, 1.0)
+    assert numpy.allclose(store.get(0, 'd', scale=2.0).values, 2.0)
+    assert numpy.allclose(store.get(0, 'd').values, 1.0)
+    assert self.calls['base'] == 2
+    assert (0, 'd') in store
+
+
+if __name__ == '__main__':
+  unittest.main()
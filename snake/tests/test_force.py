@@ -0,0 +1,64 @@
+"""
+Tests for the spectral analysis of the class `Force`.
+"""
+
+import unittest
+import numpy
+
+from snake.force import Force, get_uniform_samples
+from snake.simulation import Simulation
+
+
+class ForceSpectrumTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(ForceSpectrumTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    numpy.random.seed(0)
+    # non-uniform time-grid
+    self.times = numpy.sort(numpy.random.uniform(0.0, 100.0, 20001))
+    self.frequency = 0.2
+    self.lift = Force(self.times,
+                      numpy.sin(2.0 * numpy.pi * self.frequency * self.times) +
+                      0.2 * numpy.sin(4.0 * numpy.pi * self.frequency *
+                                      self.times),
+                      label='f_y')
+    self.drag = Force(self.times,
+                      1.0 + 0.1 * numpy.sin(4.0 * numpy.pi * self.frequency *
+                                            self.times),
+                      label='f_x')
+
+  def test_spectral_strouhal(self):
+    L, U = 2.0, 0.5
+    for method in ['welch', 'fft']:
+      strouhal = self.lift.get_strouhal(L=L, U=U, limits=(10.0, 100.0),
+                                        method=method)
+      assert abs(strouhal['frequency'] - self.frequency) <= 0.01
+      assert abs(strouhal['mean'] - self.frequency * L / U) <= 0.04
+      assert strouhal['uncertainty'] > 0.0
+      assert strouhal['power-fraction'] > 0.5
+      assert abs(strouhal['harmonics'][0] - 2.0 * self.frequency) <= 0.02
+
+  def test_spectral_analysis(self):
+    simulation = Simulation.__new__(Simulation)
+    simulation.forces = [self.drag, self.lift]
+    strouhals = simulation.get_spectral_analysis(limits=(10.0, 100.0))
+    assert len(strouhals) == 2
+    assert abs(strouhals[0]['frequency'] - 2.0 * self.frequency) <= 0.01
+    assert abs(strouhals[1]['frequency'] - self.frequency) <= 0.01
+    assert self.lift.strouhal is strouhals[1]
+
+  def test_uniform_samples_limits(self):
+    times, values = get_uniform_samples(self.times, self.lift.values,
+                                        limits=(10.0, 20.0), n_samples=101)
+    assert numpy.allclose(numpy.diff(times), times[1] - times[0])
+    assert times[0] >= 10.0 and times[-1] <= 20.0
+    with self.assertRaises(ValueError):
+      get_uniform_samples(self.times, self.lift.values, limits=(200.0, 300.0))
+    with self.assertRaises(ValueError):
+      self.lift.get_strouhal(limits=(self.times[-1], 200.0), method='fft')
+
+
+if __name__ == '__main__':
+  unittest.main()
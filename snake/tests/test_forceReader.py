@@ -0,0 +1,108 @@
+"""
+Tests for the class `ForceHistoryReader`.
+"""
+
+import os
+import shutil
+import unittest
+import tempfile
+import numpy
+
+from snake.forceReader import ForceHistoryReader
+
+
+class ForceHistoryReaderTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(ForceHistoryReaderTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.data = numpy.random.rand(2500, 3)
+    self.data[:, 0] = numpy.arange(2500)
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.file_path = os.path.join(self.directory, 'forces.txt')
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def append(self, rows, partial=b''):
+    with open(self.file_path, 'ab') as outfile:
+      numpy.savetxt(outfile, rows, fmt='%.18e')
+      outfile.write(partial)
+
+  def test_incremental(self):
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 2))
+    self.append(self.data[:1000], partial=b'1000.0 0.')
+    assert reader.update() == 1000
+    assert reader.update() == 0
+    with open(self.file_path, 'ab') as outfile:
+      outfile.write(b'5 0.25\n')
+    self.append(self.data[1001:])
+    assert reader.update() == 1500
+    forces = reader.get_forces(labels=['f_y'])
+    assert len(forces) == 1 and forces[0].label == 'f_y'
+    assert forces[0].times.size == 2500
+    assert forces[0].values[1000] == 0.25
+    assert numpy.allclose(forces[0].values[1001:], self.data[1001:, 2])
+    # truncated file is read again from the beginning
+    open(self.file_path, 'w').close()
+    self.append(self.data[:10])
+    assert reader.update() == 10
+    assert numpy.allclose(reader.get_data(), self.data[:10, [0, 2]])
+
+  def test_cache(self):
+    self.append(self.data)
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 1), cache=True)
+    reader.update()
+    cache_path = reader.get_cache_path()
+    assert os.path.isfile(cache_path)
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 1), cache=True)
+    assert reader.update() == self.data.shape[0]
+    assert isinstance(reader.data, numpy.memmap)
+    assert numpy.allclose(reader.get_data(), self.data[:, :2])
+    # modified file: cache is replaced
+    self.append(self.data[:5])
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 1), cache=True)
+    assert reader.update() == self.data.shape[0] + 5
+    assert not os.path.isfile(cache_path)
+    assert os.path.isfile(reader.get_cache_path())
+
+  def test_cache_not_rewritten_on_poll(self):
+    self.append(self.data[:100])
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 1), cache=True)
+    reader.update()
+    cache_path = reader.get_cache_path()
+    self.append(self.data[100:110])
+    assert reader.update() == 10
+    assert os.path.isfile(cache_path)
+    assert not os.path.isfile(reader.get_cache_path())
+    reader.close()
+    assert not os.path.isfile(cache_path)
+    reader = ForceHistoryReader(self.file_path, usecols=(0, 1), cache=True)
+    assert reader.update() == 110
+    assert isinstance(reader.data, numpy.memmap)
+    assert numpy.allclose(reader.get_data(), self.data[:110, :2])
+
+  def test_no_cache_by_default(self):
+    self.append(self.data)
+    reader = ForceHistoryReader(self.file_path)
+    reader.update()
+    reader.close()
+    assert os.listdir(self.directory) == ['forces.txt']
+
+  def test_follow(self):
+    self.append(self.data[:10])
+    reader = ForceHistoryReader(self.file_path)
+    samples = reader.follow(interval=0.01, timeout=0.05)
+    forces = next(samples)
+    assert len(forces) == 2 and forces[0].times.size == 10
+    self.append(self.data[10:15])
+    forces = next(samples)
+    assert numpy.allclose(forces[1].values, self.data[10:15, 2])
+    assert len(list(samples)) == 0
+
+
+if __name__ == '__main__':
+  unittest.main()
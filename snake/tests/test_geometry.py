@@ -0,0 +1,230 @@
+"""
+Tests for the module `geometry`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+
+from snake.field import Field
+from snake.petibm.petscVec import read_vec
+from snake.geometry import (Point, Geometry2d, Geometry3d, Circle, Sphere,
+                            Rectangle, get_inside_mask)
+
+
+class GeometryTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(GeometryTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    # star-shaped (non-convex) polygon
+    theta = numpy.linspace(0.0, 2.0 * numpy.pi, 200, endpoint=False)
+    radius = 0.5 + 0.2 * numpy.sin(5.0 * theta)
+    self.x_polygon = radius * numpy.cos(theta)
+    self.y_polygon = radius * numpy.sin(theta)
+    self.x = numpy.linspace(-0.8, 0.8, 61)
+    self.y = numpy.linspace(-0.8, 0.8, 53)
+
+  def crossing_number(self, x_polygon, y_polygon, x, y):
+    inside = False
+    n = x_polygon.size
+    for i in range(n):
+      x0, y0 = x_polygon[i - 1], y_polygon[i - 1]
+      x1, y1 = x_polygon[i], y_polygon[i]
+      if min(y0, y1) < y <= max(y0, y1):
+        if x <= x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+          inside = not inside
+    return inside
+
+  def test_get_inside_mask(self):
+    mask = get_inside_mask(self.x_polygon, self.y_polygon, self.x, self.y)
+    assert mask.shape == (self.y.size, self.x.size)
+    reference = numpy.array([[self.crossing_number(self.x_polygon,
+                                                   self.y_polygon, x, y)
+                              for x in self.x] for y in self.y])
+    assert numpy.array_equal(mask, reference)
+
+  def test_mask_rectangle(self):
+    # nodes on the right and top edges are inside
+    x = y = numpy.linspace(-0.5, 1.5, 21)
+    mask = get_inside_mask([0.0, 1.0, 1.0, 0.0], [0.0, 0.0, 1.0, 1.0], x, y)
+    X, Y = numpy.meshgrid(x, y)
+    inside = ((X > 1.0E-12) & (X <= 1.0 + 1.0E-12) &
+              (Y > 1.0E-12) & (Y <= 1.0 + 1.0E-12))
+    assert numpy.array_equal(mask, inside)
+
+  def test_keep_inside(self):
+    geometry = Geometry2d(points=[Point(x, y) for x, y in
+                                  zip(self.x_polygon, self.y_polygon)])
+    assert geometry.point_inside(0.0, 0.0)
+    assert not geometry.point_inside(0.69, 0.69)
+    geometry.keep_inside(ds=0.05)
+    x = numpy.array([point.x for point in geometry.points])
+    y = numpy.array([point.y for point in geometry.points])
+    assert numpy.all(numpy.diff(x) >= 0.0)
+    assert all(self.crossing_number(self.x_polygon, self.y_polygon, xi, yi)
+               for xi, yi in zip(x, y))
+
+  def test_field_body_mask(self):
+    circle = Circle(center=Point(0.0, 0.0), radius=0.5, n=400)
+    X, Y = numpy.meshgrid(self.x, self.y)
+    field = Field(x=self.x, y=self.y, values=X + Y)
+    mask = field.get_body_mask(circle)
+    distance = numpy.sqrt(X**2 + Y**2)
+    assert numpy.all(mask[distance < 0.49])
+    assert not numpy.any(mask[distance > 0.51])
+    z = numpy.linspace(0.0, 1.0, 3)
+    field = Field(x=self.x, y=self.y, z=z,
+                  values=numpy.zeros((z.size, self.y.size, self.x.size)))
+    mask_3d = field.get_body_mask([circle])
+    assert mask_3d.shape == field.values.shape
+    assert numpy.array_equal(mask_3d[1], mask)
+
+  def test_transforms(self):
+    sphere = Sphere(center=Point(0.1, 0.2, 0.3), radius=0.5, n=40)
+    assert sphere.coordinates.shape[1] == 3
+    points = [Point(*coordinates) for coordinates in sphere.coordinates]
+    center = sphere.mass_center
+    sphere.rotation(roll=10.0, yaw=20.0, pitch=30.0)
+    sphere.translation(displacement=[0.1, -0.2, 0.3])
+    for point in points:
+      point.rotation(center, roll=10.0, yaw=20.0, pitch=30.0)
+      point.translation([0.1, -0.2, 0.3])
+    reference = numpy.array([point.as_array() for point in points])
+    assert numpy.allclose(sphere.coordinates, reference, atol=1.0E-12)
+    assert numpy.allclose(sphere.gather_coordinate('z'), reference[:, 2],
+                          atol=1.0E-12)
+    sphere.scale(ratio=2.0)
+    assert numpy.allclose(sphere.coordinates.mean(axis=0),
+                          reference.mean(axis=0), atol=1.0E-12)
+    assert numpy.allclose(sphere.coordinates_initial[0], [0.1, 0.2, 0.8],
+                          atol=1.0E-12)
+
+  def test_point_views(self):
+    geometry = Geometry2d(coordinates=numpy.c_[self.x_polygon,
+                                               self.y_polygon])
+    points = geometry.points
+    assert len(points) == self.x_polygon.size
+    assert points[3].z is None and points[3].y == self.y_polygon[3]
+    # the points are views on the coordinates
+    points[3].translation([1.0, 2.0])
+    assert geometry.coordinates[3, 0] == self.x_polygon[3] + 1.0
+    assert geometry.coordinates_initial[3, 0] == self.x_polygon[3]
+    geometry.points = [Point(0.0, 0.0), Point(1.0, 0.0), Point(0.0, 1.0)]
+    assert geometry.coordinates.shape == (3, 2)
+    geometry3d = Geometry3d(points=[Point(0.0, 0.0, 1.0),
+                                    Point(1.0, 0.0, 1.0)])
+    assert geometry3d.mass_center.z == 1.0
+
+  def test_discretization(self):
+    rectangle = Rectangle(bottom_left=Point(0.0, 0.0),
+                          top_right=Point(1.0, 2.0), nx=5, ny=7)
+    rectangle.discretization(n=12)
+    x, y = rectangle.coordinates.T
+    assert numpy.allclose(x, [0.0, 0.5, 1.0, 1.0, 1.0, 1.0, 1.0,
+                              0.5, 0.0, 0.0, 0.0, 0.0], atol=1.0E-12)
+    assert numpy.allclose(y, [0.0, 0.0, 0.0, 0.5, 1.0, 1.5, 2.0,
+                              2.0, 2.0, 1.5, 1.0, 0.5], atol=1.0E-12)
+    # points exactly ds apart along the closed outline
+    rectangle = Rectangle(bottom_left=Point(0.0, 0.0),
+                          top_right=Point(1.0, 2.0), nx=3, ny=5)
+    rectangle.discretization(ds=0.95)
+    x, y = rectangle.coordinates.T
+    assert x.size == 7
+    arc_lengths = numpy.where(y <= 1.0E-12, x,
+                              numpy.where(x >= 1.0 - 1.0E-12, 1.0 + y,
+                                          numpy.where(y >= 2.0 - 1.0E-12,
+                                                      4.0 - x, 6.0 - y)))
+    assert numpy.allclose(arc_lengths, numpy.arange(7) * 6.0 / 7,
+                          atol=1.0E-12)
+    # the first point is kept
+    geometry = Geometry2d(coordinates=numpy.c_[self.x_polygon,
+                                               self.y_polygon])
+    geometry.discretization(ds=0.01)
+    assert numpy.allclose(geometry.coordinates[0],
+                          [self.x_polygon[0], self.y_polygon[0]])
+
+  def test_adaptive_discretization(self):
+    # thin ellipse: the points concentrate at the tips
+    theta = numpy.linspace(0.0, 2.0 * numpy.pi, 2000, endpoint=False)
+    ellipse = Geometry2d(coordinates=numpy.c_[2.0 * numpy.cos(theta),
+                                              0.2 * numpy.sin(theta)])
+    ellipse.discretization(n=100, curvature_weight=1.0)
+    closed = numpy.vstack((ellipse.coordinates, ellipse.coordinates[:1]))
+    lengths = numpy.sqrt(numpy.sum(numpy.diff(closed, axis=0)**2, axis=1))
+    assert lengths[0] < 0.1 * lengths[25]
+
+  def test_kinematics(self):
+    sphere = Sphere(center=Point(0.1, 0.2, 0.3), radius=0.5, n=20)
+    times = numpy.linspace(0.0, 1.0, 7)
+    motion = lambda t: {'roll': 10.0 * t, 'pitch': 30.0 * numpy.sin(t),
+                        'displacements': numpy.c_[t, 0.5 * t, -t]}
+    positions = sphere.get_kinematics(times=times, motion=motion,
+                                      chunk_size=3)
+    assert positions.shape == (times.size,) + sphere.coordinates.shape
+    for i, t in enumerate(times):
+      reference = Sphere(center=Point(0.1, 0.2, 0.3), radius=0.5, n=20)
+      reference.rotation(roll=10.0 * t, pitch=30.0 * numpy.sin(t))
+      reference.translation([t, 0.5 * t, -t])
+      assert numpy.allclose(positions[i], reference.coordinates,
+                            atol=1.0E-12)
+    # 2D body, angles only
+    circle = Circle(center=Point(1.0, 0.0), radius=0.5, n=30)
+    positions = circle.get_kinematics(pitch=[0.0, 90.0], center=(0.0, 0.0))
+    assert numpy.allclose(positions[1][:, 0], -circle.coordinates[:, 1],
+                          atol=1.0E-12)
+    # the body is not moved
+    assert numpy.allclose(circle.coordinates, circle.coordinates_initial)
+
+  def test_write_kinematics(self):
+    directory = tempfile.mkdtemp()
+    try:
+      circle = Circle(center=Point(0.0, 0.0), radius=0.5, n=30)
+      file_paths = circle.write_kinematics(directory,
+                                           displacements=[[0.0, 0.0],
+                                                          [1.0, 0.0]],
+                                           indices=[100, 200])
+      assert file_paths == [os.path.join(directory, 'body0000100.txt'),
+                            os.path.join(directory, 'body0000200.txt')]
+      with open(file_paths[1], 'r') as infile:
+        assert int(infile.readline()) == 30
+      coordinates = numpy.loadtxt(file_paths[1], skiprows=1)
+      assert numpy.allclose(coordinates[:, 0],
+                            circle.coordinates[:, 0] + 1.0, atol=1.0E-06)
+    finally:
+      shutil.rmtree(directory)
+
+  def test_extrusion(self):
+    directory = tempfile.mkdtemp()
+    try:
+      circle = Circle(center=Point(0.0, 0.0), radius=0.5, n=30)
+      file_path = os.path.join(directory, 'body.txt')
+      cylinder = circle.extrusion(limits=[0.0, 1.0], n=4,
+                                  file_path=file_path)
+      assert isinstance(cylinder, Geometry3d)
+      assert cylinder.coordinates.shape == (4 * 30, 3)
+      # layer by layer, from the first limit to the second one
+      assert numpy.allclose(cylinder.coordinates[30:60, :2],
+                            circle.coordinates, atol=1.0E-12)
+      assert numpy.allclose(numpy.unique(cylinder.gather_coordinate('z')),
+                            [0.125, 0.375, 0.625, 0.875], atol=1.0E-12)
+      assert numpy.allclose(cylinder.coordinates[:30, 2], 0.125)
+      with open(file_path, 'r') as infile:
+        assert int(infile.readline()) == 120
+      assert numpy.allclose(numpy.loadtxt(file_path, skiprows=1),
+                            cylinder.coordinates, atol=1.0E-06)
+      file_path = os.path.join(directory, 'body.dat')
+      cylinder = circle.extrusion(limits=[0.0, 1.0], n=4, force=True,
+                                  file_path=file_path, fmt='binary')
+      assert cylinder.coordinates.shape == (5 * 30, 3)
+      values = numpy.asarray(read_vec(file_path)).reshape(-1, 3)
+      assert numpy.array_equal(values, cylinder.coordinates)
+    finally:
+      shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+  unittest.main()
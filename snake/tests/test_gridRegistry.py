@@ -0,0 +1,53 @@
+"""
+Tests for the class `GridRegistry`.
+"""
+
+import unittest
+import numpy
+
+from snake.field import Field
+from snake.gridRegistry import GridRegistry
+from snake import convergence
+
+
+atol = 1.0E-12
+
+
+class GridRegistryTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(GridRegistryTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    x, y = numpy.linspace(0.0, 1.0, 73), numpy.linspace(-1.0, 1.0, 37)
+    self.fields = [Field(x=x[::ratio], y=y[::ratio],
+                         values=numpy.random.rand(y[::ratio].size,
+                                                  x[::ratio].size),
+                         label='u')
+                   for ratio in [9, 3, 1]]
+    self.grid = [self.fields[0].x, self.fields[0].y]
+
+  def test_shared_index_maps(self):
+    registry = GridRegistry()
+    coarse, medium, fine = self.fields
+    for order in [None, numpy.inf]:
+      convergence.get_observed_order(coarse, medium, fine, 3.0, self.grid,
+                                     order=order, registry=registry)
+    convergence.get_asymptotic_range(coarse, medium, fine, 1.0, 3.0,
+                                     self.grid, registry=registry)
+    # one index map per grid and direction
+    assert registry.n_misses == 6
+    assert len(registry.indices) == 6
+    assert registry.n_hits > registry.n_misses
+    indices = registry.get_indices(fine.x, self.grid[0])
+    assert numpy.allclose(fine.x[indices], self.grid[0], atol=atol)
+
+  def test_fingerprint(self):
+    registry = GridRegistry()
+    x = numpy.linspace(0.0, 1.0, 11)
+    assert registry.get_fingerprint(x) == registry.get_fingerprint(x.copy())
+    assert registry.get_fingerprint(x) != registry.get_fingerprint(x[:-1])
+
+
+if __name__ == '__main__':
+  unittest.main()
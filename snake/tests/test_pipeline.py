@@ -0,0 +1,114 @@
+"""
+Tests for the module `pipeline`.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from snake.pipeline import map_time_steps
+
+
+class StubSimulation(object):
+  def __init__(self, directory):
+    self.directory = directory
+    self.fields = {'pressure': 'stored'}
+    self.field_store = None
+
+
+def record(simulation, time_step, delay=0.0):
+  # mark the time-step as started
+  open(os.path.join(simulation.directory, str(time_step)), 'w').close()
+  time.sleep(delay * (5 - time_step % 5))
+  simulation.fields['pressure'] = time_step
+  return os.getpid(), time_step ** 2
+
+
+class CountedPickle(object):
+  # number of times an instance is pickled in the present process
+  n_pickles = 0
+
+  def __init__(self, value):
+    self.value = value
+
+  def __getstate__(self):
+    CountedPickle.n_pickles += 1
+    return self.__dict__
+
+
+def read_shared(simulation, time_step):
+  return simulation.data.value * time_step
+
+
+def fail(simulation, time_step):
+  if time_step == 3:
+    raise ValueError('time-step {}'.format(time_step))
+  return time_step
+
+
+class PipelineTest(unittest.TestCase):
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.simulation = StubSimulation(self.directory)
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def get_started(self):
+    return sorted(int(name) for name in os.listdir(self.directory))
+
+  def test_order(self):
+    time_steps = list(range(10))
+    results = list(map_time_steps(self.simulation, record, time_steps,
+                                  n_processes=3, delay=0.01))
+    assert [time_step for time_step, _ in results] == time_steps
+    assert [value for _, (_, value) in results] == [t ** 2
+                                                    for t in time_steps]
+    assert all(pid != os.getpid() for _, (pid, _) in results)
+
+  def test_max_in_flight(self):
+    results = map_time_steps(self.simulation, record, range(10),
+                             n_processes=2, max_in_flight=2)
+    for time_step, _ in results:
+      # the generator is suspended: only the submitted time-steps may start
+      assert self.get_started()[-1] <= time_step + 1
+    assert self.get_started() == list(range(10))
+
+  def test_in_process(self):
+    results = list(map_time_steps(self.simulation, record, [4, 2, 7],
+                                  n_processes=1))
+    assert [time_step for time_step, _ in results] == [4, 2, 7]
+    assert all(pid == os.getpid() for _, (pid, _) in results)
+    # the function works on a copy whose fields are released
+    assert self.simulation.fields == {'pressure': 'stored'}
+
+  def test_in_process_is_lazy(self):
+    results = map_time_steps(self.simulation, record, range(5),
+                             n_processes=1)
+    next(results)
+    assert self.get_started() == [0]
+
+  def test_shared(self):
+    for n_processes in [1, 2]:
+      CountedPickle.n_pickles = 0
+      results = list(map_time_steps(self.simulation, read_shared, range(8),
+                                    n_processes=n_processes,
+                                    shared={'data': CountedPickle(3)}))
+      assert results == [(t, 3 * t) for t in range(8)]
+      # sent once per worker, not with every time-step
+      assert CountedPickle.n_pickles <= n_processes
+    assert not hasattr(self.simulation, 'data')
+
+  def test_worker_exception(self):
+    for n_processes in [1, 2]:
+      results = map_time_steps(self.simulation, fail, range(6),
+                               n_processes=n_processes)
+      assert [next(results) for _ in range(3)] == [(0, 0), (1, 1), (2, 2)]
+      with self.assertRaises(ValueError):
+        next(results)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests for the class `Probe`.
+"""
+
+import unittest
+import numpy
+
+from snake.field import Field
+from snake.probe import Probe
+
+
+atol = 1.0E-12
+
+
+class ProbeTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(ProbeTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    # stretched stations
+    self.x = numpy.cumsum(1.05**numpy.arange(20)) - 1.0
+    self.y = numpy.cumsum(1.10**numpy.arange(15)) - 1.0
+    self.z = numpy.linspace(-1.0, 1.0, 7)
+    self.random = numpy.random.RandomState(0)
+
+  def get_points(self, stations, n_points):
+    return numpy.column_stack([self.random.uniform(s[0], s[-1], n_points)
+                               for s in stations])
+
+  def test_bilinear(self):
+    # a bilinear function is interpolated exactly
+    X, Y = numpy.meshgrid(self.x, self.y)
+    field = Field(x=self.x, y=self.y, values=1.0 + 2.0 * X - 3.0 * Y + X * Y)
+    points = self.get_points([self.x, self.y], 1000)
+    # include the corners of the grid
+    points[:2] = [[self.x[0], self.y[0]], [self.x[-1], self.y[-1]]]
+    values = field.probe(points[:, 0], points[:, 1])
+    x, y = points.T
+    assert numpy.allclose(values, 1.0 + 2.0 * x - 3.0 * y + x * y,
+                          atol=1.0E-09)
+
+  def test_trilinear(self):
+    Z, Y, X = numpy.meshgrid(self.z, self.y, self.x, indexing='ij')
+    points = self.get_points([self.x, self.y, self.z], 1000)
+    probe = Probe([self.x, self.y, self.z], points)
+    # sample two fields at once
+    values = numpy.array([X - 2.0 * Y + 0.5 * Z, X * Y * Z])
+    samples = probe.sample(values)
+    x, y, z = points.T
+    assert samples.shape == (2, points.shape[0])
+    assert numpy.allclose(samples[0], x - 2.0 * y + 0.5 * z, atol=1.0E-09)
+    assert numpy.allclose(samples[1], x * y * z, atol=1.0E-09)
+
+  def test_outside(self):
+    probe = Probe([self.x, self.y], [[self.x[0] - 1.0, self.y[0]],
+                                     [self.x[1], self.y[1]]])
+    values = numpy.ones((self.y.size, self.x.size))
+    samples = probe.sample(values)
+    assert numpy.isnan(samples[0])
+    assert samples[1] == 1.0
+
+
+if __name__ == '__main__':
+  unittest.main()
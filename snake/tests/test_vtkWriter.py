@@ -0,0 +1,68 @@
+"""
+Tests for the module `vtkWriter`.
+"""
+
+import os
+import re
+import zlib
+import shutil
+import unittest
+import tempfile
+import numpy
+
+from snake import vtkWriter
+
+
+class VTKWriterTest(unittest.TestCase):
+  def __init__(self, *args, **kwargs):
+    super(VTKWriterTest, self).__init__(*args, **kwargs)
+    self.generate_stubs()
+
+  def generate_stubs(self):
+    self.x = numpy.linspace(0.0, 1.0, 7)
+    self.y = numpy.linspace(0.0, 2.0, 5)
+    self.u = numpy.random.rand(self.y.size, self.x.size)
+    self.v = numpy.random.rand(self.y.size, self.x.size)
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def test_write_legacy_binary(self):
+    file_path = os.path.join(self.directory, 'velocity.vtk')
+    vtkWriter.write_legacy(file_path, self.x, self.y, None,
+                           [('velocity', [self.u, self.v])])
+    with open(file_path, 'rb') as infile:
+      content = infile.read()
+    start = content.index(b'VECTORS velocity double\n') + 24
+    values = numpy.frombuffer(content[start:start + 3 * self.u.size * 8],
+                              dtype='>f8').reshape(self.u.shape + (3,))
+    assert numpy.array_equal(values[..., 0], self.u)
+    assert numpy.array_equal(values[..., 1], self.v)
+    assert not values[..., 2].any()
+
+  def test_write_vtr_compressed(self):
+    file_path = os.path.join(self.directory, 'pressure.vtr')
+    vtkWriter.write_vtr(file_path, self.x, self.y, None,
+                        [('pressure', [self.u])], block_size=64)
+    with open(file_path, 'rb') as infile:
+      content = infile.read()
+    offset = int(re.search(br'Name="pressure".*?offset="(\d+)"',
+                           content).group(1))
+    start = content.index(b'encoding="raw">\n   _') + 20 + offset
+    n_blocks = int(numpy.frombuffer(content[start:start + 8], dtype='<u8')[0])
+    header = numpy.frombuffer(content[start:start + 8 * (3 + n_blocks)],
+                              dtype='<u8')
+    assert header[1] == 64
+    data, position = b'', start + 8 * (3 + n_blocks)
+    for size in header[3:]:
+      data += zlib.decompress(content[position:position + int(size)])
+      position += int(size)
+    values = numpy.frombuffer(data, dtype='<f8').reshape(self.u.shape)
+    assert numpy.array_equal(values, self.u)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,300 @@
+"""
+Implementation of functions to write fields on rectilinear grids into
+VTK files: legacy format (ASCII or binary), XML format (.vtr) with optional
+zlib compression, and ParaView collections (.pvd) for time-series.
+
+The values are written slab by slab (along the first axis of the arrays)
+so that no full-size copy of a field is created.
+"""
+
+import os
+import zlib
+import itertools
+
+import numpy
+
+
+def get_type_name(dtype, xml=False):
+  """
+  Returns the VTK name of a floating-point type.
+
+  Parameters
+  ----------
+  dtype: numpy dtype
+    Floating-point type (32- or 64-bit).
+  xml: boolean, optional
+    Set 'True' to get the name used in XML files;
+    default: False (name used in legacy files).
+
+  Returns
+  -------
+  name: string
+    The VTK type name.
+  """
+  itemsize = numpy.dtype(dtype).itemsize
+  if xml:
+    return {4: 'Float32', 8: 'Float64'}[itemsize]
+  return {4: 'float', 8: 'double'}[itemsize]
+
+
+def iterate_slabs(components, dtype):
+  """
+  Yields the values of a scalar or vector field as contiguous arrays,
+  one slab (first-axis index) at a time, in the VTK point ordering
+  (x varies fastest, then y, then z).
+
+  Parameters
+  ----------
+  components: list of numpy arrays
+    Components of the field (a single array for a scalar field), in C-order
+    with the z-axis (if any) first; a component set to None is filled with
+    zeros.
+  dtype: numpy dtype
+    Type (and byte-order) of the values to yield.
+
+  Yields
+  ------
+  slab: numpy array
+    Contiguous values of the slab (interleaved components for a vector
+    field).
+  """
+  n_slabs = components[0].shape[0] if components[0].ndim == 3 else 1
+  for k in range(n_slabs):
+    arrays = [(c[k] if c is not None and c.ndim == 3 else c)
+              for c in components]
+    if len(arrays) == 1:
+      yield numpy.ascontiguousarray(arrays[0], dtype=dtype).ravel()
+    else:
+      slab = numpy.zeros(arrays[0].shape + (len(arrays),), dtype=dtype)
+      for i, array in enumerate(arrays):
+        if array is not None:
+          slab[..., i] = array
+      yield slab.ravel()
+
+
+def write_legacy(file_path, x, y, z, point_data,
+                 binary=True, dtype=numpy.float64, title=None):
+  """
+  Writes fields on a rectilinear grid into a legacy VTK file.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the file to write.
+  x, y: numpy 1D arrays of floats
+    Stations along a gridline in the x- and y-directions.
+  z: numpy 1D array of floats or None
+    Stations along a gridline in the z-direction (None in 2D).
+  point_data: list of (string, list of numpy arrays) tuples
+    Name and components of each field to write.
+  binary: boolean, optional
+    Set 'True' to write binary data, 'False' for ASCII;
+    default: True.
+  dtype: numpy dtype, optional
+    Floating-point type used to write the values;
+    default: numpy.float64.
+  title: string, optional
+    Title written in the header;
+    default: None.
+  """
+  dtype = numpy.dtype(dtype)
+  type_name = get_type_name(dtype)
+  # legacy VTK binary files are big-endian
+  data_type = dtype.newbyteorder('>') if binary else dtype
+  if z is None:
+    z = numpy.zeros(1)
+  nx, ny, nz = x.size, y.size, z.size
+  with open(file_path, 'wb') as outfile:
+    header = ['# vtk DataFile Version 3.0',
+              title or 'written by snake',
+              'BINARY' if binary else 'ASCII',
+              'DATASET RECTILINEAR_GRID',
+              'DIMENSIONS {} {} {}'.format(nx, ny, nz)]
+    outfile.write(('\n'.join(header) + '\n').encode('ascii'))
+    for name, stations in zip('XYZ', (x, y, z)):
+      outfile.write('{}_COORDINATES {} {}\n'.format(name, stations.size,
+                                                    type_name)
+                    .encode('ascii'))
+      _write_values(outfile, [stations], data_type, binary)
+    outfile.write('POINT_DATA {}\n'.format(nx * ny * nz).encode('ascii'))
+    for name, components in point_data:
+      if len(components) == 1:
+        outfile.write('SCALARS {} {} 1\nLOOKUP_TABLE default\n'
+                      ''.format(name, type_name).encode('ascii'))
+      else:
+        if len(components) == 2:
+          # VTK vectors have three components
+          components = list(components) + [None]
+        outfile.write('VECTORS {} {}\n'.format(name, type_name)
+                      .encode('ascii'))
+      _write_values(outfile, components, data_type, binary)
+
+
+def _write_values(outfile, components, dtype, binary):
+  """
+  Writes the values of a field slab by slab (binary or ASCII).
+  """
+  n_components = len(components)
+  for slab in iterate_slabs(components, dtype):
+    if binary:
+      slab.tofile(outfile)
+    else:
+      numpy.savetxt(outfile, slab.reshape(-1, n_components),
+                    fmt='%.16g', delimiter='\t')
+  if binary:
+    outfile.write(b'\n')
+
+
+def _encode_array(chunks, n_bytes, compress, block_size):
+  """
+  Encodes the raw bytes of an array for the appended section of a VTK XML
+  file (with a UInt64 header).
+
+  Parameters
+  ----------
+  chunks: iterable of numpy arrays
+    Contiguous pieces of the array.
+  n_bytes: integer
+    Number of bytes of the uncompressed array.
+  compress: boolean
+    Set 'True' to compress the data with zlib, by blocks.
+  block_size: integer
+    Size (in bytes) of the uncompressed blocks.
+
+  Returns
+  -------
+  size: integer
+    Number of bytes of the encoded array (header included).
+  pieces: iterable of bytes
+    The header followed by the data;
+    uncompressed data are produced lazily, while the file is written.
+  """
+  if not compress:
+    header = numpy.array([n_bytes], dtype='<u8').tobytes()
+    pieces = itertools.chain([header], (chunk.tobytes() for chunk in chunks))
+    return len(header) + n_bytes, pieces
+  blocks, sizes = [], []
+  pending = b''
+  for chunk in chunks:
+    data = pending + chunk.tobytes()
+    start = 0
+    while len(data) - start >= block_size:
+      blocks.append(zlib.compress(data[start:start + block_size]))
+      sizes.append(len(blocks[-1]))
+      start += block_size
+    pending = data[start:]
+  if pending or not blocks:
+    blocks.append(zlib.compress(pending))
+    sizes.append(len(blocks[-1]))
+    last_size = len(pending)
+  else:
+    last_size = block_size
+  header = numpy.array([len(blocks), block_size, last_size] + sizes,
+                       dtype='<u8').tobytes()
+  return len(header) + sum(sizes), [header] + blocks
+
+
+def write_vtr(file_path, x, y, z, point_data,
+              compress=True, dtype=numpy.float64, block_size=2**20):
+  """
+  Writes fields on a rectilinear grid into a VTK XML file (.vtr) with the
+  data in the appended (raw) section, optionally compressed with zlib.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the file to write.
+  x, y: numpy 1D arrays of floats
+    Stations along a gridline in the x- and y-directions.
+  z: numpy 1D array of floats or None
+    Stations along a gridline in the z-direction (None in 2D).
+  point_data: list of (string, list of numpy arrays) tuples
+    Name and components of each field to write.
+  compress: boolean, optional
+    Set 'True' to compress the data with zlib;
+    default: True.
+  dtype: numpy dtype, optional
+    Floating-point type used to write the values;
+    default: numpy.float64.
+  block_size: integer, optional
+    Size (in bytes) of the blocks compressed independently;
+    default: 2**20.
+  """
+  dtype = numpy.dtype(dtype).newbyteorder('<')
+  type_name = get_type_name(dtype, xml=True)
+  if z is None:
+    z = numpy.zeros(1)
+  extent = '0 {} 0 {} 0 {}'.format(x.size - 1, y.size - 1, z.size - 1)
+  arrays = []
+  for name, components in point_data:
+    if len(components) == 2:
+      # VTK vectors have three components
+      components = list(components) + [None]
+    n_bytes = len(components) * components[0].size * dtype.itemsize
+    arrays.append((name, len(components),
+                   _encode_array(iterate_slabs(components, dtype), n_bytes,
+                                 compress, block_size)))
+  for name, stations in zip('xyz', (x, y, z)):
+    arrays.append((name, 1,
+                   _encode_array([numpy.asarray(stations, dtype=dtype)],
+                                 stations.size * dtype.itemsize,
+                                 compress, block_size)))
+  offsets = numpy.cumsum([0] + [size for _, _, (size, _) in arrays])
+  lines = ['<?xml version="1.0"?>',
+           '<VTKFile type="RectilinearGrid" version="1.0" '
+           'byte_order="LittleEndian" header_type="UInt64"' +
+           (' compressor="vtkZLibDataCompressor">' if compress else '>'),
+           '  <RectilinearGrid WholeExtent="{}">'.format(extent),
+           '    <Piece Extent="{}">'.format(extent),
+           '      <PointData>']
+  for index, (name, n_components, _) in enumerate(arrays[:-3]):
+    lines.append('        <DataArray type="{}" Name="{}" '
+                 'NumberOfComponents="{}" format="appended" '
+                 'offset="{}"/>'.format(type_name, name, n_components,
+                                        offsets[index]))
+  lines += ['      </PointData>',
+            '      <Coordinates>']
+  for index in range(len(arrays) - 3, len(arrays)):
+    lines.append('        <DataArray type="{}" Name="{}" format="appended" '
+                 'offset="{}"/>'.format(type_name, arrays[index][0],
+                                        offsets[index]))
+  lines += ['      </Coordinates>',
+            '    </Piece>',
+            '  </RectilinearGrid>',
+            '  <AppendedData encoding="raw">']
+  with open(file_path, 'wb') as outfile:
+    outfile.write(('\n'.join(lines) + '\n   _').encode('ascii'))
+    for _, _, (_, pieces) in arrays:
+      for piece in pieces:
+        outfile.write(piece)
+    outfile.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+
+def write_pvd(file_path, file_paths, times):
+  """
+  Writes a ParaView collection file (.pvd) gathering a time-series of VTK
+  files.
+
+  Parameters
+  ----------
+  file_path: string
+    Path of the .pvd file to write.
+  file_paths: list of strings
+    Paths of the VTK files of the series
+    (written relative to the directory of the .pvd file).
+  times: list of floats
+    Time associated with each VTK file.
+  """
+  directory = os.path.dirname(os.path.abspath(file_path))
+  lines = ['<?xml version="1.0"?>',
+           '<VTKFile type="Collection" version="0.1" '
+           'byte_order="LittleEndian">',
+           '  <Collection>']
+  for time, path in zip(times, file_paths):
+    path = os.path.relpath(os.path.abspath(path), directory)
+    lines.append('    <DataSet timestep="{}" group="" part="0" '
+                 'file="{}"/>'.format(time, path))
+  lines += ['  </Collection>',
+            '</VTKFile>']
+  with open(file_path, 'w') as outfile:
+    outfile.write('\n'.join(lines) + '\n')